@@ -0,0 +1,125 @@
+import math
+import os
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from quickstl.quality import QUALITY_PRESETS
+
+MAX_TRIANGLES = 10_000_000
+# Triangles for a preset scale with 1 / surface deviation; Ultra (0.001 cm) lands on 10M.
+TRIANGLES_PER_INV_CM = 10_000
+
+
+def preset_triangles(preset: str) -> int:
+    """Synthetic mesh size standing in for a Fusion export at `preset`."""
+    deviation = QUALITY_PRESETS[preset]["surfaceDeviation_cm"]
+    return min(MAX_TRIANGLES, int(TRIANGLES_PER_INV_CM / deviation))
+
+
+class Mesh:
+    """Vertices (N,3) in cm and polygon faces grouped by size: {size: (F,size) 0-based indices}."""
+
+    def __init__(self, vertices, faces: dict):
+        self.vertices = vertices
+        self.faces = faces
+
+    @property
+    def triangles(self) -> int:
+        return sum(len(rows) * (size - 2) for size, rows in self.faces.items())
+
+
+def sphere(target: int, radius: float = 5.0) -> Mesh:
+    """UV sphere: quads between rings, triangle fans at the poles."""
+    rings = max(4, int(math.sqrt(target / 4.0)))
+    segs = 2 * rings
+    theta = np.linspace(0.0, math.pi, rings + 1)[1:-1]
+    phi = np.linspace(0.0, 2.0 * math.pi, segs, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    body = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1).reshape(-1, 3)
+    vertices = np.vstack([[0.0, 0.0, 1.0], body, [0.0, 0.0, -1.0]]) * radius
+    south = len(vertices) - 1
+
+    grid = 1 + np.arange((rings - 1) * segs).reshape(rings - 1, segs)
+    nxt = np.roll(grid, -1, axis=1)
+    quads = np.stack([grid[:-1], grid[1:], nxt[1:], nxt[:-1]], axis=-1).reshape(-1, 4)
+    top = np.stack([np.zeros(segs, np.int64), grid[0], nxt[0]], axis=-1)
+    bottom = np.stack([np.full(segs, south), nxt[-1], grid[-1]], axis=-1)
+    return Mesh(vertices, {3: np.vstack([top, bottom]), 4: quads})
+
+
+def gear(target: int, teeth: int = 48, radius: float = 4.0, height: float = 1.0) -> Mesh:
+    """Extruded spur-gear outline: quad side walls in layers, one n-gon per cap."""
+    per_tooth = 16
+    points = teeth * per_tooth
+    layers = max(1, int((target - 2 * (points - 2)) / (2 * points)))
+    angle = np.linspace(0.0, 2.0 * math.pi, points, endpoint=False)
+    # Square-ish tooth profile from a clipped sine.
+    r = radius + 0.3 * np.clip(2.0 * np.sin(angle * teeth), -1.0, 1.0)
+    ring = np.stack([r * np.cos(angle), r * np.sin(angle)], axis=-1)
+    z = np.linspace(0.0, height, layers + 1)
+    vertices = np.hstack([np.tile(ring, (layers + 1, 1)), np.repeat(z, points)[:, None]])
+
+    grid = np.arange((layers + 1) * points).reshape(layers + 1, points)
+    nxt = np.roll(grid, -1, axis=1)
+    quads = np.stack([grid[:-1], nxt[:-1], nxt[1:], grid[1:]], axis=-1).reshape(-1, 4)
+    caps = np.vstack([grid[0][::-1], grid[-1]])
+    return Mesh(vertices, {4: quads, points: caps})
+
+
+def lattice(target: int, pitch: float = 1.0, size: float = 0.35) -> Mesh:
+    """Cubic lattice of hexagonal prisms: hexagon caps plus quad sides (20 triangles each)."""
+    cells = max(1, round((target / 20.0) ** (1.0 / 3.0)))
+    angle = np.arange(6) * (math.pi / 3.0)
+    hexagon = np.stack([size * np.cos(angle), size * np.sin(angle)], axis=-1)
+    prism = np.vstack(
+        [np.hstack([hexagon, np.full((6, 1), -size)]), np.hstack([hexagon, np.full((6, 1), size)])]
+    )
+    centers = np.stack(np.meshgrid(*[np.arange(cells) * pitch] * 3, indexing="ij"), axis=-1).reshape(-1, 3)
+    vertices = (centers[:, None, :] + prism[None, :, :]).reshape(-1, 3)
+
+    base = (np.arange(len(centers)) * 12)[:, None]
+    k = np.arange(6)
+    sides = np.stack([k, (k + 1) % 6, (k + 1) % 6 + 6, k + 6], axis=-1)
+    quads = (base[:, None, :] + sides[None, :, :]).reshape(-1, 4)
+    caps = np.vstack([base + k[::-1], base + k + 6])
+    return Mesh(vertices, {4: quads, 6: caps})
+
+
+SHAPES = {"sphere": sphere, "gear": gear, "lattice": lattice}
+
+
+def write_obj(path: str, mesh: Mesh, normals: bool = True) -> int:
+    """
+    Write `mesh` the way Fusion does: `v`, one `vn` per vertex and `f a//a b//b …`
+    references (or bare indices when normals is False). Returns the file size.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="ascii", newline="\n") as handle:
+        handle.write("# QuickSTL benchmark mesh\n")
+        np.savetxt(handle, mesh.vertices, fmt="v %.6f %.6f %.6f")
+        if normals:
+            length = np.linalg.norm(mesh.vertices, axis=1, keepdims=True)
+            length[length == 0] = 1.0
+            np.savetxt(handle, mesh.vertices / length, fmt="vn %.4f %.4f %.4f")
+        ref = "%d//%d" if normals else "%d"
+        for size, rows in sorted(mesh.faces.items()):
+            one_based = rows + 1
+            if normals:
+                one_based = np.repeat(one_based, 2, axis=1)
+            np.savetxt(handle, one_based, fmt="f " + " ".join([ref] * size))
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def ensure_obj(workdir: str, shape: str, triangles: int) -> str:
+    """Generate (once) the OBJ for `shape` at about `triangles` triangles; cached in `workdir`."""
+    if np is None:
+        raise RuntimeError("Generating benchmark meshes needs NumPy")
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"{shape}_{triangles}.obj")
+    if not os.path.isfile(path):
+        write_obj(path, SHAPES[shape](triangles))
+    return path
@@ -0,0 +1,234 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from quickstl.analysis import stl_stats_from_file
+from quickstl.obj_numpy import compute_normals, fan_triangulate, numpy_available, parse_obj_arrays, triangle_records
+from quickstl.obj_parallel import MAX_WORKERS, _parse_chunk_python, convert_obj_to_stl_parallel
+from quickstl.obj_stl import stream_obj_to_stl, write_binary_stl, write_indexed_stl
+from quickstl.quality import QUALITY_PRESETS
+
+from .geometry import SHAPES, ensure_obj, preset_triangles
+
+ENGINES = ("numpy", "stream", "parallel")
+DEFAULT_PRESETS = ("Low", "Medium", "High")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Pure-Python stages take minutes beyond this; larger cases run the NumPy engine only.
+PYTHON_MAX_TRIANGLES = 1_000_000
+
+
+def measure(fn, repeat: int, memory: bool):
+    """(best wall seconds over `repeat` runs, peak traced MB of one extra run or None, result)."""
+    best = None
+    result = None
+    for _ in range(max(1, repeat)):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = fn()
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def numpy_stages(obj: str, stl: str, repeat: int, memory: bool):
+    """The NumPy engine split into its stages; each stage gets the previous stage's output."""
+    t, m, (vertices, face_indices, face_sizes) = measure(lambda: parse_obj_arrays(obj), repeat, memory)
+    yield "parse", t, m
+    t, m, tris = measure(lambda: fan_triangulate(face_indices, face_sizes), repeat, memory)
+    yield "triangulate", t, m
+    v0, v1, v2 = vertices[tris[:, 0]], vertices[tris[:, 1]], vertices[tris[:, 2]]
+    t, m, _ = measure(lambda: compute_normals(v0, v1, v2), repeat, memory)
+    yield "normals", t, m
+    del v0, v1, v2
+    records = triangle_records(vertices, tris)
+    t, m, _ = measure(lambda: write_binary_stl(stl, records), repeat, memory)
+    yield "write_binary_stl", t, m
+    del records, vertices, tris, face_indices, face_sizes
+    t, m, _ = measure(lambda: stl_stats_from_file(stl), repeat, memory)
+    yield "analyze_stl", t, m
+
+
+def stream_stages(obj: str, stl: str, repeat: int, memory: bool):
+    """Pure-Python path: parse (fan-triangulating inline), normals + write, and the whole streaming convert."""
+    with open(obj, "rb") as handle:
+        data = handle.read()
+    t, m, (coords, tris, _) = measure(lambda: _parse_chunk_python(data, 10.0), repeat, memory)
+    del data
+    yield "parse", t, m
+    t, m, _ = measure(lambda: write_indexed_stl(stl, coords, tris), repeat, memory)
+    yield "write_binary_stl", t, m
+    del coords, tris
+    t, m, _ = measure(lambda: stream_obj_to_stl(obj, stl), repeat, memory)
+    yield "convert", t, m
+
+
+def parallel_workers() -> int:
+    """
+    Pool size for the parallel rows. Forced to at least 2: left to parallel_worker_count,
+    benchmark-sized OBJs (below its 64 MB threshold) would be parsed in-process.
+    """
+    return max(2, min(MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def parallel_stages(obj: str, stl: str, repeat: int, memory: bool):
+    # Worker processes are invisible to tracemalloc, so only time is reported.
+    workers = parallel_workers()
+    t, _, _ = measure(lambda: convert_obj_to_stl_parallel(obj, stl, 10.0, workers), repeat, False)
+    yield "convert", t, None
+
+
+STAGES = {"numpy": numpy_stages, "stream": stream_stages, "parallel": parallel_stages}
+
+
+def run_suite(shapes, presets, engines, workdir: str, repeat: int, memory: bool, log=print) -> list:
+    results = []
+    stl = os.path.join(workdir, "out.stl")
+    for preset in presets:
+        target = preset_triangles(preset)
+        for shape in shapes:
+            obj = ensure_obj(workdir, shape, target)
+            for engine in engines:
+                if engine == "numpy" and not numpy_available():
+                    continue
+                if engine == "stream" and target > PYTHON_MAX_TRIANGLES:
+                    continue
+                rows = [
+                    {
+                        "shape": shape,
+                        "preset": preset,
+                        "engine": engine,
+                        "stage": stage,
+                        "seconds": round(seconds, 4),
+                        "peak_mb": round(peak, 1) if peak is not None else None,
+                    }
+                    for stage, seconds, peak in STAGES[engine](obj, stl, repeat, memory)
+                ]
+                # Generated meshes only approximate the target; report what was converted.
+                triangles = (os.path.getsize(stl) - 84) // 50
+                for row in rows:
+                    row["triangles"] = triangles
+                    log(format_row(row))
+                results.extend(rows)
+    return results
+
+
+def result_key(row: dict) -> str:
+    return f"{row['shape']}/{row['preset']}/{row['engine']}/{row['stage']}"
+
+
+def format_row(row: dict, note: str = "") -> str:
+    peak = "-" if row["peak_mb"] is None else f"{row['peak_mb']:.1f}"
+    rate = row["triangles"] / row["seconds"] / 1e6 if row["seconds"] else 0.0
+    return (
+        f"{result_key(row):<44}{row['triangles']:>11,}{row['seconds']:>10.3f} s"
+        f"{rate:>9.2f} Mtri/s{peak:>10} MB  {note}"
+    ).rstrip()
+
+
+def compare(results: list, baseline: dict, time_threshold: float, memory_threshold: float, min_seconds: float):
+    """Rows slower (or hungrier) than the baseline by more than the thresholds, as (row, reason)."""
+    base = baseline.get("results", {})
+    regressions = []
+    for row in results:
+        ref = base.get(result_key(row))
+        if not ref:
+            continue
+        if ref["seconds"] >= min_seconds and row["seconds"] > ref["seconds"] * time_threshold:
+            regressions.append((row, f"time {row['seconds'] / ref['seconds']:.2f}x baseline ({ref['seconds']:.3f} s)"))
+        if ref.get("peak_mb") and row["peak_mb"] and row["peak_mb"] > ref["peak_mb"] * memory_threshold:
+            regressions.append((row, f"memory {row['peak_mb'] / ref['peak_mb']:.2f}x baseline ({ref['peak_mb']:.1f} MB)"))
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy_available(),
+        "parallel_workers": parallel_workers(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Headless micro-benchmarks for the OBJ→STL conversion and STL analysis paths.",
+    )
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma list of " + ", ".join(SHAPES))
+    parser.add_argument(
+        "--presets",
+        default=",".join(DEFAULT_PRESETS),
+        help="comma list of quality presets, or 'all' (Ultra is ~10M triangles)",
+    )
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma list of " + ", ".join(ENGINES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "quickstl-bench"))
+    parser.add_argument("--json", dest="json_out", default="", help="also write the results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--time-threshold", type=float, default=1.20, help="flag stages slower than this × baseline")
+    parser.add_argument(
+        "--memory-threshold", type=float, default=1.10, help="flag stages whose peak exceeds this × baseline"
+    )
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.05, help="ignore timing changes of stages faster than this"
+    )
+    args = parser.parse_args(argv)
+
+    presets = list(QUALITY_PRESETS) if args.presets == "all" else [p for p in args.presets.split(",") if p]
+    unknown = [p for p in presets if p not in QUALITY_PRESETS]
+    if unknown:
+        parser.error(f"unknown preset(s): {', '.join(unknown)}")
+    shapes = [s for s in args.shapes.split(",") if s]
+    engines = [e for e in args.engines.split(",") if e]
+    if any(s not in SHAPES for s in shapes) or any(e not in ENGINES for e in engines):
+        parser.error("unknown shape or engine")
+
+    results = run_suite(shapes, presets, engines, args.workdir, args.repeat, not args.no_memory)
+    payload = {"environment": environment(), "results": {result_key(r): r for r in results}}
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        print(f"Baseline saved: {args.baseline}")
+    elif os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold, args.min_seconds)
+        print("")
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for row, reason in regressions:
+                print(format_row(row, reason))
+            status = 1
+        else:
+            print(f"No regressions against {args.baseline}.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
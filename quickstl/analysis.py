@@ -1,39 +1,149 @@
-import os
-import struct
-
-from .logging_utils import log
-
-
-def analyze_stl(stl_path: str) -> dict:
-    info = {
-        "isBinary": None,
-        "triangles": None,
-        "vertices": None,
-        "fileSizeBytes": None,
-    }
-    try:
-        size = os.path.getsize(stl_path)
-        info["fileSizeBytes"] = size
-        with open(stl_path, "rb") as handle:
-            data = handle.read()
-        if len(data) >= 84:
-            tri = struct.unpack("<I", data[80:84])[0]
-            expected = 84 + 50 * tri
-            if expected == len(data) and tri > 0:
-                info["isBinary"] = True
-                info["triangles"] = tri
-                info["vertices"] = tri * 3
-                return info
-        try:
-            txt = data.decode("utf-8", errors="ignore")
-            tri = txt.count("\nfacet ") + txt.count("\rfacet ")
-            if tri == 0:
-                tri = txt.count("facet ")
-            info["isBinary"] = False
-            info["triangles"] = tri if tri > 0 else None
-            info["vertices"] = tri * 3 if tri > 0 else None
-        except Exception:
-            pass
-    except Exception as exc:
-        log(f"STL analyze failed: {exc}")
-    return info
+import math
+
+from .stl_reader import StlReader
+from .timing import timed
+from .triangles import STL_DTYPE, TriangleBuffer, np
+
+DEGENERATE_AREA_MM2 = 1e-12
+STATS_SLICE_TRIANGLES = 1 << 20
+
+
+class StlStats:
+    """Mesh statistics accumulated while triangles are written, so the file is never re-read."""
+
+    def __init__(self):
+        self.is_binary = True
+        self.triangles = 0
+        self.file_size = None
+        self.bbox_min = None
+        self.bbox_max = None
+        self.surface_area = 0.0
+        self.signed_volume = 0.0
+        self.degenerate = 0
+
+    def _grow_bbox(self, lo, hi) -> None:
+        if self.bbox_min is None:
+            self.bbox_min = list(lo)
+            self.bbox_max = list(hi)
+            return
+        for k in range(3):
+            self.bbox_min[k] = min(self.bbox_min[k], lo[k])
+            self.bbox_max[k] = max(self.bbox_max[k], hi[k])
+
+    def add_triangle(self, a, b, c) -> None:
+        ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+        vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+        cx = uy * vz - uz * vy
+        cy = uz * vx - ux * vz
+        cz = ux * vy - uy * vx
+        area = 0.5 * math.sqrt(cx * cx + cy * cy + cz * cz)
+        self.triangles += 1
+        self.surface_area += area
+        if area <= DEGENERATE_AREA_MM2:
+            self.degenerate += 1
+        # Signed tetrahedron volume against the origin: a · (b × c) / 6
+        self.signed_volume += (
+            a[0] * (b[1] * c[2] - b[2] * c[1])
+            + a[1] * (b[2] * c[0] - b[0] * c[2])
+            + a[2] * (b[0] * c[1] - b[1] * c[0])
+        ) / 6.0
+        self._grow_bbox(
+            (min(a[0], b[0], c[0]), min(a[1], b[1], c[1]), min(a[2], b[2], c[2])),
+            (max(a[0], b[0], c[0]), max(a[1], b[1], c[1]), max(a[2], b[2], c[2])),
+        )
+
+    def _add_records(self, records) -> None:
+        self._add_corners(
+            records["v0"].astype(np.float64), records["v1"].astype(np.float64), records["v2"].astype(np.float64)
+        )
+
+    def _add_corners(self, v0, v1, v2) -> None:
+        if not len(v0):
+            return
+        cross = np.cross(v1 - v0, v2 - v0)
+        area = 0.5 * np.sqrt(np.einsum("ij,ij->i", cross, cross))
+        self.triangles += len(v0)
+        self.surface_area += float(area.sum())
+        self.degenerate += int((area <= DEGENERATE_AREA_MM2).sum())
+        self.signed_volume += float(np.einsum("ij,ij->i", v0, np.cross(v1, v2)).sum()) / 6.0
+        lo = np.minimum(np.minimum(v0, v1), v2).min(axis=0)
+        hi = np.maximum(np.maximum(v0, v1), v2).max(axis=0)
+        self._grow_bbox(lo.tolist(), hi.tolist())
+
+    def add_buffer(self, triangles: TriangleBuffer) -> None:
+        if np is None:
+            for r in triangles.iter_records():
+                self.add_triangle(r[3:6], r[6:9], r[9:12])
+            return
+        for start in range(0, len(triangles), STATS_SLICE_TRIANGLES):
+            with triangles.view(start, start + STATS_SLICE_TRIANGLES) as view:
+                self._add_records(np.frombuffer(view, dtype=STL_DTYPE))
+
+    def add_indexed(self, vertices, triangles) -> None:
+        """Triangles of an indexed mesh ((N,3) vertices and (T,3) indices, or flat arrays)."""
+        if np is None:
+            for t in range(0, len(triangles) - 2, 3):
+                o, p, q = triangles[t] * 3, triangles[t + 1] * 3, triangles[t + 2] * 3
+                self.add_triangle(vertices[o : o + 3], vertices[p : p + 3], vertices[q : q + 3])
+            return
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        triangles = np.asarray(triangles).reshape(-1, 3)
+        for start in range(0, len(triangles), STATS_SLICE_TRIANGLES):
+            part = triangles[start : start + STATS_SLICE_TRIANGLES]
+            self._add_corners(vertices[part[:, 0]], vertices[part[:, 1]], vertices[part[:, 2]])
+
+    def merge(self, other: "StlStats") -> None:
+        """Fold another file's stats into this one (batch totals)."""
+        if other is None:
+            return
+        self.is_binary = bool(self.is_binary and other.is_binary)
+        self.triangles += other.triangles
+        if other.file_size is not None:
+            self.file_size = (self.file_size or 0) + other.file_size
+        if other.bbox_min is not None and other.bbox_max is not None:
+            self._grow_bbox(other.bbox_min, other.bbox_max)
+        self.surface_area += other.surface_area
+        self.signed_volume += other.signed_volume
+        self.degenerate += other.degenerate
+
+    def to_info(self) -> dict:
+        tri = self.triangles
+        return {
+            "isBinary": self.is_binary,
+            "triangles": tri if tri > 0 else None,
+            "vertices": tri * 3 if tri > 0 else None,
+            "fileSizeBytes": self.file_size,
+            "bboxMin": self.bbox_min,
+            "bboxMax": self.bbox_max,
+            "surfaceArea": self.surface_area,
+            "signedVolume": self.signed_volume,
+            "degenerateTriangles": self.degenerate,
+        }
+
+    @classmethod
+    def from_info(cls, info: dict) -> "StlStats":
+        stats = cls()
+        info = info or {}
+        stats.is_binary = info.get("isBinary")
+        stats.triangles = info.get("triangles") or 0
+        stats.file_size = info.get("fileSizeBytes")
+        stats.bbox_min = info.get("bboxMin")
+        stats.bbox_max = info.get("bboxMax")
+        stats.surface_area = info.get("surfaceArea") or 0.0
+        stats.signed_volume = info.get("signedVolume") or 0.0
+        stats.degenerate = info.get("degenerateTriangles") or 0
+        return stats
+
+
+@timed("analyze_stl")
+def stl_stats_from_file(stl_path: str) -> StlStats:
+    """Post-step for files written by Fusion itself (Legacy path): one mapped pass, full stats."""
+    stats = StlStats()
+    with StlReader(stl_path) as reader:
+        stats.file_size = reader.size
+        if reader.is_binary:
+            stats.add_buffer(reader.triangles())
+        else:
+            stats.is_binary = False
+            stats.triangles = reader.count_ascii_facets()
+    return stats
@@ -0,0 +1,234 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import StlStats
+from .config import add_clicks_saved, current_doc_key, remember_export, safe_filename
+from .constants import ADDIN_NAME, ADDIN_VERSION
+from .diagnostics import append_debug_event, export_summary, record_export_snapshot, snapshot_batch
+from .export import (
+    active_design,
+    begin_entity_export,
+    convert_export,
+    ensure_export_dir,
+    live_inputs,
+    name_for_entity,
+    output_extension,
+    output_format,
+    run_background,
+    run_foreground,
+    selected_targets,
+)
+from .mesh_calc import visible_items
+from .preview import write_preview
+from .state import STATE
+from .timing import Span, activate, current_trace, span
+from .toast import show_toast
+
+BATCH_MAX_WORKERS = 4
+
+
+def batch_worker_count(jobs: int) -> int:
+    """Conversion threads for a batch; one core stays with Fusion, which keeps exporting."""
+    cores = os.cpu_count() or 1
+    return max(1, min(jobs, cores - 1, BATCH_MAX_WORKERS))
+
+
+def unique_stem(stem: str, taken: set) -> str:
+    """`stem`, or `stem_2`, `stem_3`… so bodies with the same name do not overwrite each other."""
+    candidate = stem
+    n = 2
+    while candidate.lower() in taken:
+        candidate = f"{stem}_{n}"
+        n += 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def component_bodies(component) -> list:
+    """
+    (body, name) for every visible body of `component` and its occurrences. Occurrence
+    bodies are proxies, so each file keeps its assembly placement.
+    """
+    targets = [(body, body.name or "Body") for body in visible_items(component.bRepBodies)]
+    for occ in visible_items(component.allOccurrences):
+        for body in visible_items(occ.bRepBodies):
+            targets.append((body, f"{occ.component.name} {body.name}"))
+    return targets
+
+
+def begin_batch(design, targets: list, export_dir: str) -> dict:
+    """
+    Main thread: run Fusion's export for each target in turn. Every finished Fusion
+    export is handed straight to a conversion pool, so converting body N overlaps
+    tessellating body N+1. A failing target is recorded and the batch carries on.
+    """
+    items = []
+    taken = set()
+    # Parent of the pool threads' per-file spans; closed once convert_batch has them all.
+    pool_span = Span("batch_convert", current_trace())
+    pool = ThreadPoolExecutor(
+        max_workers=batch_worker_count(len(targets)), thread_name_prefix="quickstl-batch"
+    )
+    try:
+        for entity, raw_name in targets:
+            fname = unique_stem(safe_filename(raw_name), taken) + output_extension()
+            item = {"name": raw_name, "path": os.path.join(export_dir, fname)}
+            try:
+                ctx = begin_entity_export(design, entity, raw_name, export_dir, fname)
+                item["engine"] = ctx["engine"]
+                item["future"] = pool.submit(_convert_item, pool_span, ctx)
+            except Exception as exc:
+                item["error"] = exc
+            items.append(item)
+    finally:
+        pool.shutdown(wait=False)
+    return {"doc_key": current_doc_key(), "dir": export_dir, "items": items, "span": pool_span}
+
+
+def _convert_item(pool_span: Span, ctx: dict) -> dict:
+    with activate(pool_span), span("convert_item"):
+        return convert_export(ctx)
+
+
+def convert_batch(batch: dict, job=None) -> dict:
+    """Wait for the conversion pool. Safe on a worker thread."""
+    items = batch["items"]
+    for k, item in enumerate(items):
+        future = item.pop("future", None)
+        if future is not None:
+            try:
+                ctx = future.result()
+                item["stats"] = ctx["stats"]
+                item["applied"] = ctx["applied"]
+                item["overwriting"] = ctx["overwriting"]
+            except Exception as exc:
+                item["error"] = exc
+        if job:
+            job.update("converting", (k + 1) / len(items))
+    batch["span"].finish()
+    largest = largest_item(items)
+    if largest:
+        batch["preview"] = write_preview(largest["path"]) or {}
+    return batch
+
+
+def largest_item(items: list):
+    """The exported item with the most triangles (shown in the batch toast), or None."""
+    done = [item for item in items if item.get("stats")]
+    return max(done, key=lambda item: item["stats"].triangles) if done else None
+
+
+def complete_batch(batch: dict, action: str, inputs=None) -> dict:
+    """Main thread: one summary toast and snapshot for the whole batch."""
+    items = batch["items"]
+    done = [item for item in items if item.get("stats")]
+    failed = [item for item in items if item.get("error")]
+    total = StlStats()
+    for item in done:
+        total.merge(item["stats"])
+
+    snap = snapshot_batch(action, batch["dir"], items, total)
+    record_export_snapshot(snap)
+    remember_export(batch["doc_key"], export_summary(snap))
+    append_debug_event(
+        "info",
+        "Batch export completed",
+        {"action": action, "files": len(done), "failed": len(failed)},
+    )
+
+    if done:
+        largest = largest_item(items)
+        overwrote = any(item.get("overwriting") for item in done)
+        try:
+            show_toast(
+                batch["dir"],
+                f"{len(done)} {output_format()} files",
+                overwrote,
+                largest["path"],
+                total,
+                batch.get("preview"),
+            )
+        except Exception as exc:
+            STATE.ui.messageBox(
+                f"✅ Exported {len(done)} of {len(items)} {output_format()} files. (Quick STL v{ADDIN_VERSION})\n\n"
+                f"Folder:\n{batch['dir']}\n"
+                f"Overwrote existing files: {'Yes' if overwrote else 'No'}\n\n"
+                f"(Palette fallback due to: {exc})",
+                f"{ADDIN_NAME} v{ADDIN_VERSION}",
+            )
+    if failed:
+        lines = "\n".join(f"• {item['name']}: {item['error']}" for item in failed[:10])
+        STATE.ui.messageBox(
+            f"⚠️ {len(failed)} of {len(items)} files failed to export.\n\n{lines}",
+            f"{ADDIN_NAME} v{ADDIN_VERSION}",
+        )
+    if inputs and done:
+        add_clicks_saved(5 * len(done), inputs)
+    return batch
+
+
+def begin_component_batch(folder_override: str = "") -> dict:
+    design = active_design()
+    export_dir = ensure_export_dir(folder_override)
+    comp = design.activeComponent
+    targets = component_bodies(comp)
+    if not targets:
+        raise RuntimeError(f"Nothing to export (no visible bodies in {name_for_entity(comp)}).")
+    return begin_batch(design, targets, export_dir)
+
+
+def batch_export(folder_override: str = "", inputs=None):
+    """Export every visible body of the active component, one STL each (synchronous)."""
+    return run_foreground(
+        lambda: begin_component_batch(folder_override),
+        convert_batch,
+        lambda batch: complete_batch(batch, "batch", inputs),
+        "batch",
+    )
+
+
+def start_batch_export(folder_override: str = "", inputs=None, on_progress=None):
+    """Asynchronous batch_export. Returns the ExportJob, or None when busy."""
+    return run_background(
+        "batch",
+        "Export all bodies",
+        lambda: begin_component_batch(folder_override),
+        convert_batch,
+        lambda batch: complete_batch(batch, "batch", live_inputs(inputs)),
+        on_progress,
+    )
+
+
+def separate_selection_requested() -> bool:
+    """Several entities are selected and the user wants one file each."""
+    if STATE.config.get("selection_mode", "Merge") != "Separate":
+        return False
+    return len(selected_targets()) > 1
+
+
+def begin_selection_batch(folder_override: str = "") -> dict:
+    design = active_design()
+    export_dir = ensure_export_dir(folder_override)
+    return begin_batch(design, selected_targets(), export_dir)
+
+
+def selection_export(folder_override: str = "", inputs=None):
+    """Export each selected entity to its own STL (synchronous)."""
+    return run_foreground(
+        lambda: begin_selection_batch(folder_override),
+        convert_batch,
+        lambda batch: complete_batch(batch, "selection", inputs),
+        "selection",
+    )
+
+
+def start_selection_export(folder_override: str = "", inputs=None, on_progress=None):
+    """Asynchronous selection_export. Returns the ExportJob, or None when busy."""
+    return run_background(
+        "selection",
+        "Export STL",
+        lambda: begin_selection_batch(folder_override),
+        convert_batch,
+        lambda batch: complete_batch(batch, "selection", live_inputs(inputs)),
+        on_progress,
+    )
@@ -0,0 +1,287 @@
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from .config import doc_setting
+from .constants import ADDIN_VERSION
+from .logging_utils import log_warning
+from .mesh_calc import collect_bodies
+from .paths import cache_dir
+from .quality import QUALITY_PRESETS
+from .state import STATE
+from .timing import timed
+
+INDEX_FN = "index.json"
+OBJECTS_DIR = "objects"
+HASH_BLOCK = 1024 * 1024
+
+
+def _safe(getter, default=None):
+    try:
+        return getter()
+    except Exception:
+        return default
+
+
+def entity_token(entity) -> str:
+    token = _safe(lambda: entity.entityToken)
+    if token:
+        return str(token)
+    return str(_safe(lambda: entity.name, "") or "")
+
+
+@timed("design_signal")
+def design_signal(design, entity) -> list:
+    """
+    Cheap change signal: timeline position/length, saved document version, and a
+    per-body geometry fingerprint (area, volume, face count, placement). The fingerprint
+    catches edits that do not move the timeline marker, such as a changed dimension.
+    Runs on the main thread for every export; its cost shows up as the design_signal stage.
+    """
+    signal = [
+        _safe(lambda: design.timeline.markerPosition),
+        _safe(lambda: design.timeline.count),
+        _safe(lambda: design.parentDocument.dataFile.versionNumber),
+    ]
+    for body, transform in collect_bodies(entity):
+        signal.append(
+            [
+                round(_safe(lambda: body.area, 0.0), 9),
+                round(_safe(lambda: body.volume, 0.0), 9),
+                _safe(lambda: body.faces.count),
+                transform,
+            ]
+        )
+    return signal
+
+
+def cache_key(design, entity, quality: str, engine: str) -> str:
+    payload = [
+        ADDIN_VERSION,
+        entity_token(entity),
+        design_signal(design, entity),
+        quality,
+        QUALITY_PRESETS.get(quality),
+        engine,
+        doc_setting("format", "STL"),
+    ]
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def selection_cache_key(design, entities, quality: str, engine: str) -> str:
+    """One key for several entities merged into a single file; order matters for the layout."""
+    parts = ["merged"] + [cache_key(design, entity, quality, engine) for entity in entities]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def copy_with_digest(src: str, dst: str) -> str:
+    """Copy `src` to `dst` and return the SHA-256 of what was copied, in one read pass."""
+    digest = hashlib.sha256()
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        for block in iter(lambda: source.read(HASH_BLOCK), b""):
+            digest.update(block)
+            target.write(block)
+    return digest.hexdigest()
+
+
+def _same_file(path: str, entry: dict) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == entry.get("size") and st.st_mtime == entry.get("mtime")
+
+
+class ExportCache:
+    """
+    Two tiers keyed by cache_key(): an in-session map of the last file written per key
+    (an unchanged re-export to the same path is a no-op, elsewhere a copy), and a
+    size-capped content-addressed store on disk with least-recently-used eviction.
+    store() only updates the in-session tier; a daemon thread hashes and copies the file
+    into the disk store afterwards, so finishing an export never waits on that I/O.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._memory = {}
+        self._index = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _objects(self) -> str:
+        return os.path.join(self.root, OBJECTS_DIR)
+
+    def _object_path(self, digest: str, ext: str = ".stl") -> str:
+        # Index entries written before the extension was recorded are all STL.
+        return os.path.join(self._objects(), digest + ext)
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            self._index = {}
+            try:
+                with open(os.path.join(self.root, INDEX_FN), "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+                if isinstance(data, dict):
+                    self._index = data
+            except Exception:
+                pass
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, INDEX_FN + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(self._index or {}, handle)
+        os.replace(tmp, os.path.join(self.root, INDEX_FN))
+
+    def restore(self, key: str, dest: str):
+        """Materialize a cached export at `dest`. Returns the stored entry plus its tier, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                same_path = os.path.normcase(entry["path"]) == os.path.normcase(dest)
+                if same_path and _same_file(dest, entry):
+                    return dict(entry, tier="memory", copied=False)
+                if _same_file(entry["path"], entry):
+                    shutil.copyfile(entry["path"], dest)
+                    return dict(entry, tier="memory", copied=True)
+
+            index = self._load_index()
+            entry = index.get("keys", {}).get(key)
+            if not entry:
+                return None
+            src = self._object_path(entry["digest"], entry.get("ext", ".stl"))
+            if not os.path.isfile(src):
+                index["keys"].pop(key, None)
+                return None
+            shutil.copyfile(src, dest)
+            entry["last_used"] = time.time()
+            self._save_index()
+            self._remember(key, dest, entry)
+            return dict(entry, tier="disk", copied=True)
+
+    def _remember(self, key: str, path: str, entry: dict) -> None:
+        st = os.stat(path)
+        self._memory[key] = dict(entry, path=path, size=st.st_size, mtime=st.st_mtime)
+
+    def store(self, key: str, path: str, applied: dict, engine: str, stats: dict) -> None:
+        entry = {
+            "applied": applied,
+            "engine": engine,
+            "stats": stats,
+            "last_used": time.time(),
+        }
+        with self._lock:
+            self._remember(key, path, entry)
+            if self.max_bytes <= 0:
+                return
+            self._pending.append((key, self._memory[key]))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quickstl-cache", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Copy every stored export still queued into the disk store."""
+        with self._io_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    key, entry = self._pending.pop(0)
+                try:
+                    self._ingest(key, entry)
+                except Exception as exc:
+                    log_warning(f"Export cache store failed: {exc}")
+
+    def _ingest(self, key: str, entry: dict) -> None:
+        os.makedirs(self._objects(), exist_ok=True)
+        tmp = os.path.join(self._objects(), key + ".tmp")
+        try:
+            digest = copy_with_digest(entry["path"], tmp)
+            if not _same_file(entry["path"], entry):
+                # Overwritten since store(); whatever replaced it queues its own entry.
+                return
+            ext = os.path.splitext(entry["path"])[1].lower() or ".bin"
+            obj = self._object_path(digest, ext)
+            with self._lock:
+                if not os.path.isfile(obj):
+                    os.replace(tmp, obj)
+                if self._memory.get(key) is entry:
+                    entry["digest"] = digest
+                index = self._load_index()
+                stored = {name: entry[name] for name in ("applied", "engine", "stats", "last_used")}
+                index.setdefault("keys", {})[key] = dict(stored, digest=digest, ext=ext, bytes=os.path.getsize(obj))
+                self._evict(index)
+                self._save_index()
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self.flush()
+
+    def _evict(self, index: dict) -> None:
+        keys = index.get("keys", {})
+        sizes = {}
+        exts = {}
+        last_used = {}
+        for entry in keys.values():
+            sizes[entry["digest"]] = entry.get("bytes", 0)
+            exts[entry["digest"]] = entry.get("ext", ".stl")
+            last_used[entry["digest"]] = max(last_used.get(entry["digest"], 0), entry["last_used"])
+        total = sum(sizes.values())
+        for digest in sorted(last_used, key=last_used.get):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._object_path(digest, exts[digest]))
+            except OSError:
+                pass
+            total -= sizes[digest]
+            for key in [k for k, e in keys.items() if e["digest"] == digest]:
+                del keys[key]
+
+
+_CACHE = None
+
+
+def get_cache() -> ExportCache:
+    global _CACHE
+    max_bytes = int(STATE.config.get("cache_max_mb", 512)) * 1024 * 1024
+    if _CACHE is None:
+        _CACHE = ExportCache(cache_dir(), max_bytes)
+    _CACHE.max_bytes = max_bytes
+    return _CACHE
+
+
+def restore_cached_export(key: str, dest: str):
+    if not key or not STATE.config.get("cache_enabled", True):
+        return None
+    try:
+        return get_cache().restore(key, dest)
+    except Exception as exc:
+        log_warning(f"Export cache restore failed: {exc}")
+        return None
+
+
+def store_cached_export(key: str, path: str, applied: dict, engine: str, stats: dict) -> None:
+    if not key or not STATE.config.get("cache_enabled", True):
+        return
+    try:
+        get_cache().store(key, path, applied, engine, stats)
+    except Exception as exc:
+        log_warning(f"Export cache store failed: {exc}")
@@ -1,13 +1,45 @@
 import os
 import adsk.core
 
-from .config import get_doc_folder, resolve_export_dir, save_config, set_doc_folder
-from .constants import ADDIN_NAME, ADDIN_VERSION, CMD_ID, CMD_NAME, QUALITY_CHOICES, SLICER_CHOICES
-from .diagnostics import append_debug_event
+from .batch import (
+    batch_export,
+    selection_export,
+    separate_selection_requested,
+    start_batch_export,
+    start_selection_export,
+)
+from .config import (
+    doc_setting,
+    get_doc_folder,
+    resolve_export_dir,
+    save_config,
+    set_doc_folder,
+    set_doc_setting,
+)
+from .constants import (
+    ADDIN_NAME,
+    ADDIN_VERSION,
+    CMD_ID,
+    CMD_NAME,
+    ENGINE_CHOICES,
+    FORMAT_CHOICES,
+    QUALITY_CHOICES,
+    SELECTION_MODE_CHOICES,
+    SLICER_CHOICES,
+)
+from .diagnostics import append_debug_event, write_debug_file
 from .dialogs import pick_file_dialog, pick_folder_dialog
-from .export import do_export_to_path, export_and_send, handle_export_error
+from .export import (
+    do_export_to_path,
+    export_and_send,
+    handle_export_error,
+    start_export,
+    start_export_and_send,
+)
+from .jobs import async_exports_enabled
 from .logging_utils import log
 from .paths import icon_folder
+from .profiling import PROFILE_EXPORT_RUNS
 from .slicer import autodetect_slicer_path
 from .state import STATE
 from .toast import open_path
@@ -40,10 +72,16 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             "",
             STATE.config.get("prefer_selection", True),
         )
+        mode = STATE.config.get("selection_mode", SELECTION_MODE_CHOICES[0])
+        mdd = g1c.addDropDownCommandInput(
+            "selModeDD", "Multiple selection", adsk.core.DropDownStyles.TextListDropDownStyle
+        )
+        for name in SELECTION_MODE_CHOICES:
+            mdd.listItems.add(name, name == mode, "")
         note = g1c.addTextBoxCommandInput(
             "perDocNote",
             "",
-            "This folder is remembered for this document.",
+            "Folder, quality and format are remembered for this document.",
             1,
             True,
         )
@@ -52,12 +90,24 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         except Exception:
             pass
 
-        q = STATE.config.get("quality", "Legacy")
+        q = doc_setting("quality", "Legacy")
         qdd = g1c.addDropDownCommandInput(
             "qualityDD", "Mesh Quality", adsk.core.DropDownStyles.TextListDropDownStyle
         )
         for name in QUALITY_CHOICES:
             qdd.listItems.add(name, name == q, "")
+        eng = STATE.config.get("engine", ENGINE_CHOICES[0])
+        edd = g1c.addDropDownCommandInput(
+            "engineDD", "Mesh Engine", adsk.core.DropDownStyles.TextListDropDownStyle
+        )
+        for name in ENGINE_CHOICES:
+            edd.listItems.add(name, name == eng, "")
+        fmt = doc_setting("format", FORMAT_CHOICES[0])
+        fdd = g1c.addDropDownCommandInput(
+            "formatDD", "Output Format", adsk.core.DropDownStyles.TextListDropDownStyle
+        )
+        for name in FORMAT_CHOICES:
+            fdd.listItems.add(name, name == fmt, "")
 
         g2 = inputs.addGroupCommandInput("grpSlicer", "Slicer")
         g2.isExpanded = True
@@ -75,7 +125,7 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         )
         if slicer_path:
             STATE.config["slicer"]["paths"][STATE.config["slicer"]["name"]] = slicer_path
-            save_config()
+            save_config("slicer")
         path_disp = g2c.addStringValueInput("slicerPath", "Slicer EXE", slicer_path)
         path_disp.isReadOnly = True
         browse_slicer = g2c.addBoolValueInput("browseSlicer", "Browse Slicer…", False, "", False)
@@ -86,6 +136,7 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         g3c = g3.children
         send_btn = g3c.addBoolValueInput("sendBtn", "Send to slicer", False, "", False)
         export_btn = g3c.addBoolValueInput("exportBtn", "Export STL", False, "", False)
+        batch_btn = g3c.addBoolValueInput("batchBtn", "Export all bodies", False, "", False)
         clicks_tb = g3c.addTextBoxCommandInput(
             "clicksSavedText",
             "",
@@ -97,7 +148,19 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             clicks_tb.isFullWidth = True
         except Exception:
             pass
+        status_tb = g3c.addTextBoxCommandInput("jobStatusText", "", "", 1, True)
+        try:
+            status_tb.isFullWidth = True
+        except Exception:
+            pass
         diag_btn = g3c.addBoolValueInput("diagBtn", "Debug", False, "", False)
+        profile_cb = g3c.addBoolValueInput(
+            "profileExports",
+            "Profile next exports",
+            True,
+            "",
+            bool(STATE.config.get("profile_exports", 0)),
+        )
 
         try:
             folder_disp.tooltip = "This folder is saved for THIS document. Use “Browse…” to change."
@@ -106,18 +169,42 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             prefer.tooltip = (
                 "ON: if a body is selected, export that body; otherwise export the active component."
             )
+            mdd.tooltip = (
+                "When several bodies/components are selected:\n"
+                "• Merge: one STL with everything in place\n"
+                "• Separate: one STL per selection (Send to slicer always merges)"
+            )
             qdd.tooltip = (
                 "Mesh tessellation quality:\n"
                 "• Legacy: STL Only (same as Fusion 3D Print)\n"
                 "• Low/…/Ultra: OBJ→STL with tighter tolerances"
             )
+            edd.tooltip = (
+                "How Low/…/Ultra meshes are produced:\n"
+                "• OBJ→STL: Fusion OBJ export, converted to STL\n"
+                "• Direct Mesh: Fusion mesh calculator, no temp OBJ"
+            )
+            fdd.tooltip = (
+                "File written for Export and Send:\n"
+                "• STL: binary STL, opens anywhere\n"
+                "• 3MF: shared vertices, compressed; much smaller and faster to load"
+            )
             drop.tooltip = 'Slicer to launch when you click "Send to slicer".'
             path_disp.tooltip = "Executable used to launch the slicer."
             browse_slicer.tooltip = "Pick the slicer executable (.exe)."
             export_btn.tooltip = "Export STL and show a success toast with live preview."
+            batch_btn.tooltip = (
+                "Export every visible body in the active component as its own STL,\n"
+                "named after the body. One summary toast at the end."
+            )
             send_btn.tooltip = "Export STL, then launch and focus the slicer. No toast unless it fails."
             clicks_tb.tooltip = "Estimated clicks saved (assumes 5 per export or send)."
+            status_tb.tooltip = "Progress of the export running in the background."
             diag_btn.tooltip = "Open debug.json (export history, errors)."
+            profile_cb.tooltip = (
+                f"Run the next {PROFILE_EXPORT_RUNS} exports under cProfile and tracemalloc.\n"
+                "The .pstats file and a text summary are saved next to debug.json."
+            )
             cmd.tooltip = f"Quick STL v{ADDIN_VERSION} — OBJ→STL quality + debug info."
         except Exception:
             pass
@@ -134,6 +221,38 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
         STATE.handlers.append(on_destroy)
 
 
+def dialog_export_folder(inputs: adsk.core.CommandInputs) -> str:
+    """Folder shown in the dialog (asking for one if empty), remembered for this document."""
+    fld = adsk.core.StringValueCommandInput.cast(find_input(inputs, "folderDisp"))
+    folder = fld.value.strip() if fld else ""
+    if not folder:
+        folder = resolve_export_dir("")
+        if fld:
+            fld.value = folder
+    set_doc_folder(folder)
+    return folder
+
+
+def job_status_updater(inputs: adsk.core.CommandInputs):
+    """Progress callback that mirrors an export job into the dialog's status line."""
+
+    def update(job) -> None:
+        if STATE.command is None:
+            return
+        tb = adsk.core.TextBoxCommandInput.cast(find_input(inputs, "jobStatusText"))
+        if not tb:
+            return
+        label = {"send": "Send", "batch": "Batch", "selection": "Selection"}.get(job.action, "Export")
+        if job.status == "done":
+            tb.text = f"{label}: done in {job.describe()['seconds']:.1f} s"
+        elif job.status == "failed":
+            tb.text = f"{label}: failed"
+        else:
+            tb.text = f"{label}: {job.phase or job.status}… {int(job.progress * 100)}%"
+
+    return update
+
+
 class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
     def notify(self, args: adsk.core.InputChangedEventArgs):
         try:
@@ -174,8 +293,29 @@ class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
             elif ip.id == "qualityDD":
                 dd = adsk.core.DropDownCommandInput.cast(ip)
                 if dd and dd.selectedItem:
-                    STATE.config["quality"] = dd.selectedItem.name
-                    save_config()
+                    set_doc_setting("quality", dd.selectedItem.name)
+
+            elif ip.id == "selModeDD":
+                dd = adsk.core.DropDownCommandInput.cast(ip)
+                if dd and dd.selectedItem:
+                    STATE.config["selection_mode"] = dd.selectedItem.name
+                    save_config("selection_mode")
+
+            elif ip.id == "engineDD":
+                dd = adsk.core.DropDownCommandInput.cast(ip)
+                if dd and dd.selectedItem:
+                    STATE.config["engine"] = dd.selectedItem.name
+                    save_config("engine")
+
+            elif ip.id == "profileExports":
+                b = adsk.core.BoolValueCommandInput.cast(ip)
+                STATE.config["profile_exports"] = PROFILE_EXPORT_RUNS if b and b.value else 0
+                save_config("profile_exports")
+
+            elif ip.id == "formatDD":
+                dd = adsk.core.DropDownCommandInput.cast(ip)
+                if dd and dd.selectedItem:
+                    set_doc_setting("format", dd.selectedItem.name)
 
             elif ip.id == "slicerChoice":
                 dd = adsk.core.DropDownCommandInput.cast(ip)
@@ -187,7 +327,7 @@ class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
                     if sp:
                         sp.value = path
                     STATE.config["slicer"]["paths"][name] = path
-                    save_config()
+                    save_config("slicer")
 
             elif ip.id == "browseSlicer":
                 dd = adsk.core.DropDownCommandInput.cast(find_input(inputs, "slicerChoice"))
@@ -204,7 +344,7 @@ class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
                     if sp:
                         sp.value = chosen
                     STATE.config["slicer"]["paths"][cur] = chosen
-                    save_config()
+                    save_config("slicer")
                 b = adsk.core.BoolValueCommandInput.cast(ip)
                 if b:
                     b.value = False
@@ -216,18 +356,27 @@ class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
                 b.value = False
                 try:
                     append_debug_event("info", "export_clicked", {})
-                    fld = adsk.core.StringValueCommandInput.cast(
-                        find_input(inputs, "folderDisp")
-                    )
-                    folder = fld.value.strip() if fld else ""
-                    if not folder:
-                        folder = resolve_export_dir("")
-                        if fld:
-                            fld.value = folder
-                    set_doc_folder(folder)
-                    do_export_to_path(
-                        folder_override=folder, skip_toast=False, inputs=inputs
-                    )
+                    folder = dialog_export_folder(inputs)
+                    if separate_selection_requested():
+                        if async_exports_enabled():
+                            start_selection_export(
+                                folder_override=folder,
+                                inputs=inputs,
+                                on_progress=job_status_updater(inputs),
+                            )
+                        else:
+                            selection_export(folder_override=folder, inputs=inputs)
+                    elif async_exports_enabled():
+                        start_export(
+                            folder_override=folder,
+                            skip_toast=False,
+                            inputs=inputs,
+                            on_progress=job_status_updater(inputs),
+                        )
+                    else:
+                        do_export_to_path(
+                            folder_override=folder, skip_toast=False, inputs=inputs
+                        )
                 except Exception as exc:
                     handle_export_error("Export STL", exc)
 
@@ -238,31 +387,41 @@ class CommandInputChangedHandler(adsk.core.InputChangedEventHandler):
                 b.value = False
                 try:
                     append_debug_event("info", "send_clicked", {})
-                    fld = adsk.core.StringValueCommandInput.cast(
-                        find_input(inputs, "folderDisp")
-                    )
-                    folder = fld.value.strip() if fld else ""
-                    if not folder:
-                        folder = resolve_export_dir("")
-                        if fld:
-                            fld.value = folder
-                    set_doc_folder(folder)
-                    export_and_send(folder_override=folder, inputs=inputs)
+                    folder = dialog_export_folder(inputs)
+                    if async_exports_enabled():
+                        start_export_and_send(
+                            folder_override=folder,
+                            inputs=inputs,
+                            on_progress=job_status_updater(inputs),
+                        )
+                    else:
+                        export_and_send(folder_override=folder, inputs=inputs)
                 except Exception as exc:
                     handle_export_error("Send to slicer", exc)
 
-            elif ip.id == "diagBtn":
+            elif ip.id == "batchBtn":
+                b = adsk.core.BoolValueCommandInput.cast(ip)
+                if not b or not b.value:
+                    return
+                b.value = False
                 try:
-                    from .paths import debug_path
-
-                    path = debug_path()
-                    if os.path.isfile(path):
-                        os.startfile(path)
-                    else:
-                        STATE.ui.messageBox(
-                            "No debug file found yet.\n\nExport once to generate debug.json.",
-                            f"{ADDIN_NAME} v{ADDIN_VERSION}",
+                    append_debug_event("info", "batch_clicked", {})
+                    folder = dialog_export_folder(inputs)
+                    if async_exports_enabled():
+                        start_batch_export(
+                            folder_override=folder,
+                            inputs=inputs,
+                            on_progress=job_status_updater(inputs),
                         )
+                    else:
+                        batch_export(folder_override=folder, inputs=inputs)
+                except Exception as exc:
+                    handle_export_error("Export all bodies", exc)
+
+            elif ip.id == "diagBtn":
+                try:
+                    # debug.json is a snapshot built on demand from the event log and state file.
+                    write_debug_file(open_after=True)
                 except Exception as exc:
                     log(f"Debug open failed: {exc}")
                 b = adsk.core.BoolValueCommandInput.cast(ip)
@@ -279,7 +438,7 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
             inputs = args.command.commandInputs
             pref = adsk.core.BoolValueCommandInput.cast(find_input(inputs, "preferSel"))
             STATE.config["prefer_selection"] = bool(pref.value) if pref else True
-            save_config()
+            save_config("prefer_selection")
             append_debug_event("ui", "command_executed", {})
         except Exception as exc:
             log(f"Execute (OK) error: {exc}")
@@ -4,14 +4,28 @@ import re
 
 import adsk.core
 
-from .constants import QUALITY_CHOICES, SLICER_CHOICES
+from .constants import (
+    ENGINE_CHOICES,
+    FORMAT_CHOICES,
+    QUALITY_CHOICES,
+    SELECTION_MODE_CHOICES,
+    SLICER_CHOICES,
+)
+from .config_store import ConfigStore
 from .dialogs import pick_folder_dialog
-from .logging_utils import log
-from .paths import config_path
+from .doc_settings import DOC_SETTINGS_CAPACITY, DocSettingsStore
+from .logging_utils import log, log_warning
+from .paths import config_path, doc_settings_path
 from .state import STATE
 
+STORE = ConfigStore(config_path, lambda: STATE.config)
+DOCS = DocSettingsStore(
+    doc_settings_path, lambda: STATE.config.get("doc_settings_capacity", DOC_SETTINGS_CAPACITY)
+)
+
 
 def load_config() -> None:
+    data = None
     try:
         with open(config_path(), "r", encoding="utf-8") as handle:
             data = json.load(handle)
@@ -22,10 +36,6 @@ def load_config() -> None:
                         STATE.config[key].update(data[key])
                     else:
                         STATE.config[key] = data[key]
-            if "per_doc_folders" not in STATE.config or not isinstance(
-                STATE.config["per_doc_folders"], dict
-            ):
-                STATE.config["per_doc_folders"] = {}
             if "clicks_saved" not in STATE.config or not isinstance(
                 STATE.config["clicks_saved"], int
             ):
@@ -35,18 +45,45 @@ def load_config() -> None:
                 or STATE.config["quality"] not in QUALITY_CHOICES
             ):
                 STATE.config["quality"] = "Legacy"
+            if STATE.config.get("engine") not in ENGINE_CHOICES:
+                STATE.config["engine"] = ENGINE_CHOICES[0]
+            if STATE.config.get("format") not in FORMAT_CHOICES:
+                STATE.config["format"] = FORMAT_CHOICES[0]
+            if STATE.config.get("selection_mode") not in SELECTION_MODE_CHOICES:
+                STATE.config["selection_mode"] = SELECTION_MODE_CHOICES[0]
             for name in SLICER_CHOICES:
                 STATE.config["slicer"]["paths"].setdefault(name, "")
-    except Exception:
+    except FileNotFoundError:
         pass
+    except Exception as exc:
+        log_warning(f"config.json unreadable, using defaults: {exc}")
+    STORE.loaded(data if isinstance(data, dict) else None)
+    legacy = data.get("per_doc_folders") if isinstance(data, dict) else None
+    if isinstance(legacy, dict):
+        migrate_doc_folders(legacy)
+        # Drops the old map from config.json.
+        save_config("per_doc_folders")
 
 
-def save_config() -> None:
-    try:
-        with open(config_path(), "w", encoding="utf-8") as handle:
-            json.dump(STATE.config, handle, indent=2)
-    except Exception:
-        pass
+def migrate_doc_folders(folders: dict) -> None:
+    """Move the pre-3.x `per_doc_folders` map into the document settings store."""
+    for key, folder in folders.items():
+        if isinstance(folder, str) and folder.strip() and not DOCS.get(key).get("folder"):
+            DOCS.update(key, folder=folder.strip())
+    # Written now so the folders are on disk before config.json forgets them.
+    DOCS.flush()
+    log(f"Migrated {len(folders)} per-document folders ({len(DOCS)} kept)")
+
+
+def save_config(*keys) -> None:
+    """Queue a background write of the config if `keys` (default: any key) changed."""
+    STORE.mark(*keys)
+
+
+def flush_config() -> None:
+    """Write pending config and document settings now and stop the writers (add-in stop)."""
+    STORE.close()
+    DOCS.close()
 
 
 def current_doc_key() -> str:
@@ -68,19 +105,37 @@ def current_doc_key() -> str:
     return "global"
 
 
+def doc_setting(name: str, default=None):
+    """The active document's own value for `name`, else the global config value."""
+    value = DOCS.get(current_doc_key()).get(name)
+    if value not in (None, ""):
+        return value
+    return STATE.config.get(name, default)
+
+
+def set_doc_setting(name: str, value) -> None:
+    """Remember `value` for the active document and as the default for new ones."""
+    DOCS.update(current_doc_key(), **{name: value})
+    STATE.config[name] = value
+    save_config(name)
+
+
 def get_doc_folder() -> str:
-    key = current_doc_key()
-    folder = STATE.config.get("per_doc_folders", {}).get(key, "").strip()
+    folder = (DOCS.get(current_doc_key()).get("folder") or "").strip()
     if folder:
         return folder
     return (STATE.config.get("export_dir") or "").strip()
 
 
 def set_doc_folder(folder: str) -> None:
-    key = current_doc_key()
-    STATE.config.setdefault("per_doc_folders", {})[key] = folder
+    DOCS.update(current_doc_key(), folder=folder)
     STATE.config["export_dir"] = folder
-    save_config()
+    save_config("export_dir")
+
+
+def remember_export(doc_key: str, info: dict) -> None:
+    """Last-export metadata for the document the export started in."""
+    DOCS.update(doc_key, last_export=info)
 
 
 def safe_filename(name: str) -> str:
@@ -115,7 +170,7 @@ def add_clicks_saved(count: int, inputs: adsk.core.CommandInputs = None) -> None
         )
     except Exception:
         STATE.config["clicks_saved"] = int(count)
-    save_config()
+    save_config("clicks_saved")
     if inputs:
         from .ui_helpers import find_input
 
@@ -0,0 +1,115 @@
+import atexit
+import copy
+import json
+import os
+import threading
+
+from .logging_utils import log_warning
+
+
+class ConfigStore:
+    """
+    Debounced, atomic persistence of a config dict. mark() compares keys against what
+    was last written and, if any changed, serializes the dict on the calling thread (the
+    one that owns it); a daemon thread waits `debounce` seconds for more changes, then
+    writes the latest snapshot to a temp file and os.replace()s it over the original, so
+    a crash never leaves a half-written file.
+    """
+
+    def __init__(self, path_fn, data_fn, debounce: float = 0.5):
+        self.path_fn = path_fn
+        self.data_fn = data_fn
+        self.debounce = debounce
+        self._saved = {}
+        self._dirty = set()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def loaded(self, saved: dict = None) -> None:
+        """Record what is on disk (`saved`, default: the current data) after loading it."""
+        self._saved = copy.deepcopy(self.data_fn() if saved is None else saved)
+        with self._lock:
+            self._dirty.clear()
+            self._pending = None
+            self._closed = False
+        self._stop.clear()
+
+    def dirty_keys(self) -> set:
+        with self._lock:
+            return set(self._dirty)
+
+    def mark(self, *keys) -> bool:
+        """Queue a write if any of `keys` (default: all) differ from disk. True when queued."""
+        data = self.data_fn()
+        saved = self._saved
+        changed = [k for k in (keys or set(data) | set(saved)) if data.get(k) != saved.get(k)]
+        if not changed:
+            return False
+        self._queue(data, changed)
+        return True
+
+    def touch(self) -> None:
+        """Queue a write although no value changed, e.g. when only the key order did."""
+        self._queue(self.data_fn(), ())
+
+    def _queue(self, data: dict, keys) -> None:
+        text = json.dumps(data, indent=2)
+        with self._lock:
+            self._dirty.update(keys)
+            self._pending = text
+            closed = self._closed
+            if not closed and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quickstl-config", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        if closed:
+            self.flush()
+        else:
+            self._wake.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                keys, self._dirty = self._dirty, set()
+                text, self._pending = self._pending, None
+            if text is None:
+                return
+            path = self.path_fn()
+            tmp = f"{path}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as handle:
+                    handle.write(text)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp, path)
+                self._saved = json.loads(text)
+            except Exception as exc:
+                with self._lock:
+                    self._dirty.update(keys)
+                    if self._pending is None:
+                        self._pending = text
+                log_warning(f"Saving config failed: {exc}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Coalesce a burst of changes (dropdown scrolling, clicks) into one write.
+            self._stop.wait(self.debounce)
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the writer thread and write anything still pending."""
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self.flush()
@@ -4,6 +4,10 @@ ADDIN_VERSION = "3.00.0"
 CMD_ID = "quickstl_export_cmd"
 CMD_NAME = "Quick STL"
 CONFIG_FILENAME = "config.json"
+DOC_SETTINGS_FILENAME = "doc_settings.json"
+JOB_EVENT_ID = "quickstl_job_event"
+# Event-log message carrying an export snapshot (read back by quickstl.report)
+EXPORT_SNAPSHOT_EVENT = "export_snapshot"
 
 # Legacy STL path always writes Binary STL
 BINARY_FORMAT = True
@@ -19,18 +23,30 @@ TOAST_H = 525
 RES_DIR = "resources"
 TOAST_HTML_FN = "quickstl_toast.html"
 TOAST_JSON_FN = "quickstl_toast.json"
+TOAST_PREVIEW_FN = "quickstl_toast_preview.bin"
 PREVIEW_DIR = "preview"
 THREE_FILE = "three.min.js"
 
 SLICER_CHOICES = ["OrcaSlicer", "SuperSlicer", "Bambu Studio"]
 QUALITY_CHOICES = ["Legacy", "Low", "Medium", "High", "VeryHigh", "Ultra"]
+ENGINE_CHOICES = ["OBJ→STL", "Direct Mesh"]
+FORMAT_CHOICES = ["STL", "3MF"]
+SELECTION_MODE_CHOICES = ["Merge", "Separate"]
 
 DEFAULT_CONFIG = {
     "export_dir": "",
     "prefer_selection": True,
-    "per_doc_folders": {},
+    "profile_exports": 0,  # next N exports run under cProfile + tracemalloc (dialog toggle)
+    "selection_mode": "Merge",  # several selected entities: one merged STL, or Separate files
+    "doc_settings_capacity": 200,  # documents remembered in doc_settings.json (LRU)
     "clicks_saved": 0,
     "quality": "Legacy",  # Legacy uses STL Only; other presets use OBJ→STL
+    "engine": "OBJ→STL",  # or Direct Mesh (mesh calculator, no temp OBJ)
+    "format": "STL",  # or 3MF (shared vertices, deflated; Orca/Bambu/SuperSlicer import it)
+    "cache_enabled": True,
+    "cache_max_mb": 512,  # on-disk tessellation cache cap (LRU)
+    "async_export": True,  # convert on a worker thread; Fusion calls stay on the main thread
+    "prewarm_toast": True,  # create the hidden toast palette at startup instead of on first export
     "slicer": {
         "name": "OrcaSlicer",
         "paths": {name: "" for name in SLICER_CHOICES},
@@ -1,11 +1,32 @@
 import datetime
 import json
 import os
+import threading
 
-from .config import current_doc_key, get_doc_folder
-from .constants import ADDIN_VERSION
-from .paths import debug_path
+from .config import current_doc_key, doc_setting, get_doc_folder
+from .constants import ADDIN_VERSION, EXPORT_SNAPSHOT_EVENT
+from .event_log import EventLog
+from .paths import debug_events_path, debug_path, debug_state_path
 from .state import STATE
+from .timing import current_trace, stage_stats
+
+DEBUG_RING_EVENTS = 500
+DEBUG_LOG_MAX_BYTES = 4 * 1024 * 1024
+DEBUG_LOG_BACKUPS = 3
+DEBUG_FILE_EVENTS = 200
+
+# Events are appended to debug_events.jsonl by a background writer; the ui/idle/last_export
+# snapshots live in the small debug_state.json. debug.json is only built on request.
+EVENTS = EventLog(
+    debug_events_path(),
+    ring_size=DEBUG_RING_EVENTS,
+    max_bytes=DEBUG_LOG_MAX_BYTES,
+    backups=DEBUG_LOG_BACKUPS,
+)
+_STATE_KEYS = ("idle_monitor", "ui", "last_export")
+# Export jobs record snapshots from worker threads; serialize the state file writes.
+_LOCK = threading.RLock()
+_debug_state = None
 
 
 def _timestamp() -> str:
@@ -23,25 +44,57 @@ def _base_payload() -> dict:
     }
 
 
-def load_debug_file() -> dict:
-    try:
-        if os.path.isfile(debug_path()):
-            with open(debug_path(), "r", encoding="utf-8") as handle:
+def _load_state() -> dict:
+    global _debug_state
+    if _debug_state is None:
+        _debug_state = {key: {} for key in _STATE_KEYS}
+        try:
+            with open(debug_state_path(), "r", encoding="utf-8") as handle:
                 data = json.load(handle)
-                if isinstance(data, dict):
-                    return data
-    except Exception:
-        pass
-    return _base_payload()
+            if isinstance(data, dict):
+                _debug_state.update({key: data[key] for key in _STATE_KEYS if isinstance(data.get(key), dict)})
+        except Exception:
+            pass
+    return _debug_state
+
+
+def _write_json_atomic(path: str, payload: dict, indent=None) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=indent, default=str)
+    os.replace(tmp, path)
+
+
+def update_debug_state(key: str, value: dict) -> None:
+    """Replace one snapshot section and rewrite the (small) state file."""
+    with _LOCK:
+        state = _load_state()
+        state[key] = value or {}
+        try:
+            _write_json_atomic(
+                debug_state_path(),
+                dict(state, version=ADDIN_VERSION, updated_at=_timestamp()),
+            )
+        except Exception:
+            pass
 
 
-def write_debug_file(context: dict, open_after: bool = False) -> None:
-    payload = context or _base_payload()
+def load_debug_file() -> dict:
+    """The combined view: state snapshots plus the most recent events from the log."""
+    with _LOCK:
+        payload = _base_payload()
+        payload.update(_load_state())
+    payload["events"] = EVENTS.tail(DEBUG_FILE_EVENTS)
+    return payload
+
+
+def write_debug_file(context: dict = None, open_after: bool = False) -> None:
+    """Materialize debug.json (state plus recent events) for sharing, optionally opening it."""
+    payload = context or load_debug_file()
     payload["version"] = ADDIN_VERSION
     payload["updated_at"] = _timestamp()
     try:
-        with open(debug_path(), "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
+        _write_json_atomic(debug_path(), payload, indent=2)
         if open_after:
             try:
                 os.startfile(debug_path())
@@ -51,56 +104,64 @@ def write_debug_file(context: dict, open_after: bool = False) -> None:
         pass
 
 
-def update_debug_file(updater, open_after: bool = False) -> None:
-    payload = load_debug_file()
-    try:
-        updated = updater(payload) if updater else payload
-    except Exception:
-        updated = payload
-    write_debug_file(updated, open_after=open_after)
-
-
 def append_debug_event(level: str, message: str, data: dict = None) -> None:
-    def _update(payload: dict) -> dict:
-        events = payload.get("events")
-        if not isinstance(events, list):
-            events = []
-        events.append(
-            {
-                "timestamp": _timestamp(),
-                "level": level,
-                "message": message,
-                "data": data or {},
-            }
-        )
-        payload["events"] = events
-        return payload
+    EVENTS.append(
+        {
+            "timestamp": _timestamp(),
+            "level": level,
+            "message": message,
+            "data": data or {},
+        }
+    )
 
-    update_debug_file(_update, open_after=False)
 
+def close_debug_log() -> None:
+    EVENTS.close()
 
-def update_idle_state(state: dict) -> None:
-    def _update(payload: dict) -> dict:
-        payload["idle_monitor"] = state or {}
-        return payload
 
-    update_debug_file(_update, open_after=False)
+def update_idle_state(state: dict) -> None:
+    update_debug_state("idle_monitor", state)
 
 
 def update_ui_state(state: dict) -> None:
-    def _update(payload: dict) -> dict:
-        payload["ui"] = state or {}
-        return payload
-
-    update_debug_file(_update, open_after=False)
+    update_debug_state("ui", state)
 
 
 def record_export_snapshot(snapshot: dict) -> None:
-    def _update(payload: dict) -> dict:
-        payload["last_export"] = snapshot or {}
-        return payload
-
-    update_debug_file(_update, open_after=False)
+    """Latest snapshot into the state file; each one also goes to the event log for quickstl.report."""
+    if snapshot and STATE.profile_session is not None:
+        snapshot["profile"] = STATE.profile_session.artifacts()
+    update_debug_state("last_export", snapshot)
+    history = {k: v for k, v in (snapshot or {}).items() if k != "timing_stats"}
+    append_debug_event("info", EXPORT_SNAPSHOT_EVENT, history)
+
+
+EXPORT_SUMMARY_KEYS = (
+    "timestamp",
+    "action",
+    "entity_name",
+    "file_path",
+    "export_folder",
+    "file_count",
+    "engine",
+    "quality",
+    "stl_triangles",
+    "file_size_bytes",
+)
+
+
+def export_summary(snapshot: dict) -> dict:
+    """The few snapshot fields kept per document as its last export."""
+    return {k: snapshot[k] for k in EXPORT_SUMMARY_KEYS if snapshot.get(k) is not None}
+
+
+def timing_snapshot() -> dict:
+    """Span tree of the export in progress on this thread, plus session-wide stage aggregates."""
+    trace = current_trace()
+    return {
+        "timing": trace.to_info() if trace else {},
+        "timing_stats": stage_stats(),
+    }
 
 
 def snapshot_common(
@@ -109,8 +170,11 @@ def snapshot_common(
     quality_applied: dict,
     target_name: str,
     fullpath: str,
-    stl_info: dict,
+    stl_info,
 ) -> dict:
+    """stl_info: StlStats from the writer, or a dict in StlStats.to_info() form."""
+    if hasattr(stl_info, "to_info"):
+        stl_info = stl_info.to_info()
     return {
         "version": ADDIN_VERSION,
         "timestamp": _timestamp(),
@@ -127,5 +191,48 @@ def snapshot_common(
         "stl_is_binary": (stl_info or {}).get("isBinary"),
         "stl_triangles": (stl_info or {}).get("triangles"),
         "stl_vertices": (stl_info or {}).get("vertices"),
+        "stl_bbox_min_mm": (stl_info or {}).get("bboxMin"),
+        "stl_bbox_max_mm": (stl_info or {}).get("bboxMax"),
+        "stl_surface_area_mm2": (stl_info or {}).get("surfaceArea"),
+        "stl_signed_volume_mm3": (stl_info or {}).get("signedVolume"),
+        "stl_degenerate_triangles": (stl_info or {}).get("degenerateTriangles"),
         "entity_name": target_name,
+        **timing_snapshot(),
+    }
+
+
+def snapshot_batch(action: str, folder: str, items: list, total_info) -> dict:
+    """Summary of a multi-file export; items are batch entries (name, path, engine, stats, error)."""
+    if hasattr(total_info, "to_info"):
+        total_info = total_info.to_info()
+    files = []
+    for item in items:
+        stats = item.get("stats")
+        files.append(
+            {
+                "entity_name": item.get("name"),
+                "file_path": item.get("path"),
+                "engine": item.get("engine"),
+                "stl_triangles": stats.triangles if stats else None,
+                "file_size_bytes": stats.file_size if stats else None,
+                "error": str(item["error"]) if item.get("error") else None,
+            }
+        )
+    return {
+        "version": ADDIN_VERSION,
+        "timestamp": _timestamp(),
+        "action": action,
+        "quality": doc_setting("quality"),
+        "engine": STATE.config.get("engine"),
+        "prefer_selection": bool(STATE.config.get("prefer_selection", True)),
+        "doc_key": current_doc_key(),
+        "export_folder": folder,
+        "file_count": sum(1 for f in files if not f["error"]),
+        "failed_count": sum(1 for f in files if f["error"]),
+        "files": files,
+        "file_size_bytes": (total_info or {}).get("fileSizeBytes"),
+        "stl_triangles": (total_info or {}).get("triangles"),
+        "stl_bbox_min_mm": (total_info or {}).get("bboxMin"),
+        "stl_bbox_max_mm": (total_info or {}).get("bboxMax"),
+        **timing_snapshot(),
     }
@@ -0,0 +1,81 @@
+import collections
+import json
+
+from .config_store import ConfigStore
+from .logging_utils import log_warning
+
+DOC_SETTINGS_CAPACITY = 200
+
+
+class DocSettingsStore:
+    """
+    Per-document settings ({"folder", "quality", "format", "last_export"}) keyed by
+    document, least recently used first. The file is read on first use and holds at most
+    `capacity` documents, so it stays the same size however many documents were opened.
+    Writes go through a ConfigStore (debounced, atomic); the file keeps the recency order,
+    so reads that change it are written too.
+    """
+
+    def __init__(self, path_fn, capacity_fn=lambda: DOC_SETTINGS_CAPACITY):
+        self.path_fn = path_fn
+        self.capacity_fn = capacity_fn
+        self._entries = None
+        self.store = ConfigStore(path_fn, lambda: self._entries if self._entries is not None else {})
+
+    def _load(self) -> collections.OrderedDict:
+        if self._entries is not None:
+            return self._entries
+        raw = {}
+        try:
+            with open(self.path_fn(), "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            log_warning(f"Document settings unreadable, starting empty: {exc}")
+        if not isinstance(raw, dict):
+            raw = {}
+        self._entries = collections.OrderedDict(
+            (key, value) for key, value in raw.items() if isinstance(value, dict)
+        )
+        self.store.loaded(raw)
+        evicted = self._evict()
+        if evicted:
+            self.store.mark(*evicted)
+        return self._entries
+
+    def _evict(self) -> list:
+        capacity = max(1, int(self.capacity_fn() or DOC_SETTINGS_CAPACITY))
+        evicted = []
+        while len(self._entries) > capacity:
+            key, _ = self._entries.popitem(last=False)
+            evicted.append(key)
+        return evicted
+
+    def get(self, key: str) -> dict:
+        """Copy of the document's settings ({} when unknown); marks it recently used."""
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is None:
+            return {}
+        if next(reversed(entries)) != key:
+            entries.move_to_end(key)
+            self.store.touch()
+        return dict(entry)
+
+    def update(self, key: str, **values) -> None:
+        """Merge `values` into the document's settings and queue a write."""
+        entries = self._load()
+        entry = dict(entries.pop(key, {}))
+        entry.update(values)
+        entries[key] = entry
+        self.store.mark(key, *self._evict())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def flush(self) -> None:
+        self.store.flush()
+
+    def close(self) -> None:
+        self.store.close()
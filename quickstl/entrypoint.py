@@ -3,10 +3,13 @@ import traceback
 import adsk.core
 
 from .command import ensure_removed, wire_commands
-from .config import load_config
-from .constants import ADDIN_NAME, ADDIN_VERSION, CMD_ID, TOAST_ID
-from .diagnostics import append_debug_event, update_ui_state
+from .config import flush_config, load_config
+from .constants import ADDIN_NAME, ADDIN_VERSION, CMD_ID
+from .diagnostics import append_debug_event, close_debug_log, update_ui_state
+from .jobs import register_job_events, unregister_job_events
+from .slicer import cancel_slicer_focus
 from .state import STATE
+from .toast import close_toast_palette, prewarm_toast
 from .versioning import sync_manifest_version
 
 
@@ -22,6 +25,9 @@ def run(context):
         ensure_removed(STATE.ui, CMD_ID)
         wire_commands(STATE.ui)
         append_debug_event("info", "commands_wired", {})
+        register_job_events(STATE.app)
+        close_toast_palette()  # one left over from a reload has no handler attached
+        prewarm_toast()
         update_ui_state({"command_visible": False, "last_event": "addin_started"})
         append_debug_event(
             "info",
@@ -42,15 +48,15 @@ def run(context):
 
 def stop(context):
     try:
-        ui = adsk.core.Application.get().userInterface
+        app = adsk.core.Application.get()
+        ui = app.userInterface
+        unregister_job_events(app)
         ensure_removed(ui, CMD_ID)
-        pal = ui.palettes.itemById(TOAST_ID)
-        if pal:
-            try:
-                pal.deleteMe()
-            except Exception:
-                pass
+        close_toast_palette()
+        cancel_slicer_focus()
+        flush_config()
         update_ui_state({"command_visible": False, "last_event": "addin_stopped"})
         append_debug_event("info", "Add-in stopped", {"version": ADDIN_VERSION})
+        close_debug_log()
     except Exception:
         pass
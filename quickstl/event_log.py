@@ -0,0 +1,122 @@
+import atexit
+import collections
+import json
+import os
+import threading
+
+
+class EventLog:
+    """
+    Append-only JSONL event log. append() only queues: a daemon thread writes queued lines
+    in batches and rotates the file once it passes `max_bytes` (path.1 … path.N). The most
+    recent `ring_size` events are also kept in memory. Never raises from append()/flush().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ring_size: int = 500,
+        max_bytes: int = 1024 * 1024,
+        backups: int = 2,
+        flush_interval: float = 1.0,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self._ring = collections.deque(maxlen=ring_size)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def append(self, event: dict) -> None:
+        try:
+            line = json.dumps(event, ensure_ascii=False, default=str)
+        except Exception as exc:
+            line = json.dumps({"message": "unserializable event", "error": str(exc)})
+        with self._lock:
+            self._ring.append(event)
+            self._pending.append(line)
+            closed = self._closed
+            if not closed and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="quickstl-eventlog", daemon=True)
+                self._thread.start()
+                # The writer is a daemon thread; don't lose the tail when the interpreter exits.
+                atexit.register(self.flush)
+        if closed:
+            self.flush()
+        else:
+            self._wake.set()
+
+    def recent(self, limit: int = None) -> list:
+        """Events appended in this session, oldest first (at most the ring size)."""
+        with self._lock:
+            events = list(self._ring)
+        return events[-limit:] if limit else events
+
+    def tail(self, limit: int) -> list:
+        """The last `limit` events on disk (after flushing), including earlier sessions."""
+        self.flush()
+        lines = []
+        for path in [self.path] + [f"{self.path}.{n}" for n in range(1, self.backups + 1)]:
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    lines = handle.read().splitlines() + lines
+            except OSError:
+                continue
+            if len(lines) >= limit:
+                break
+        events = []
+        for line in lines[-limit:]:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                pass
+        return events
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._pending = self._pending, []
+        if not lines:
+            return
+        with self._io_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as handle:
+                    handle.write("\n".join(lines) + "\n")
+                    size = handle.tell()
+                if size >= self.max_bytes:
+                    self._rotate()
+            except Exception:
+                pass
+
+    def _rotate(self) -> None:
+        for n in range(self.backups, 0, -1):
+            src = self.path if n == 1 else f"{self.path}.{n - 1}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{n}")
+        if self.backups <= 0:
+            os.remove(self.path)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            # Let a burst of events accumulate into one write.
+            self._stop.wait(self.flush_interval)
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the writer thread and write whatever is still queued."""
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self.flush()
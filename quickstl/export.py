@@ -1,19 +1,46 @@
+import itertools
 import os
+import tempfile
+import time
 import traceback
 
 import adsk.core
 import adsk.fusion
 
-from .analysis import analyze_stl
-from .config import add_clicks_saved, resolve_export_dir, safe_filename
+from .analysis import StlStats, stl_stats_from_file
+from .cache import cache_key, restore_cached_export, selection_cache_key, store_cached_export
+from .config import (
+    add_clicks_saved,
+    current_doc_key,
+    doc_setting,
+    remember_export,
+    resolve_export_dir,
+    safe_filename,
+)
 from .constants import ADDIN_NAME, ADDIN_VERSION
-from .diagnostics import append_debug_event, record_export_snapshot, snapshot_common
+from .diagnostics import append_debug_event, export_summary, record_export_snapshot, snapshot_common
+from .jobs import ExportJob, run_job
 from .logging_utils import log
-from .obj_stl import export_via_obj_then_stl
+from .mesh_calc import join_meshes, tessellate_entity, write_meshes
+from .obj_numpy import numpy_available
+from .obj_stl import (
+    BinaryStlWriter,
+    append_obj_to_writer,
+    export_obj_temp,
+    finish_obj_then_mesh,
+    finish_obj_then_stl,
+)
+from .preview import write_preview
+from .profiling import finish_profile, profile_step, start_profile
 from .slicer import autodetect_slicer_path, launch_slicer
 from .state import STATE
+from .stl_reader import StlReader
+from .threemf import stl_to_3mf, write_3mf
+from .timing import Span, activate, current_span, span, timed
 from .toast import show_toast
 
+_TMP_SEQ = itertools.count()
+
 
 def name_for_entity(entity) -> str:
     try:
@@ -30,22 +57,40 @@ def name_for_entity(entity) -> str:
     return base
 
 
+def selected_targets() -> list:
+    """(entity, name) for every exportable entity in the active selection, when selections are preferred."""
+    if not STATE.config.get("prefer_selection", True):
+        return []
+    sels = STATE.ui.activeSelections
+    if not sels:
+        return []
+    targets = []
+    for i in range(sels.count):
+        ent = sels.item(i).entity
+        if isinstance(
+            ent,
+            (adsk.fusion.BRepBody, adsk.fusion.Component, adsk.fusion.Occurrence),
+        ):
+            targets.append((ent, name_for_entity(ent)))
+    return targets
+
+
 def target_entity_and_name(design: adsk.fusion.Design):
-    if STATE.config.get("prefer_selection", True):
-        sels = STATE.ui.activeSelections
-        if sels and sels.count > 0:
-            ent = sels.item(0).entity
-            if isinstance(
-                ent,
-                (adsk.fusion.BRepBody, adsk.fusion.Component, adsk.fusion.Occurrence),
-            ):
-                return ent, name_for_entity(ent)
+    targets = selected_targets()
+    if targets:
+        return targets[0]
     comp = design.activeComponent
     return comp, name_for_entity(comp)
 
 
-def export_via_stl_legacy(design, entity, stl_fullpath: str) -> dict:
-    """Legacy STL path: uses Fusion STL exporter (quality fixed in many builds)."""
+def merged_name(targets: list) -> str:
+    first = targets[0][1]
+    return f"{first} +{len(targets) - 1}" if len(targets) > 1 else first
+
+
+@timed("fusion_stl_export")
+def export_stl_legacy(design, entity, stl_fullpath: str) -> dict:
+    """Fusion half of the Legacy path (main thread): Fusion's own STL exporter."""
     mgr = design.exportManager
     opts = mgr.createSTLExportOptions(entity, stl_fullpath)
     opts.isBinaryFormat = True
@@ -57,83 +102,497 @@ def export_via_stl_legacy(design, entity, stl_fullpath: str) -> dict:
     return {"mode": "Legacy", "target": "STL Only", "custom": {}}
 
 
-def do_export_to_path(
-    folder_override: str = "",
-    skip_toast: bool = False,
-    inputs: adsk.core.CommandInputs = None,
-) -> str:
-    if STATE.busy:
-        return ""
-    STATE.busy = True
+def engine_label(quality: str) -> str:
+    if quality == "Legacy":
+        return "STL Only"
+    return STATE.config.get("engine", "OBJ→STL")
+
+
+def prepare_export_engine(design, entity, stl_fullpath: str, quality: str, as_mesh: bool = False):
+    """
+    Run the part of an export that needs the Fusion API (main thread only).
+    Returns (engine label, finish) where finish() -> (applied, StlStats) only touches files.
+    With as_mesh (OBJ→STL and Direct Mesh, see indexed_output), finish() returns
+    (applied, IndexedMesh) instead and no STL is written.
+    """
+    engine = engine_label(quality)
+    if engine == "STL Only":
+        applied = export_stl_legacy(design, entity, stl_fullpath)
+
+        def finish():
+            exists = os.path.exists(stl_fullpath)
+            return applied, stl_stats_from_file(stl_fullpath) if exists else None
+
+    elif engine == "Direct Mesh":
+        applied, meshes = tessellate_entity(entity, quality)
+
+        def finish():
+            if as_mesh:
+                return join_meshes(applied, meshes)
+            return write_meshes(applied, meshes, stl_fullpath)
+
+    else:
+        engine = "OBJ→STL"
+        applied, tmp_obj = export_obj_temp(design, entity, quality)
+
+        def finish():
+            if as_mesh:
+                return finish_obj_then_mesh(applied, [tmp_obj])
+            return finish_obj_then_stl(applied, tmp_obj, stl_fullpath)
+
+    return engine, finish
+
+
+def _append_stl(writer: BinaryStlWriter, stl_path: str) -> None:
+    with StlReader(stl_path) as reader:
+        if not reader.is_binary:
+            raise RuntimeError(f"Expected a binary STL from Fusion:\n{stl_path}")
+        writer.add_buffer(reader.triangles())
+
+
+def _remove_quietly(paths) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+
+def prepare_merged_export(design, entities, stl_fullpath: str, quality: str, as_mesh: bool = False):
+    """
+    prepare_export_engine for several entities written into one STL in a single streamed
+    pass (or joined into one IndexedMesh with as_mesh). Fusion places each entity in
+    assembly space, so occurrence transforms carry over.
+    """
+    engine = engine_label(quality)
+    if engine == "Direct Mesh":
+        applied = None
+        meshes = []
+        for entity in entities:
+            applied, entity_meshes = tessellate_entity(entity, quality)
+            meshes.extend(entity_meshes)
+
+        def finish():
+            applied["custom"]["entities"] = len(entities)
+            if as_mesh:
+                return join_meshes(applied, meshes)
+            return write_meshes(applied, meshes, stl_fullpath)
+
+        return engine, finish
+
+    temps = []
     try:
-        app = adsk.core.Application.get()
-        ui = app.userInterface
-        design = adsk.fusion.Design.cast(app.activeProduct)
-        if not design:
-            raise RuntimeError("No active design.")
-
-        export_dir = resolve_export_dir(folder_override)
-        if not os.path.isdir(export_dir):
-            os.makedirs(export_dir, exist_ok=True)
-
-        target, raw_name = target_entity_and_name(design)
-        fname = safe_filename(raw_name) + ".stl"
-        full = os.path.join(export_dir, fname)
-        overwriting = os.path.exists(full)
-
-        quality = STATE.config.get("quality", "Legacy")
-        if quality == "Legacy":
-            applied = export_via_stl_legacy(design, target, full)
-            engine = "STL Only"
+        if engine == "STL Only":
+            for entity in entities:
+                tmp = os.path.join(
+                    tempfile.gettempdir(), f"quickstl_{int(time.time() * 1000)}_{next(_TMP_SEQ)}.stl"
+                )
+                applied = export_stl_legacy(design, entity, tmp)
+                temps.append(tmp)
         else:
-            applied = export_via_obj_then_stl(design, target, full, quality)
             engine = "OBJ→STL"
+            for entity in entities:
+                applied, tmp = export_obj_temp(design, entity, quality)
+                temps.append(tmp)
+    except Exception:
+        _remove_quietly(temps)
+        raise
 
-        if not os.path.exists(full):
-            raise RuntimeError(f"Export failed (no file created):\n{full}")
-
-        if not skip_toast:
-            try:
-                show_toast(export_dir, fname, overwriting, full)
-            except Exception as exc:
-                ui.messageBox(
-                    f"✅ STL export successful. (Quick STL v{ADDIN_VERSION})\n\n"
-                    f"Name: {fname}\n"
-                    f"Folder:\n{export_dir}\n"
-                    f"Overwrote existing file: {'Yes' if overwriting else 'No'}\n\n"
-                    f"(Palette fallback due to: {exc})",
-                    f"{ADDIN_NAME} v{ADDIN_VERSION}",
-                )
+    def finish():
+        if as_mesh:
+            applied["custom"]["entities"] = len(entities)
+            return finish_obj_then_mesh(applied, temps)
+        try:
+            with span("merge_write"), BinaryStlWriter(stl_fullpath) as writer:
+                for tmp in temps:
+                    if engine == "STL Only":
+                        _append_stl(writer, tmp)
+                    else:
+                        applied["custom"]["converter"] = append_obj_to_writer(writer, tmp, 10.0)
+        finally:
+            _remove_quietly(temps)
+        applied["custom"]["entities"] = len(entities)
+        applied["custom"]["triangles_written"] = writer.count
+        return applied, writer.stats
 
-        stl_info = analyze_stl(full)
-        snap = snapshot_common("export", engine, applied, raw_name, full, stl_info)
-        record_export_snapshot(snap)
-        append_debug_event(
-            "info",
-            "Export completed",
-            {"action": "export", "file_path": full, "engine": engine},
-        )
-
-        if inputs:
-            add_clicks_saved(5, inputs)
-        return full
-    finally:
-        STATE.busy = False
+    return engine, finish
 
 
-def export_and_send(
-    folder_override: str = "", inputs: adsk.core.CommandInputs = None
-) -> bool:
+def output_format() -> str:
+    return doc_setting("format", "STL")
+
+
+def output_extension() -> str:
+    return ".3mf" if output_format() == "3MF" else ".stl"
+
+
+def indexed_output(quality: str) -> bool:
+    """
+    Whether 3MF is built straight from the engine's shared vertices. Fusion's own STL
+    exporter (STL Only) and machines without NumPy go through a temp STL instead.
+    """
+    return engine_label(quality) != "STL Only" and numpy_available()
+
+
+def prepare_output(prepare, out_path: str, quality: str):
+    """
+    Call prepare(path, as_mesh) -> (engine, finish) for the file the user asked for.
+    For 3MF the OBJ and Direct Mesh engines hand back an IndexedMesh that finish() packs
+    into `out_path`; STL Only writes a temp STL that finish() welds and packs.
+    """
+    if output_format() != "3MF":
+        return prepare(out_path, False)
+    name = os.path.splitext(os.path.basename(out_path))[0]
+    if indexed_output(quality):
+        engine, finish_mesh = prepare(None, True)
+
+        def finish():
+            applied, mesh = finish_mesh()
+            with span("pack_3mf"):
+                # Fusion repeats a vertex where face normals differ; 3MF wants it shared.
+                mesh = mesh.weld(0)
+                write_3mf(out_path, mesh, name)
+            stats = StlStats()
+            stats.add_indexed(mesh.vertices, mesh.triangles)
+            stats.file_size = os.path.getsize(out_path)
+            applied["custom"]["format"] = "3MF"
+            applied["custom"]["vertices_written"] = mesh.vertex_count
+            applied["custom"]["triangles_written"] = mesh.triangle_count
+            return applied, stats
+
+        return engine, finish
+
+    tmp_stl = os.path.join(
+        tempfile.gettempdir(), f"quickstl_{int(time.time() * 1000)}_{next(_TMP_SEQ)}.stl"
+    )
+    engine, finish_engine = prepare(tmp_stl, False)
+
+    def finish():
+        try:
+            applied, stats = finish_engine()
+            with span("pack_3mf"):
+                mesh = stl_to_3mf(tmp_stl, out_path, name)
+        finally:
+            _remove_quietly([tmp_stl])
+        if stats is not None:
+            stats.file_size = os.path.getsize(out_path)
+        applied["custom"]["format"] = "3MF"
+        applied["custom"]["vertices_written"] = mesh.vertex_count
+        return applied, stats
+
+    return engine, finish
+
+
+def prepare_cached_export(design, entity, out_path: str, quality: str):
+    """prepare_export_engine behind the tessellation cache; unchanged designs skip Fusion entirely."""
+    entities = entity if isinstance(entity, list) else None
+    key = ""
+    # The key reads every body's area and volume on this thread; skip it when the cache is off.
+    if STATE.config.get("cache_enabled", True):
+        try:
+            if entities:
+                key = selection_cache_key(design, entities, quality, engine_label(quality))
+            else:
+                key = cache_key(design, entity, quality, engine_label(quality))
+        except Exception as exc:
+            log(f"Cache key failed: {exc}")
+    with span("cache_lookup"):
+        hit = restore_cached_export(key, out_path)
+    if hit:
+        applied = dict(hit["applied"])
+        applied["cache"] = {"tier": hit["tier"], "copied": hit["copied"]}
+        stats = StlStats.from_info(hit.get("stats"))
+        return hit["engine"], lambda: (applied, stats)
+
+    def prepare(path, as_mesh):
+        if entities:
+            return prepare_merged_export(design, entities, path, quality, as_mesh)
+        return prepare_export_engine(design, entity, path, quality, as_mesh)
+
+    engine, finish_output = prepare_output(prepare, out_path, quality)
+
+    def finish():
+        applied, stats = finish_output()
+        if os.path.exists(out_path) and stats:
+            store_cached_export(key, out_path, applied, engine, stats.to_info())
+        return applied, stats
+
+    return engine, finish
+
+
+def active_design() -> adsk.fusion.Design:
     app = adsk.core.Application.get()
-    ui = app.userInterface
     design = adsk.fusion.Design.cast(app.activeProduct)
     if not design:
-        ui.messageBox("No active design.", f"{ADDIN_NAME} v{ADDIN_VERSION}")
-        return False
+        raise RuntimeError("No active design.")
+    return design
+
+
+def ensure_export_dir(folder_override: str = "") -> str:
+    export_dir = resolve_export_dir(folder_override)
+    if not os.path.isdir(export_dir):
+        os.makedirs(export_dir, exist_ok=True)
+    return export_dir
+
+
+def begin_entity_export(design, entity, raw_name: str, export_dir: str, fname: str) -> dict:
+    """
+    Main-thread half of one export: run the Fusion calls for `entity` (or a list of
+    entities to merge). Returns the export context consumed by convert_export/complete_export.
+    """
+    full = os.path.join(export_dir, fname)
+    overwriting = os.path.exists(full)
+    quality = doc_setting("quality", "Legacy")
+    engine, finish = prepare_cached_export(design, entity, full, quality)
+    return {
+        "doc_key": current_doc_key(),
+        "dir": export_dir,
+        "fname": fname,
+        "path": full,
+        "name": raw_name,
+        "overwriting": overwriting,
+        "engine": engine,
+        "finish": finish,
+    }
+
+
+def begin_export(folder_override: str = "") -> dict:
+    """
+    Main-thread half of exporting the current target: the selection (several selected
+    entities are merged into one file) or the active component.
+    """
+    design = active_design()
+    export_dir = ensure_export_dir(folder_override)
+    targets = selected_targets()
+    if len(targets) > 1:
+        raw_name = merged_name(targets)
+        fname = safe_filename(raw_name) + output_extension()
+        entities = [entity for entity, _ in targets]
+        return begin_entity_export(design, entities, raw_name, export_dir, fname)
+    target, raw_name = target_entity_and_name(design)
+    fname = safe_filename(raw_name) + output_extension()
+    return begin_entity_export(design, target, raw_name, export_dir, fname)
+
+
+def convert_export(ctx: dict) -> dict:
+    """Conversion, writing and analysis. No Fusion API calls, so safe on a worker thread."""
+    applied, stats = ctx["finish"]()
+    full = ctx["path"]
+    if not os.path.exists(full):
+        raise RuntimeError(f"Export failed (no file created):\n{full}")
+    if stats is None:
+        stats = stl_stats_from_file(full)
+    ctx["applied"] = applied
+    ctx["stats"] = stats
+    return ctx
+
+
+def complete_export(
+    ctx: dict,
+    skip_toast: bool = False,
+    inputs: adsk.core.CommandInputs = None,
+) -> dict:
+    """Main-thread tail: toast, debug snapshot and click counter. Returns the result dict."""
+    full = ctx["path"]
+    fname = ctx["fname"]
+    export_dir = ctx["dir"]
+    stats = ctx["stats"]
+    if not skip_toast:
+        try:
+            show_toast(export_dir, fname, ctx["overwriting"], full, stats, ctx.get("preview"))
+        except Exception as exc:
+            STATE.ui.messageBox(
+                f"✅ {output_format()} export successful. (Quick STL v{ADDIN_VERSION})\n\n"
+                f"Name: {fname}\n"
+                f"Folder:\n{export_dir}\n"
+                f"Overwrote existing file: {'Yes' if ctx['overwriting'] else 'No'}\n\n"
+                f"(Palette fallback due to: {exc})",
+                f"{ADDIN_NAME} v{ADDIN_VERSION}",
+            )
+
+    snap = snapshot_common("export", ctx["engine"], ctx["applied"], ctx["name"], full, stats)
+    record_export_snapshot(snap)
+    remember_export(ctx["doc_key"], export_summary(snap))
+    append_debug_event(
+        "info",
+        "Export completed",
+        {"action": "export", "file_path": full, "engine": ctx["engine"]},
+    )
+
+    if inputs:
+        add_clicks_saved(5, inputs)
+    return {
+        "path": full,
+        "name": ctx["name"],
+        "engine": ctx["engine"],
+        "applied": ctx["applied"],
+        "stats": stats,
+    }
+
+
+def run_foreground(begin, convert, complete, action: str = "export"):
+    """
+    Synchronous driver: begin(), convert(ctx, None) and complete(ctx) in turn on the
+    main thread, timed as one `action` span. Returns complete()'s result, or None when
+    another export is running.
+    """
+    if STATE.busy:
+        return None
+    STATE.busy = True
+    profile = start_profile(action)
+    try:
+        with profile_step(profile), span(action):
+            with span("begin"):
+                ctx = begin()
+            with span("convert"):
+                ctx = convert(ctx, None)
+            with span("complete"):
+                return complete(ctx)
+    finally:
+        STATE.busy = False
+        finish_profile(profile)
+
+
+def run_background(action: str, label: str, begin, convert, complete, on_progress=None):
+    """
+    Asynchronous driver: begin() runs now on the main thread, convert(ctx, job) on a
+    worker thread, then complete(ctx) back on the main thread. Failures are reported
+    under `label`. Returns the ExportJob, or None when another export is running.
+    """
+    if STATE.busy:
+        return None
+    STATE.busy = True
+    # The action's span stays open across the three steps and both threads.
+    trace = Span(action, current_span())
+    # Profiled per step: the main thread is idle in Fusion while the worker converts.
+    profile = start_profile(action)
+    try:
+        job = ExportJob(action)
+        job.phase = "exporting"
+        with profile_step(profile), activate(trace), span("begin"):
+            ctx = begin()
+    except Exception:
+        STATE.busy = False
+        trace.finish()
+        finish_profile(profile)
+        raise
+
+    def work(job):
+        with profile_step(profile), activate(trace), span("convert"):
+            return convert(ctx, job)
+
+    def done(job):
+        STATE.busy = False
+        if STATE.active_job is job:
+            STATE.active_job = None
+        append_debug_event("info", "Export job finished", job.describe())
+        if job.error:
+            trace.finish()
+            finish_profile(profile)
+            handle_export_error(label, job.error, job.traceback)
+            return
+        try:
+            with profile_step(profile), activate(trace), span("complete"):
+                complete(job.result)
+        except Exception as exc:
+            handle_export_error(label, exc)
+        finally:
+            trace.finish()
+            finish_profile(profile)
+
+    def lost(job):
+        # Worker thread: the conversion's own cleanup has run, only the add-in state is left.
+        STATE.busy = False
+        if STATE.active_job is job:
+            STATE.active_job = None
+        append_debug_event("warning", "Export job lost", job.describe())
+        trace.finish()
+        finish_profile(profile)
+
+    STATE.active_job = job
+    return run_job(job, work, on_progress, done, lost)
+
+
+def _convert_step(ctx: dict, job=None, preview: bool = False) -> dict:
+    if job:
+        job.update("converting", 0.25)
+    convert_export(ctx)
+    if preview:
+        if job:
+            job.update("preview", 0.9)
+        ctx["preview"] = write_preview(ctx["path"]) or {}
+    return ctx
+
+
+def _convert_for(skip_toast: bool):
+    """Conversion step; when a toast will follow, its preview is built here too, off the main thread."""
+    return lambda ctx, job=None: _convert_step(ctx, job, not skip_toast)
+
+
+def export_to_path(
+    folder_override: str = "",
+    skip_toast: bool = False,
+    inputs: adsk.core.CommandInputs = None,
+):
+    """
+    Export the current target synchronously. Returns a result dict (path, name, engine,
+    applied, stats), or None when another export is already running.
+    """
+    return run_foreground(
+        lambda: begin_export(folder_override),
+        _convert_for(skip_toast),
+        lambda ctx: complete_export(ctx, skip_toast, inputs),
+    )
+
+
+def live_inputs(inputs):
+    """Command inputs are only valid while the dialog that owns them is open."""
+    return inputs if inputs and STATE.command is not None else None
+
+
+def start_export(
+    folder_override: str = "",
+    skip_toast: bool = False,
+    inputs: adsk.core.CommandInputs = None,
+    on_done=None,
+    on_progress=None,
+    label: str = "Export STL",
+    action: str = "export",
+):
+    """
+    Asynchronous export_to_path. The Fusion calls run now; conversion runs on a worker
+    thread; the toast, snapshot and on_done(result) follow on the main thread.
+    Returns the ExportJob, or None when another export is already running.
+    """
+
+    def complete(ctx):
+        result = complete_export(ctx, skip_toast, live_inputs(inputs))
+        if on_done:
+            on_done(result)
+
+    return run_background(
+        action,
+        label,
+        lambda: begin_export(folder_override),
+        _convert_for(skip_toast),
+        complete,
+        on_progress,
+    )
+
+
+@timed()
+def do_export_to_path(
+    folder_override: str = "",
+    skip_toast: bool = False,
+    inputs: adsk.core.CommandInputs = None,
+) -> str:
+    result = export_to_path(folder_override, skip_toast, inputs)
+    return result["path"] if result else ""
 
-    path = do_export_to_path(folder_override=folder_override, skip_toast=True, inputs=None)
-    if not path:
-        return False
+
+def send_exported(result: dict, inputs: adsk.core.CommandInputs = None) -> None:
+    """Launch the slicer on a finished export and record the send."""
+    path = result["path"]
 
     sconf = STATE.config.get("slicer", {})
     name = sconf.get("name") or "OrcaSlicer"
@@ -144,29 +603,17 @@ def export_and_send(
             STATE.config["slicer"]["paths"][name] = exe
             from .config import save_config
 
-            save_config()
+            save_config("slicer")
 
     launch_slicer(exe, path)
 
-    stl_info = analyze_stl(path)
-    applied = {
-        "mode": STATE.config.get("quality", "Legacy"),
-        "target": (
-            "STL Only"
-            if STATE.config.get("quality", "Legacy") == "Legacy"
-            else "OBJ→STL"
-        ),
-        "custom": {},
-    }
     snap = snapshot_common(
         "send",
-        "STL Only"
-        if STATE.config.get("quality", "Legacy") == "Legacy"
-        else "OBJ→STL",
-        applied,
-        os.path.splitext(os.path.basename(path))[0],
+        result["engine"],
+        result["applied"],
+        result["name"],
         path,
-        stl_info,
+        result["stats"],
     )
     record_export_snapshot(snap)
     append_debug_event(
@@ -177,13 +624,45 @@ def export_and_send(
 
     if inputs:
         add_clicks_saved(5, inputs)
+
+
+@timed()
+def export_and_send(
+    folder_override: str = "", inputs: adsk.core.CommandInputs = None
+) -> bool:
+    app = adsk.core.Application.get()
+    ui = app.userInterface
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    if not design:
+        ui.messageBox("No active design.", f"{ADDIN_NAME} v{ADDIN_VERSION}")
+        return False
+
+    result = export_to_path(folder_override=folder_override, skip_toast=True, inputs=None)
+    if not result:
+        return False
+    send_exported(result, inputs)
     return True
 
 
-def handle_export_error(action: str, error: Exception) -> None:
+def start_export_and_send(
+    folder_override: str = "", inputs: adsk.core.CommandInputs = None, on_progress=None
+):
+    """Asynchronous export_and_send. Returns the ExportJob, or None when busy."""
+    return start_export(
+        folder_override=folder_override,
+        skip_toast=True,
+        inputs=None,
+        on_done=lambda result: send_exported(result, live_inputs(inputs)),
+        on_progress=on_progress,
+        label="Send to slicer",
+        action="send",
+    )
+
+
+def handle_export_error(action: str, error: Exception, tb: str = "") -> None:
     log(f"{action} failed: {error}")
     append_debug_event("error", f"{action} failed", {"error": str(error)})
     STATE.ui.messageBox(
-        f"❌ {action} failed.\n\n{error}\n\n{traceback.format_exc()}",
+        f"❌ {action} failed.\n\n{error}\n\n{tb or traceback.format_exc()}",
         f"{ADDIN_NAME} v{ADDIN_VERSION}",
     )
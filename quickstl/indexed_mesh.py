@@ -0,0 +1,282 @@
+import itertools
+import math
+from array import array
+
+from .obj_stl import write_binary_stl
+from .stl_reader import StlReader
+from .triangles import STL_DTYPE, TriangleBuffer, np
+
+WELD_TOLERANCE_MM = 1e-4
+_INT64_MAX = (1 << 63) - 1
+# Spatial-hash multipliers; colliding cells only add candidates the distance test rejects.
+_CELL_HASH = (73856093, 19349663, 83492791)
+
+
+class IndexedMesh:
+    """
+    Shared vertex table plus triangle index table: float32 (N,3) vertices and uint32 (T,3)
+    triangles with NumPy, flat array("f") / array("I") without. Roughly a third of the
+    size of the same triangles as STL records.
+    """
+
+    __slots__ = ("vertices", "triangles")
+
+    def __init__(self, vertices, triangles):
+        if np is not None:
+            self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+            self.triangles = np.ascontiguousarray(triangles, dtype=np.uint32).reshape(-1, 3)
+        else:
+            self.vertices = vertices if isinstance(vertices, array) else array("f", vertices)
+            self.triangles = triangles if isinstance(triangles, array) else array("I", triangles)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices) if np is not None else len(self.vertices) // 3
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.triangles) if np is not None else len(self.triangles) // 3
+
+    @property
+    def nbytes(self) -> int:
+        if np is not None:
+            return int(self.vertices.nbytes + self.triangles.nbytes)
+        return len(self.vertices) * 4 + len(self.triangles) * 4
+
+    @classmethod
+    def from_obj(cls, obj_path: str, scale: float = 10.0) -> "IndexedMesh":
+        """Keep the OBJ's own shared indices (mm); out-of-range references are dropped."""
+        from .obj_numpy import fan_triangulate, parse_obj_arrays
+
+        if np is None:
+            raise RuntimeError("IndexedMesh.from_obj needs NumPy")
+        vertices, face_indices, face_sizes = parse_obj_arrays(obj_path, scale)
+        tris = fan_triangulate(face_indices, face_sizes)
+        if len(tris):
+            tris = tris[((tris >= 0) & (tris < len(vertices))).all(axis=1)]
+        return cls(vertices, tris)
+
+    @classmethod
+    def join(cls, meshes) -> "IndexedMesh":
+        """All of `meshes` in one vertex/triangle table (NumPy only); nothing is welded."""
+        if np is None:
+            raise RuntimeError("IndexedMesh.join needs NumPy")
+        meshes = list(meshes)
+        if len(meshes) == 1:
+            return meshes[0]
+        bases = np.cumsum([0] + [mesh.vertex_count for mesh in meshes[:-1]])
+        return cls(
+            np.concatenate([mesh.vertices for mesh in meshes]).reshape(-1, 3),
+            np.concatenate([mesh.triangles.astype(np.int64) + base for mesh, base in zip(meshes, bases)]),
+        )
+
+    @classmethod
+    def from_triangles(cls, triangles: TriangleBuffer, tolerance: float = WELD_TOLERANCE_MM) -> "IndexedMesh":
+        """Weld a triangle soup (STL records) into an indexed mesh."""
+        if np is not None:
+            records = np.frombuffer(triangles.memoryview(), dtype=STL_DTYPE)
+            corners = np.stack([records["v0"], records["v1"], records["v2"]], axis=1)
+            soup = cls(corners.reshape(-1, 3), np.arange(len(records) * 3, dtype=np.uint32))
+        else:
+            coords = array("f")
+            for r in triangles.iter_records():
+                coords.extend(r[3:12])
+            soup = cls(coords, array("I", range(len(coords) // 3)))
+        return soup.weld(tolerance)
+
+    @classmethod
+    def from_stl(cls, stl_path: str, tolerance: float = WELD_TOLERANCE_MM) -> "IndexedMesh":
+        """Binary STL (e.g. from the Legacy path), welded."""
+        with StlReader(stl_path) as reader:
+            if not reader.is_binary:
+                raise ValueError(f"Not a binary STL: {stl_path}")
+            return cls.from_triangles(reader.triangles(), tolerance)
+
+    def weld(self, tolerance: float = WELD_TOLERANCE_MM, drop_degenerate: bool = True) -> "IndexedMesh":
+        """
+        Merge vertices closer than `tolerance` into the first-seen one (a chain of close
+        vertices merges as a whole). Exact duplicates go first through quantize(0); the
+        remaining vertices are compared by distance with those in the same or a
+        neighbouring cell, so close pairs split by a cell boundary still merge. O(n log n)
+        with NumPy (sort-based), expected O(n) without (a dict of cells). Triangles that
+        collapse onto a repeated vertex are dropped unless drop_degenerate is False.
+        """
+        if tolerance <= 0:
+            return self.quantize(0, drop_degenerate)
+        exact = self.quantize(0, drop_degenerate=False)
+        if np is not None:
+            return exact._merge_near_numpy(tolerance, drop_degenerate)
+        return exact._merge_near_python(tolerance, drop_degenerate)
+
+    def quantize(self, cell: float, drop_degenerate: bool = True) -> "IndexedMesh":
+        """
+        Grid quantisation: snap vertices to the nearest point of a `cell`-spaced grid and
+        merge those that snap together (exact duplicates when cell <= 0). Vertices closer
+        than `cell` can still land on different points; use weld() for a distance
+        guarantee. Sort-based (O(n log n)) with NumPy, one dict pass without. Vertices keep
+        their first-seen order; triangles that collapse onto a repeated vertex are dropped
+        unless drop_degenerate is False.
+        """
+        if np is not None:
+            return self._quantize_numpy(cell, drop_degenerate)
+        return self._quantize_python(cell, drop_degenerate)
+
+    def _quantize_numpy(self, cell: float, drop_degenerate: bool) -> "IndexedMesh":
+        if not len(self.vertices):
+            return IndexedMesh(self.vertices, self.triangles)
+        if cell > 0:
+            cells = np.floor(self.vertices.astype(np.float64) / cell + 0.5).astype(np.int64)
+        else:
+            # + 0.0 folds -0.0 into 0.0 before comparing bit patterns
+            cells = (self.vertices + np.float32(0.0)).view(np.int32).astype(np.int64)
+        cells -= cells.min(axis=0)
+        extent = cells.max(axis=0) + 1
+        if int(extent[0]) * int(extent[1]) * int(extent[2]) <= _INT64_MAX:
+            keys = (cells[:, 0] * extent[1] + cells[:, 1]) * extent[2] + cells[:, 2]
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        else:
+            rows = np.ascontiguousarray(cells).view(np.dtype((np.void, cells.dtype.itemsize * 3)))
+            _, first, inverse = np.unique(rows.ravel(), return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        tris = remap[inverse.reshape(-1)][self.triangles.astype(np.int64)]
+        if drop_degenerate and len(tris):
+            keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+            tris = tris[keep]
+        return IndexedMesh(self.vertices[first[order]], tris)
+
+    def _quantize_python(self, cell: float, drop_degenerate: bool) -> "IndexedMesh":
+        src = self.vertices
+        grid = {}
+        remap = array("I")
+        vertices = array("f")
+        for o in range(0, len(src) - 2, 3):
+            x, y, z = src[o], src[o + 1], src[o + 2]
+            if cell > 0:
+                key = ((x / cell + 0.5) // 1, (y / cell + 0.5) // 1, (z / cell + 0.5) // 1)
+            else:
+                key = (x, y, z)
+            index = grid.get(key)
+            if index is None:
+                index = grid[key] = len(vertices) // 3
+                vertices.extend((x, y, z))
+            remap.append(index)
+        tris = array("I")
+        src_tris = self.triangles
+        for t in range(0, len(src_tris) - 2, 3):
+            a, b, c = remap[src_tris[t]], remap[src_tris[t + 1]], remap[src_tris[t + 2]]
+            if drop_degenerate and (a == b or b == c or a == c):
+                continue
+            tris.extend((a, b, c))
+        return IndexedMesh(vertices, tris)
+
+    def _merge_near_numpy(self, tolerance: float, drop_degenerate: bool) -> "IndexedMesh":
+        vertices = self.vertices.astype(np.float64)
+        count = len(vertices)
+        # Two vertices closer than `tolerance` share a cell of at least one of these eight
+        # grids (cells 2·tolerance wide, each axis shifted by 0 or half a cell), so sorting
+        # by cell eight times finds every close pair without probing neighbour cells.
+        scaled = vertices / (2.0 * tolerance)
+        multipliers = np.array(_CELL_HASH, dtype=np.int64)
+        limit = tolerance * tolerance
+        first, second = [], []
+        for shift in itertools.product((0.0, 0.5), repeat=3):
+            cells = np.floor(scaled + np.array(shift)).astype(np.int64)
+            keys = np.bitwise_xor.reduce(cells * multipliers, axis=1)
+            order = np.argsort(keys)
+            keys = keys[order]
+            for step in range(1, count):
+                same = keys[:-step] == keys[step:]
+                if not same.any():
+                    break
+                a, b = order[:-step][same], order[step:][same]
+                delta = vertices[a] - vertices[b]
+                near = np.einsum("ij,ij->i", delta, delta) < limit
+                first.append(a[near])
+                second.append(b[near])
+        labels = np.arange(count)
+        if first:
+            a, b = np.concatenate(first), np.concatenate(second)
+            # Propagate the smallest index through each connected group of close pairs.
+            while len(a):
+                before = labels
+                low = np.minimum(labels[a], labels[b])
+                labels = labels.copy()
+                np.minimum.at(labels, a, low)
+                np.minimum.at(labels, b, low)
+                labels = labels[labels]
+                if np.array_equal(labels, before):
+                    break
+        keep = labels == np.arange(count)
+        remap = (np.cumsum(keep) - 1)[labels]
+        tris = remap[self.triangles.astype(np.int64)]
+        if drop_degenerate and len(tris):
+            tris = tris[(tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])]
+        return IndexedMesh(self.vertices[keep], tris)
+
+    def _merge_near_python(self, tolerance: float, drop_degenerate: bool) -> "IndexedMesh":
+        src = self.vertices
+        count = len(src) // 3
+        parent = list(range(count))
+
+        def root(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        limit = tolerance * tolerance
+        grid = {}
+        for k in range(count):
+            x, y, z = src[3 * k], src[3 * k + 1], src[3 * k + 2]
+            cx, cy, cz = math.floor(x / tolerance), math.floor(y / tolerance), math.floor(z / tolerance)
+            for dx, dy, dz in itertools.product((-1, 0, 1), repeat=3):
+                for other in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                    ox, oy, oz = src[3 * other], src[3 * other + 1], src[3 * other + 2]
+                    if (x - ox) ** 2 + (y - oy) ** 2 + (z - oz) ** 2 < limit:
+                        a, b = root(k), root(other)
+                        if a != b:
+                            parent[max(a, b)] = min(a, b)
+            grid.setdefault((cx, cy, cz), []).append(k)
+
+        remap = array("I", bytes(4 * count))
+        vertices = array("f")
+        for k in range(count):
+            top = root(k)
+            if top == k:
+                remap[k] = len(vertices) // 3
+                vertices.extend(src[3 * k : 3 * k + 3])
+            else:
+                remap[k] = remap[top]
+        tris = array("I")
+        src_tris = self.triangles
+        for t in range(0, len(src_tris) - 2, 3):
+            a, b, c = remap[src_tris[t]], remap[src_tris[t + 1]], remap[src_tris[t + 2]]
+            if drop_degenerate and (a == b or b == c or a == c):
+                continue
+            tris.extend((a, b, c))
+        return IndexedMesh(vertices, tris)
+
+    def to_triangle_buffer(self) -> TriangleBuffer:
+        """Expand back to STL records (normals recomputed)."""
+        if np is not None:
+            from .obj_numpy import triangle_records
+
+            return triangle_records(self.vertices.astype(np.float64), self.triangles.astype(np.int64))
+        from .obj_stl import compute_normal
+
+        buf = TriangleBuffer()
+        v = self.vertices
+        t = self.triangles
+        for k in range(0, len(t) - 2, 3):
+            o, p, q = t[k] * 3, t[k + 1] * 3, t[k + 2] * 3
+            a = (v[o], v[o + 1], v[o + 2])
+            b = (v[p], v[p + 1], v[p + 2])
+            c = (v[q], v[q + 1], v[q + 2])
+            buf.append(*compute_normal(a, b, c), a, b, c)
+        return buf
+
+    def write_stl(self, stl_path: str):
+        """Binary STL of this mesh. Returns StlStats."""
+        return write_binary_stl(stl_path, self.to_triangle_buffer())
@@ -0,0 +1,183 @@
+import threading
+import time
+import traceback
+import uuid
+
+import adsk.core
+
+from .constants import JOB_EVENT_ID
+from .logging_utils import log
+from .state import STATE
+
+_JOBS = {}
+_LOCK = threading.Lock()
+
+
+class ExportJob:
+    """
+    Handle for one background export. Worker code calls update(); the callbacks given to
+    run_job() always run on Fusion's main thread, delivered through a custom event.
+    """
+
+    def __init__(self, action: str):
+        self.id = uuid.uuid4().hex
+        self.action = action
+        self.status = "queued"  # queued → running → done | failed
+        self.phase = ""
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.traceback = ""
+        self.created = time.time()
+        self.finished = None
+        self._event = threading.Event()
+        self._on_progress = None
+        self._on_done = None
+        self._on_lost = None
+        self._delivered = False
+        self._lost = None  # why events stopped reaching the main thread
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._event.wait(timeout)
+
+    def update(self, phase: str, progress: float) -> None:
+        self.phase = phase
+        self.progress = max(0.0, min(1.0, float(progress)))
+        _post(self)
+
+    def describe(self) -> dict:
+        return {
+            "id": self.id,
+            "action": self.action,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": self.progress,
+            "error": str(self.error) if self.error else None,
+            "seconds": round((self.finished or time.time()) - self.created, 3),
+        }
+
+    def _dispatch(self) -> None:
+        """Main thread: report progress, then completion exactly once."""
+        if self._on_progress:
+            try:
+                self._on_progress(self)
+            except Exception as exc:
+                log(f"Job progress callback failed: {exc}")
+        if self.done and not self._delivered:
+            with _LOCK:
+                if _JOBS.pop(self.id, None) is None:
+                    return
+            self._delivered = True
+            if self._on_done:
+                self._on_done(self)
+
+
+class JobEventHandler(adsk.core.CustomEventHandler):
+    def notify(self, args: adsk.core.CustomEventArgs):
+        try:
+            with _LOCK:
+                job = _JOBS.get(args.additionalInfo or "")
+            if job:
+                job._dispatch()
+        except Exception as exc:
+            log(f"Job event handler error: {exc}")
+
+
+def _post(job: ExportJob) -> None:
+    if job._lost is None:
+        try:
+            if STATE.job_event is None:
+                raise RuntimeError("job events are not registered")
+            STATE.app.fireCustomEvent(JOB_EVENT_ID, job.id)
+            return
+        except Exception as exc:
+            log(f"Job event post failed: {exc}")
+            job._lost = exc
+    if job.done:
+        _abandon(job)
+
+
+def _abandon(job: ExportJob) -> None:
+    """
+    Worker thread, after the work has finished: the completion event cannot reach the
+    main thread, so fail the job here and let on_lost(job) release what on_done would.
+    """
+    with _LOCK:
+        if _JOBS.pop(job.id, None) is None:
+            return
+    job._delivered = True
+    job.status = "failed"
+    if job.error is None:
+        job.error = RuntimeError(f"Export finished but could not report back: {job._lost}")
+    if job._on_lost:
+        try:
+            job._on_lost(job)
+        except Exception as exc:
+            log(f"Job lost callback failed: {exc}")
+
+
+def register_job_events(app: adsk.core.Application) -> None:
+    try:
+        app.unregisterCustomEvent(JOB_EVENT_ID)
+    except Exception:
+        pass
+    try:
+        event = app.registerCustomEvent(JOB_EVENT_ID)
+        handler = JobEventHandler()
+        event.add(handler)
+        STATE.handlers.append(handler)
+        STATE.job_event = event
+    except Exception as exc:
+        STATE.job_event = None
+        log(f"Job event registration failed, exports stay synchronous: {exc}")
+
+
+def unregister_job_events(app: adsk.core.Application) -> None:
+    STATE.job_event = None
+    try:
+        app.unregisterCustomEvent(JOB_EVENT_ID)
+    except Exception:
+        pass
+
+
+def async_exports_enabled() -> bool:
+    return bool(STATE.config.get("async_export", True)) and STATE.job_event is not None
+
+
+def _run(job: ExportJob, work) -> None:
+    job.status = "running"
+    _post(job)
+    try:
+        job.result = work(job)
+        job.status = "done"
+        job.progress = 1.0
+    except Exception as exc:
+        job.error = exc
+        job.traceback = traceback.format_exc()
+        job.status = "failed"
+    job.finished = time.time()
+    job._event.set()
+    _post(job)
+
+
+def run_job(job: ExportJob, work, on_progress=None, on_done=None, on_lost=None) -> ExportJob:
+    """
+    Run work(job) on a worker thread. on_progress(job) and on_done(job) are called on
+    the main thread; work must not touch the Fusion API. If the job's events cannot be
+    posted, on_lost(job) is called instead of on_done, on the worker thread, once work
+    has returned.
+    """
+    job._on_progress = on_progress
+    job._on_done = on_done
+    job._on_lost = on_lost
+    with _LOCK:
+        _JOBS[job.id] = job
+    thread = threading.Thread(
+        target=_run, args=(job, work), name=f"quickstl-{job.action}", daemon=True
+    )
+    thread.start()
+    return job
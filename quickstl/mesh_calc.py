@@ -0,0 +1,172 @@
+from array import array
+
+from .obj_numpy import np, numpy_available, triangle_records
+from .indexed_mesh import IndexedMesh
+from .obj_stl import BinaryStlWriter
+from .quality import apply_mesh_quality
+from .timing import timed
+
+CM_TO_MM = 10.0
+IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def _items(collection):
+    try:
+        return [collection.item(i) for i in range(collection.count)]
+    except Exception:
+        return []
+
+
+def _visible(item) -> bool:
+    try:
+        return bool(getattr(item, "isVisible", True))
+    except Exception:
+        return True
+
+
+def visible_items(collection) -> list:
+    return [item for item in _items(collection) if _visible(item)]
+
+
+def _matrix(transform):
+    """Row-major 4x4 tuple from a Fusion Matrix3D; None means identity."""
+    if transform is None:
+        return None
+    try:
+        values = tuple(float(v) for v in transform.asArray())
+    except Exception:
+        return None
+    if len(values) != 16 or values == IDENTITY:
+        return None
+    return values
+
+
+def _compose(outer, inner):
+    if outer is None:
+        return inner
+    if inner is None:
+        return outer
+    return tuple(
+        sum(outer[r * 4 + k] * inner[k * 4 + c] for k in range(4))
+        for r in range(4)
+        for c in range(4)
+    )
+
+
+def _occurrence_transform(occ):
+    for attr in ("transform2", "transform"):
+        try:
+            value = getattr(occ, attr)
+        except Exception:
+            continue
+        if value is not None:
+            return _matrix(value)
+    return None
+
+
+def collect_bodies(entity):
+    """
+    (body, transform) pairs for every visible body under a body, occurrence or component.
+    Proxies are swapped for their native body plus the occurrence transform.
+    """
+    if hasattr(entity, "meshManager"):
+        context = getattr(entity, "assemblyContext", None)
+        native = getattr(entity, "nativeObject", None)
+        if context is not None and native is not None:
+            return [(native, _occurrence_transform(context))]
+        return [(entity, None)]
+
+    if hasattr(entity, "component") and hasattr(entity, "transform2"):
+        base = _occurrence_transform(entity)
+        comp = entity.component
+    else:
+        base = None
+        comp = entity
+    pairs = [(body, base) for body in visible_items(comp.bRepBodies)]
+    for occ in visible_items(comp.allOccurrences):
+        transform = _compose(base, _occurrence_transform(occ))
+        for body in visible_items(occ.component.bRepBodies):
+            pairs.append((body, transform))
+    return pairs
+
+
+def _transform_coords_python(coords, transform):
+    out = array("d", bytes(8 * len(coords)))
+    m = transform or IDENTITY
+    for o in range(0, len(coords) - 2, 3):
+        x, y, z = coords[o], coords[o + 1], coords[o + 2]
+        out[o] = (m[0] * x + m[1] * y + m[2] * z + m[3]) * CM_TO_MM
+        out[o + 1] = (m[4] * x + m[5] * y + m[6] * z + m[7]) * CM_TO_MM
+        out[o + 2] = (m[8] * x + m[9] * y + m[10] * z + m[11]) * CM_TO_MM
+    return out
+
+
+def _vertices_mm(coords, transform):
+    vertices = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    if transform is not None:
+        m = np.asarray(transform, dtype=np.float64).reshape(4, 4)
+        vertices = vertices @ m[:3, :3].T + m[:3, 3]
+    return vertices * CM_TO_MM
+
+
+def write_mesh(writer: BinaryStlWriter, coords, indices, transform=None) -> None:
+    """Append one tessellated body (flat cm coordinates, flat triangle indices)."""
+    if numpy_available():
+        tris = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        writer.add_buffer(triangle_records(_vertices_mm(coords, transform), tris))
+    else:
+        writer.add_indexed(_transform_coords_python(coords, transform), indices)
+
+
+def tessellate_body(body, quality: str):
+    """Returns (applied, flat cm coordinates, flat triangle indices) from the mesh calculator."""
+    calc = body.meshManager.createMeshCalculator()
+    applied = apply_mesh_quality(calc, quality)
+    mesh = calc.calculate()
+    return applied, mesh.nodeCoordinatesAsDouble, mesh.nodeIndices
+
+
+@timed("fusion_tessellate")
+def tessellate_entity(entity, quality: str):
+    """
+    Fusion half of Direct Mesh (main thread): tessellate every visible body.
+    Returns (applied quality dict, [(coords, indices, transform), ...]).
+    """
+    bodies = collect_bodies(entity)
+    if not bodies:
+        raise RuntimeError("Nothing to export (no visible bodies).")
+
+    applied = None
+    meshes = []
+    for body, transform in bodies:
+        applied, coords, indices = tessellate_body(body, quality)
+        meshes.append((coords, indices, transform))
+    return applied, meshes
+
+
+@timed("write_meshes")
+def write_meshes(applied: dict, meshes, stl_fullpath: str):
+    """File half of Direct Mesh (safe off the main thread). Returns (applied quality dict, StlStats)."""
+    with BinaryStlWriter(stl_fullpath) as writer:
+        for coords, indices, transform in meshes:
+            write_mesh(writer, coords, indices, transform)
+
+    applied["custom"]["converter"] = "numpy" if numpy_available() else "python"
+    applied["custom"]["bodies"] = len(meshes)
+    applied["custom"]["triangles_written"] = writer.count
+    return applied, writer.stats
+
+
+@timed("join_meshes")
+def join_meshes(applied: dict, meshes):
+    """
+    File-free half of Direct Mesh for indexed output (3MF, NumPy only): every body's
+    mesh-calculator nodes, in mm, as one IndexedMesh. Returns (applied, IndexedMesh).
+    """
+    mesh = IndexedMesh.join(
+        IndexedMesh(_vertices_mm(coords, transform), np.asarray(indices, dtype=np.int64))
+        for coords, indices, transform in meshes
+    )
+    applied["custom"]["converter"] = "indexed"
+    applied["custom"]["bodies"] = len(meshes)
+    return applied, mesh
@@ -0,0 +1,216 @@
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from .obj_stl import write_binary_stl
+from .triangles import STL_DTYPE, TriangleBuffer
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _parse_numbers(section, dtype, expected: int):
+    """
+    Whole-section numeric parse, or None unless exactly `expected` numbers were read.
+    Callers pass the section's token count, so a stray non-numeric token (which ends the
+    parse early, or raises on newer NumPy) always falls through to the per-record path.
+    """
+    try:
+        values = np.fromstring(section.tobytes(), dtype=dtype, sep=" ")
+    except ValueError:
+        return None
+    return values if len(values) == expected else None
+
+
+def _token_starts(sec):
+    blank = sec <= 32
+    token_start = ~blank
+    token_start[1:] &= blank[:-1]
+    return token_start
+
+
+def _section_lines(sec, offsets):
+    """The section's records as separate byte strings, one per masked line."""
+    text = sec.tobytes()
+    ends = list(offsets[1:]) + [len(text)]
+    return [text[start:end] for start, end in zip(offsets.tolist(), ends)]
+
+
+def _record_lines(buf, starts, lengths, keyword: int):
+    """Mask of lines starting with `<keyword><blank>`."""
+    size = len(buf)
+    first = buf[np.minimum(starts, size - 1)]
+    second = buf[np.minimum(starts + 1, size - 1)]
+    return (first == keyword) & ((second == 32) | (second == 9)) & (lengths >= 2)
+
+
+def _section(buf, lengths, mask):
+    """Concatenate the masked lines and blank their keyword byte. Returns (bytes, line offsets)."""
+    sec = buf[np.repeat(mask, lengths)]
+    sec_lengths = lengths[mask]
+    offsets = np.cumsum(sec_lengths) - sec_lengths
+    sec[offsets] = 32
+    return sec, offsets
+
+
+def _parse_vertices(buf, lengths, is_v):
+    """
+    Returns (vertices (N,3), kept) where `kept` flags the `v` lines that parsed. Lines
+    with fewer than three numeric coordinates are skipped, as in stream_obj_into.
+    """
+    sec, offsets = _section(buf, lengths, is_v)
+    count = int(is_v.sum())
+    values = _parse_numbers(sec, np.float64, count * 3)
+    if values is not None and int(_token_starts(sec).sum()) == count * 3:
+        return values.reshape(-1, 3), np.ones(count, bool)
+    # Extra components (w, vertex colors) or odd tokens: parse record by record.
+    rows = []
+    kept = np.zeros(count, bool)
+    for k, line in enumerate(_section_lines(sec, offsets)):
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        try:
+            rows.append((float(parts[0]), float(parts[1]), float(parts[2])))
+        except ValueError:
+            continue
+        kept[k] = True
+    return np.array(rows, np.float64).reshape(-1, 3), kept
+
+
+def _parse_faces(buf, lengths, is_f):
+    sec, offsets = _section(buf, lengths, is_f)
+    token_start = _token_starts(sec)
+    face_sizes = np.add.reduceat(token_start, offsets, dtype=np.int64)
+    total = int(face_sizes.sum())
+
+    slash = sec == 47
+    per_ref = 1
+    if slash.any():
+        # Every reference in a Fusion OBJ has the same v/vt/vn shape, so after turning
+        # slashes into blanks each reference is a fixed run of numbers.
+        first = bytes(sec[token_start.argmax() :][:64]).split()[0]
+        per_ref = len([part for part in first.split(b"/") if part])
+        sec[slash] = 32
+    raw = _parse_numbers(sec, np.int64, total * per_ref)
+    if raw is not None and int(_token_starts(sec).sum()) == total * per_ref:
+        return raw[::per_ref], face_sizes
+
+    # Mixed reference shapes or junk (trailing comments): record by record, skipping
+    # references that are not integers, as stream_obj_into does.
+    sec, offsets = _section(buf, lengths, is_f)
+    refs = []
+    sizes = np.zeros(len(offsets), np.int64)
+    for k, line in enumerate(_section_lines(sec, offsets)):
+        for part in line.split():
+            try:
+                refs.append(int(part.split(b"/")[0]))
+            except ValueError:
+                continue
+            sizes[k] += 1
+    return np.array(refs, np.int64), sizes
+
+
+def parse_obj_bytes(data: bytes, scale: float = 10.0):
+    """
+    Bulk-parse `v` and `f` records from raw OBJ text. Returns (vertices (N,3) float64
+    in mm, face_indices flat int64 0-based, face_sizes int64, relative bool mask).
+    Relative (negative) references are resolved against the vertices in `data` only;
+    `relative` marks them so a caller parsing part of a file can shift them.
+    """
+    empty = np.zeros(0, np.int64)
+    if not data:
+        return np.zeros((0, 3), np.float64), empty, empty, np.zeros(0, bool)
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(buf == 10) + 1))
+    starts = starts[starts < len(buf)]
+    lengths = np.diff(np.append(starts, len(buf)))
+    is_v = _record_lines(buf, starts, lengths, 118)
+    is_f = _record_lines(buf, starts, lengths, 102)
+
+    vertices, kept = _parse_vertices(buf, lengths, is_v)
+    vertices *= scale
+    if not is_f.any():
+        return vertices, empty, empty, np.zeros(0, bool)
+
+    raw, face_sizes = _parse_faces(buf, lengths, is_f)
+    face_indices = raw - 1
+    negative = raw < 0
+    if negative.any():
+        # Relative indices count back from the vertices defined before each face line.
+        is_vertex = is_v.copy()
+        is_vertex[is_v] = kept
+        v_before_face = np.cumsum(is_vertex)[is_f]
+        face_indices = np.where(negative, np.repeat(v_before_face, face_sizes) + raw, face_indices)
+    return vertices, face_indices, face_sizes, negative
+
+
+def parse_obj_arrays(obj_path: str, scale: float = 10.0):
+    """
+    Bulk-parse `v` and `f` records. Returns (vertices (N,3) float64 in mm,
+    face_indices flat int64 0-based, face_sizes int64).
+    """
+    with open(obj_path, "rb") as handle:
+        data = handle.read()
+    vertices, face_indices, face_sizes, _ = parse_obj_bytes(data, scale)
+    return vertices, face_indices, face_sizes
+
+
+def fan_triangulate(face_indices, face_sizes):
+    """Fan triangulation with index arithmetic: returns (T,3) int64 vertex indices."""
+    valid = face_sizes >= 3
+    starts = np.cumsum(face_sizes) - face_sizes
+    starts = starts[valid]
+    per_face = face_sizes[valid] - 2
+    total = int(per_face.sum())
+    if total == 0:
+        return np.zeros((0, 3), np.int64)
+    first = np.repeat(starts, per_face)
+    local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(per_face) - per_face, per_face)
+    tris = np.empty((total, 3), np.int64)
+    tris[:, 0] = face_indices[first]
+    tris[:, 1] = face_indices[first + local + 1]
+    tris[:, 2] = face_indices[first + local + 2]
+    return tris
+
+
+def compute_normals(v0, v1, v2):
+    normals = np.cross(v1 - v0, v2 - v0)
+    length = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+    degenerate = length <= 1e-20
+    length[degenerate] = 1.0
+    normals /= length[:, None]
+    normals[degenerate] = 0.0
+    return normals
+
+
+def triangle_records(vertices, tris) -> TriangleBuffer:
+    """Structured `<12fH` records for (T,3) vertex indices, wrapped without copying."""
+    count = len(vertices)
+    if len(tris):
+        in_range = ((tris >= 0) & (tris < count)).all(axis=1)
+        if not in_range.all():
+            tris = tris[in_range]
+    v0 = vertices[tris[:, 0]]
+    v1 = vertices[tris[:, 1]]
+    v2 = vertices[tris[:, 2]]
+    records = np.zeros(len(tris), dtype=STL_DTYPE)
+    records["normal"] = compute_normals(v0, v1, v2)
+    records["v0"] = v0
+    records["v1"] = v1
+    records["v2"] = v2
+    return TriangleBuffer.from_buffer(records.view(np.uint8))
+
+
+def write_binary_stl_arrays(stl_path: str, vertices, tris):
+    """Emit the whole file from one structured record array."""
+    return write_binary_stl(stl_path, triangle_records(vertices, tris))
+
+
+def convert_obj_to_stl_numpy(obj_path: str, stl_path: str, scale: float = 10.0):
+    vertices, face_indices, face_sizes = parse_obj_arrays(obj_path, scale)
+    tris = fan_triangulate(face_indices, face_sizes)
+    return write_binary_stl_arrays(stl_path, vertices, tris)
@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .obj_numpy import fan_triangulate, np, numpy_available, parse_obj_bytes, write_binary_stl_arrays
+from .obj_stl import write_indexed_stl
+
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024  # below this, pool startup outweighs the parse
+CHUNK_MIN_BYTES = 16 * 1024 * 1024
+MAX_WORKERS = 8
+
+
+def parallel_worker_count(file_size: int) -> int:
+    """Workers worth starting for an OBJ of `file_size` bytes; 1 means parse in-process."""
+    if file_size < PARALLEL_MIN_BYTES:
+        return 1
+    cores = os.cpu_count() or 1
+    # Leave one core to Fusion's UI thread.
+    return max(1, min(cores - 1, MAX_WORKERS, file_size // CHUNK_MIN_BYTES))
+
+
+def split_ranges(obj_path: str, parts: int):
+    """Split the file into `parts` byte ranges that each start at a line boundary."""
+    size = os.path.getsize(obj_path)
+    bounds = [0]
+    with open(obj_path, "rb") as handle:
+        for k in range(1, parts):
+            handle.seek(max(bounds[-1], size * k // parts))
+            handle.readline()
+            pos = handle.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def _parse_chunk_python(data: bytes, scale: float):
+    coords = array("d")
+    tris = array("q")
+    relative = bytearray()
+    for line in data.splitlines():
+        line = line.strip()
+        if line.startswith(b"v "):
+            parts = line.split()
+            if len(parts) >= 4:
+                try:
+                    x = float(parts[1]) * scale
+                    y = float(parts[2]) * scale
+                    z = float(parts[3]) * scale
+                except Exception:
+                    continue
+                coords.append(x)
+                coords.append(y)
+                coords.append(z)
+        elif line.startswith(b"f "):
+            vcount = len(coords) // 3
+            idxs = []
+            flags = []
+            for part in line.split()[1:]:
+                try:
+                    i = int(part.split(b"/")[0])
+                except Exception:
+                    continue
+                if i > 0:
+                    idxs.append(i - 1)
+                    flags.append(0)
+                elif i < 0:
+                    idxs.append(vcount + i)
+                    flags.append(1)
+            for k in range(1, len(idxs) - 1):
+                tris.extend((idxs[0], idxs[k], idxs[k + 1]))
+                relative.extend((flags[0], flags[k], flags[k + 1]))
+    return coords, tris, relative
+
+
+def _parse_chunk_numpy(data: bytes, scale: float):
+    vertices, face_indices, face_sizes, negative = parse_obj_bytes(data, scale)
+    tris = fan_triangulate(face_indices, face_sizes)
+    relative = fan_triangulate(negative.astype(np.int64), face_sizes).astype(bool)
+    return vertices, tris, relative
+
+
+def _parse_range(obj_path: str, start: int, end: int, scale: float):
+    """
+    Worker: parse one byte range. Absolute references are global already; relative
+    ones are resolved against this chunk's own vertices and flagged for the merge.
+    """
+    with open(obj_path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    if numpy_available():
+        return _parse_chunk_numpy(data, scale)
+    return _parse_chunk_python(data, scale)
+
+
+def _merge_numpy(chunks):
+    base = 0
+    vertices = []
+    tris = []
+    for chunk_vertices, chunk_tris, relative in chunks:
+        if relative.any():
+            chunk_tris = chunk_tris + base * relative
+        vertices.append(chunk_vertices)
+        tris.append(chunk_tris)
+        base += len(chunk_vertices)
+    return np.concatenate(vertices), np.concatenate(tris)
+
+
+def _merge_python(chunks):
+    coords = array("d")
+    tris = array("q")
+    for chunk_coords, chunk_tris, relative in chunks:
+        base = len(coords) // 3
+        if base and 1 in relative:
+            chunk_tris = array("q", (i + base if r else i for i, r in zip(chunk_tris, relative)))
+        coords.extend(chunk_coords)
+        tris.extend(chunk_tris)
+    return coords, tris
+
+
+def _pool_context():
+    ctx = multiprocessing.get_context("spawn")
+    exe = os.path.basename(sys.executable or "").lower()
+    if not exe.startswith("python"):
+        # Embedded interpreters (Fusion) report the host application as sys.executable.
+        name = "python.exe" if os.name == "nt" else os.path.join("bin", "python3")
+        candidate = os.path.join(sys.exec_prefix, name)
+        if not os.path.isfile(candidate):
+            raise RuntimeError(f"No Python interpreter for worker processes under {sys.exec_prefix}")
+        ctx.set_executable(candidate)
+    return ctx
+
+
+def parse_obj_parallel(obj_path: str, scale: float = 10.0, workers: int = 0):
+    """
+    Parse an OBJ across a process pool. Returns (vertices, triangle indices): NumPy
+    (N,3)/(T,3) arrays when NumPy is available, flat `array`s otherwise.
+    """
+    if workers <= 0:
+        workers = parallel_worker_count(os.path.getsize(obj_path))
+    ranges = split_ranges(obj_path, workers)
+    if len(ranges) > 1:
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=_pool_context()) as pool:
+            futures = [pool.submit(_parse_range, obj_path, s, e, scale) for s, e in ranges]
+            chunks = [f.result() for f in futures]
+    else:
+        chunks = [_parse_range(obj_path, s, e, scale) for s, e in ranges]
+    if numpy_available():
+        return _merge_numpy(chunks)
+    return _merge_python(chunks)
+
+
+def convert_obj_to_stl_parallel(
+    obj_path: str, stl_path: str, scale: float = 10.0, workers: int = 0
+):
+    vertices, tris = parse_obj_parallel(obj_path, scale, workers)
+    if numpy_available():
+        return write_binary_stl_arrays(stl_path, vertices, tris)
+    return write_indexed_stl(stl_path, vertices, tris)
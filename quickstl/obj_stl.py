@@ -1,34 +1,50 @@
+import itertools
 import math
-import struct
 import os
 import tempfile
 import time
+from array import array
 
+from .analysis import StlStats
 from .constants import ADDIN_VERSION
+from .logging_utils import log_warning
 from .quality import apply_obj_quality
+from .timing import timed
+from .triangles import RECORD_SIZE, TriangleBuffer
 
+STREAM_BATCH_TRIANGLES = 8192
+# The in-memory engines (NumPy, parallel) peak at roughly this multiple of the OBJ size;
+# OBJs that would need more than the budget use the constant-memory stream converter.
+IN_MEMORY_BYTES_PER_OBJ_BYTE = 7
+IN_MEMORY_BUDGET_BYTES = 1024 * 1024 * 1024
+_TMP_SEQ = itertools.count()
 
-def write_binary_stl(stl_path: str, triangles) -> None:
+
+def stl_header() -> bytes:
+    header = f"QuickSTL v{ADDIN_VERSION} OBJ->STL".encode("ascii", errors="ignore")
+    if len(header) > 80:
+        return header[:80]
+    return header + b" " * (80 - len(header))
+
+
+def write_binary_stl(stl_path: str, triangles) -> StlStats:
     """
-    triangles: iterable of (nx,ny,nz, (x1,y1,z1), (x2,y2,z2), (x3,y3,z3)) in millimeters.
+    triangles: TriangleBuffer, or iterable of (nx,ny,nz, (x1,y1,z1), (x2,y2,z2), (x3,y3,z3))
+    in millimeters. Returns the stats of what was written.
     """
-    tri_list = list(triangles)
-    tri_count = len(tri_list)
+    if not isinstance(triangles, TriangleBuffer):
+        buf = TriangleBuffer()
+        buf.extend(triangles)
+        triangles = buf
 
     with open(stl_path, "wb") as handle:
-        header = f"QuickSTL v{ADDIN_VERSION} OBJ->STL".encode("ascii", errors="ignore")
-        if len(header) > 80:
-            header = header[:80]
-        else:
-            header = header + b" " * (80 - len(header))
-        handle.write(header)
-        handle.write(tri_count.to_bytes(4, "little"))
-        for nx, ny, nz, v1, v2, v3 in tri_list:
-            handle.write(struct.pack("<3f", float(nx), float(ny), float(nz)))
-            handle.write(struct.pack("<3f", float(v1[0]), float(v1[1]), float(v1[2])))
-            handle.write(struct.pack("<3f", float(v2[0]), float(v2[1]), float(v2[2])))
-            handle.write(struct.pack("<3f", float(v3[0]), float(v3[1]), float(v3[2])))
-            handle.write(struct.pack("<H", 0))
+        handle.write(stl_header())
+        handle.write(len(triangles).to_bytes(4, "little"))
+        triangles.write_to(handle)
+    stats = StlStats()
+    stats.add_buffer(triangles)
+    stats.file_size = 84 + len(triangles) * RECORD_SIZE
+    return stats
 
 
 def triangulate_face(indices):
@@ -56,76 +72,250 @@ def compute_normal(a, b, c):
     return (nx / length, ny / length, nz / length)
 
 
-def export_via_obj_then_stl(design, entity, stl_fullpath: str, quality: str) -> dict:
-    """Use Fusion's OBJ exporter with quality controls, then convert OBJ→Binary STL."""
-    mgr = design.exportManager
-    tmp_dir = tempfile.gettempdir()
-    tmp_obj = os.path.join(tmp_dir, f"quickstl_{int(time.time() * 1000)}.obj")
+class BinaryStlWriter:
+    """
+    Binary STL written incrementally through a small TriangleBuffer batch. The triangle
+    count is written as a placeholder and patched on close; `stats` is built per batch.
+    """
 
-    opts = mgr.createOBJExportOptions(entity, tmp_obj)
-    try:
-        opts.sendToPrintUtility = False
-    except Exception:
-        pass
-    applied = apply_obj_quality(opts, quality)
-    mgr.execute(opts)
+    def __init__(self, stl_path: str):
+        self.path = stl_path
+        self.count = 0
+        self.stats = StlStats()
+        self._batch = TriangleBuffer()
+        self._handle = None
 
-    vertices = []
-    faces = []
+    def __enter__(self) -> "BinaryStlWriter":
+        self._handle = open(self.path, "wb")
+        self._handle.write(stl_header())
+        self._handle.write(b"\x00\x00\x00\x00")
+        return self
 
-    with open(tmp_obj, "r", encoding="utf-8", errors="ignore") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line or line.startswith("#"):
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add(self, nx, ny, nz, a, b, c) -> None:
+        self._batch.append(nx, ny, nz, a, b, c)
+        if len(self._batch) >= STREAM_BATCH_TRIANGLES:
+            self._flush()
+
+    def add_buffer(self, triangles: TriangleBuffer) -> None:
+        self._flush()
+        triangles.write_to(self._handle)
+        self.stats.add_buffer(triangles)
+        self.count += len(triangles)
+
+    def add_indexed(self, coords, tri_indices) -> None:
+        """Flat xyz coordinates (mm) plus flat triangle indices; bad references are skipped."""
+        vcount = len(coords) // 3
+        for t in range(0, len(tri_indices) - 2, 3):
+            i1, i2, i3 = tri_indices[t], tri_indices[t + 1], tri_indices[t + 2]
+            if not (0 <= i1 < vcount and 0 <= i2 < vcount and 0 <= i3 < vcount):
                 continue
+            o, p, q = i1 * 3, i2 * 3, i3 * 3
+            a = (coords[o], coords[o + 1], coords[o + 2])
+            b = (coords[p], coords[p + 1], coords[p + 2])
+            c = (coords[q], coords[q + 1], coords[q + 2])
+            nx, ny, nz = compute_normal(a, b, c)
+            self.add(nx, ny, nz, a, b, c)
+
+    def _flush(self) -> None:
+        self._batch.write_to(self._handle)
+        self.stats.add_buffer(self._batch)
+        self.count += len(self._batch)
+        self._batch.clear()
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            self._flush()
+            self._handle.seek(80)
+            self._handle.write(self.count.to_bytes(4, "little"))
+            self.stats.file_size = 84 + self.count * RECORD_SIZE
+        finally:
+            self._handle.close()
+            self._handle = None
+
+
+def write_indexed_stl(stl_path: str, coords, tri_indices) -> StlStats:
+    """Binary STL from a flat xyz coordinate sequence (mm) and flat triangle vertex indices."""
+    with BinaryStlWriter(stl_path) as writer:
+        writer.add_indexed(coords, tri_indices)
+    return writer.stats
+
+
+def stream_obj_into(writer: BinaryStlWriter, obj_path: str, scale: float = 10.0) -> None:
+    """
+    Single-pass OBJ→Binary STL. Only the vertex table is kept in memory; triangles are
+    packed into the writer's small batch buffer and flushed as they are produced.
+    """
+    coords = array("d")
+
+    with open(obj_path, "r", encoding="utf-8", errors="ignore") as src:
+        for line in src:
+            line = line.strip()
             if line.startswith("v "):
                 parts = line.split()
                 if len(parts) >= 4:
                     try:
-                        x = float(parts[1])
-                        y = float(parts[2])
-                        z = float(parts[3])
-                        vertices.append((x, y, z))
+                        x = float(parts[1]) * scale
+                        y = float(parts[2]) * scale
+                        z = float(parts[3]) * scale
                     except Exception:
-                        pass
+                        continue
+                    coords.append(x)
+                    coords.append(y)
+                    coords.append(z)
             elif line.startswith("f "):
-                parts = line.split()[1:]
+                vcount = len(coords) // 3
                 idxs = []
-                for part in parts:
+                for part in line.split()[1:]:
                     try:
-                        v_idx = part.split("/")[0]
-                        i = int(v_idx)
-                        if i > 0:
-                            i0 = i - 1
-                        else:
-                            i0 = len(vertices) + i
-                        idxs.append(i0)
+                        i = int(part.split("/")[0])
                     except Exception:
-                        pass
-                if len(idxs) >= 3:
-                    faces.append(idxs)
+                        continue
+                    i0 = i - 1 if i > 0 else vcount + i
+                    if 0 <= i0 < vcount:
+                        idxs.append(i0 * 3)
+                if len(idxs) < 3:
+                    continue
+                o = idxs[0]
+                a = (coords[o], coords[o + 1], coords[o + 2])
+                for k in range(1, len(idxs) - 1):
+                    p = idxs[k]
+                    q = idxs[k + 1]
+                    b = (coords[p], coords[p + 1], coords[p + 2])
+                    c = (coords[q], coords[q + 1], coords[q + 2])
+                    nx, ny, nz = compute_normal(a, b, c)
+                    writer.add(nx, ny, nz, a, b, c)
 
-    scale = 10.0
-    v_mm = [(vx * scale, vy * scale, vz * scale) for (vx, vy, vz) in vertices]
 
-    triangles = []
-    for face in faces:
-        for i1, i2, i3 in triangulate_face(face):
-            try:
-                a = v_mm[i1]
-                b = v_mm[i2]
-                c = v_mm[i3]
-            except Exception:
-                continue
-            nx, ny, nz = compute_normal(a, b, c)
-            triangles.append((nx, ny, nz, a, b, c))
+def stream_obj_to_stl(obj_path: str, stl_path: str, scale: float = 10.0) -> StlStats:
+    """The triangle count is written as a placeholder and patched once the face stream ends."""
+    with BinaryStlWriter(stl_path) as writer:
+        stream_obj_into(writer, obj_path, scale)
+    return writer.stats
 
-    write_binary_stl(stl_fullpath, triangles)
 
+def fits_in_memory(file_size: int) -> bool:
+    """Whether the in-memory engines stay under IN_MEMORY_BUDGET_BYTES for this OBJ."""
+    return file_size * IN_MEMORY_BYTES_PER_OBJ_BYTE <= IN_MEMORY_BUDGET_BYTES
+
+
+def convert_obj_to_stl(obj_path: str, stl_path: str, scale: float = 10.0):
+    """
+    Pick the fastest converter that fits the memory budget; OBJs too large for it are
+    streamed. Returns (StlStats, converter name).
+    """
+    from .obj_numpy import convert_obj_to_stl_numpy, numpy_available
+    from .obj_parallel import convert_obj_to_stl_parallel, parallel_worker_count
+
+    size = os.path.getsize(obj_path)
+    if not fits_in_memory(size):
+        return stream_obj_to_stl(obj_path, stl_path, scale), "stream"
+    workers = parallel_worker_count(size)
+    if workers > 1:
+        try:
+            return convert_obj_to_stl_parallel(obj_path, stl_path, scale, workers), "parallel"
+        except Exception as exc:
+            log_warning(f"Parallel OBJ parse failed, using single process: {exc}")
+    if numpy_available():
+        try:
+            return convert_obj_to_stl_numpy(obj_path, stl_path, scale), "numpy"
+        except Exception as exc:
+            log_warning(f"NumPy OBJ parse failed, streaming instead: {exc}")
+    return stream_obj_to_stl(obj_path, stl_path, scale), "stream"
+
+
+def append_obj_to_writer(writer: BinaryStlWriter, obj_path: str, scale: float = 10.0) -> str:
+    """convert_obj_to_stl for an already open writer (merged exports). Returns the converter name."""
+    from .obj_numpy import fan_triangulate, numpy_available, parse_obj_arrays, triangle_records
+    from .obj_parallel import parallel_worker_count, parse_obj_parallel
+
+    size = os.path.getsize(obj_path)
+    if not fits_in_memory(size):
+        stream_obj_into(writer, obj_path, scale)
+        return "stream"
+    workers = parallel_worker_count(size)
+    if workers > 1:
+        try:
+            vertices, tris = parse_obj_parallel(obj_path, scale, workers)
+            if numpy_available():
+                writer.add_buffer(triangle_records(vertices, tris))
+            else:
+                writer.add_indexed(vertices, tris)
+            return "parallel"
+        except Exception as exc:
+            log_warning(f"Parallel OBJ parse failed, using single process: {exc}")
+    if numpy_available():
+        try:
+            vertices, face_indices, face_sizes = parse_obj_arrays(obj_path, scale)
+            records = triangle_records(vertices, fan_triangulate(face_indices, face_sizes))
+        except Exception as exc:
+            log_warning(f"NumPy OBJ parse failed, streaming instead: {exc}")
+        else:
+            writer.add_buffer(records)
+            return "numpy"
+    stream_obj_into(writer, obj_path, scale)
+    return "stream"
+
+
+@timed("fusion_obj_export")
+def export_obj_temp(design, entity, quality: str):
+    """
+    Fusion half of OBJ→STL (main thread): export the entity to a temp OBJ.
+    Returns (applied quality dict, temp OBJ path).
+    """
+    mgr = design.exportManager
+    tmp_dir = tempfile.gettempdir()
+    # Unique per call: batch exports produce several temp OBJs within the same millisecond.
+    tmp_obj = os.path.join(tmp_dir, f"quickstl_{int(time.time() * 1000)}_{next(_TMP_SEQ)}.obj")
+
+    opts = mgr.createOBJExportOptions(entity, tmp_obj)
     try:
-        os.remove(tmp_obj)
+        opts.sendToPrintUtility = False
     except Exception:
         pass
+    applied = apply_obj_quality(opts, quality)
+    mgr.execute(opts)
+    return applied, tmp_obj
+
+
+@timed("obj_to_stl")
+def finish_obj_then_stl(applied: dict, tmp_obj: str, stl_fullpath: str):
+    """
+    File half of OBJ→STL (safe off the main thread): convert and delete the temp OBJ.
+    Returns (applied quality dict, StlStats).
+    """
+    try:
+        stats, converter = convert_obj_to_stl(tmp_obj, stl_fullpath, scale=10.0)
+    finally:
+        try:
+            os.remove(tmp_obj)
+        except Exception:
+            pass
 
-    applied["custom"]["triangles_written"] = len(triangles)
-    return applied
+    applied["custom"]["converter"] = converter
+    applied["custom"]["triangles_written"] = stats.triangles
+    return applied, stats
+
+
+@timed("obj_to_mesh")
+def finish_obj_then_mesh(applied: dict, tmp_objs):
+    """
+    File half of OBJ→3MF: keep the OBJs' own shared vertices instead of writing STL
+    (NumPy only), then delete the temp OBJs. Returns (applied quality dict, IndexedMesh).
+    """
+    from .indexed_mesh import IndexedMesh
+
+    try:
+        mesh = IndexedMesh.join(IndexedMesh.from_obj(tmp_obj) for tmp_obj in tmp_objs)
+    finally:
+        for tmp_obj in tmp_objs:
+            try:
+                os.remove(tmp_obj)
+            except Exception:
+                pass
+    applied["custom"]["converter"] = "indexed"
+    return applied, mesh
@@ -1,6 +1,14 @@
 import os
+import tempfile
 
-from .constants import CONFIG_FILENAME, RES_DIR, TOAST_HTML_FN, TOAST_JSON_FN
+from .constants import (
+    CONFIG_FILENAME,
+    DOC_SETTINGS_FILENAME,
+    RES_DIR,
+    TOAST_HTML_FN,
+    TOAST_JSON_FN,
+    TOAST_PREVIEW_FN,
+)
 
 
 def addin_dir() -> str:
@@ -19,6 +27,10 @@ def toast_json_path() -> str:
     return resource_path(TOAST_JSON_FN)
 
 
+def toast_preview_path() -> str:
+    return resource_path(TOAST_PREVIEW_FN)
+
+
 def icon_folder() -> str:
     return os.path.join(addin_dir(), "resources", "QuickSTL")
 
@@ -27,5 +39,26 @@ def config_path() -> str:
     return os.path.join(addin_dir(), CONFIG_FILENAME)
 
 
+def doc_settings_path() -> str:
+    return os.path.join(addin_dir(), DOC_SETTINGS_FILENAME)
+
+
 def debug_path() -> str:
     return os.path.join(addin_dir(), "debug.json")
+
+
+def debug_events_path() -> str:
+    return os.path.join(addin_dir(), "debug_events.jsonl")
+
+
+def debug_state_path() -> str:
+    return os.path.join(addin_dir(), "debug_state.json")
+
+
+def profile_dir() -> str:
+    """Export profiles are written next to debug.json."""
+    return os.path.dirname(debug_path())
+
+
+def cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "QuickSTL", "cache")
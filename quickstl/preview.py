@@ -0,0 +1,136 @@
+import os
+import struct
+import sys
+from array import array
+
+from .indexed_mesh import IndexedMesh
+from .logging_utils import log
+from .paths import resource_path, toast_preview_path
+from .stl_reader import StlReader
+from .timing import timed
+from .triangles import np
+
+PREVIEW_TRIANGLE_BUDGET = 60000
+PREVIEW_MAGIC = b"QSPV"
+PREVIEW_VERSION = 1
+# Without NumPy, clustering runs in pure Python; thin the input to this multiple of the budget first.
+PYTHON_SAMPLE_FACTOR = 4
+_CELL_GROWTH = 1.5
+
+# Blob layout (little-endian): magic, version, vertex count, triangle count (16 bytes),
+# then float32 xyz per vertex and uint32 indices per triangle.
+_HEADER = struct.Struct("<4sIII")
+
+
+def _stl_soup(path: str):
+    """
+    (unwelded corners, triangle count) of a binary STL; the corners are thinned to a
+    multiple of the budget without NumPy.
+    """
+    with StlReader(path) as reader:
+        if not reader.is_binary:
+            raise ValueError(f"Not a binary STL: {path}")
+        if np is not None:
+            records = reader.records()
+            corners = np.stack([records["v0"], records["v1"], records["v2"]], axis=1).reshape(-1, 3)
+            del records
+            return IndexedMesh(corners, np.arange(len(corners), dtype=np.uint32)), reader.triangle_count
+        step = max(1, reader.triangle_count // (PREVIEW_TRIANGLE_BUDGET * PYTHON_SAMPLE_FACTOR))
+        coords = array("f")
+        triangles = reader.triangles()
+        for k in range(0, len(triangles), step):
+            _, _, _, a, b, c = triangles[k]
+            coords.extend(a + b + c)
+        del triangles
+        return IndexedMesh(coords, array("I", range(len(coords) // 3))), reader.triangle_count
+
+
+def load_model(path: str):
+    """(mesh, source triangle count) for an exported STL or 3MF."""
+    if path.lower().endswith(".3mf"):
+        from .threemf import read_3mf
+
+        mesh = read_3mf(path)
+        return mesh, mesh.triangle_count
+    return _stl_soup(path)
+
+
+def _bbox_diagonal(mesh: IndexedMesh) -> float:
+    if np is not None:
+        if not len(mesh.vertices):
+            return 0.0
+        return float(np.linalg.norm(mesh.vertices.max(axis=0) - mesh.vertices.min(axis=0)))
+    v = mesh.vertices
+    if not len(v):
+        return 0.0
+    span = [max(v[k::3]) - min(v[k::3]) for k in range(3)]
+    return sum(d * d for d in span) ** 0.5
+
+
+def _drop_duplicate_triangles(mesh: IndexedMesh) -> IndexedMesh:
+    """Clustering folds neighbouring triangles onto each other; keep one of each."""
+    if np is not None:
+        if not len(mesh.triangles):
+            return mesh
+        _, first = np.unique(np.sort(mesh.triangles, axis=1), axis=0, return_index=True)
+        return IndexedMesh(mesh.vertices, mesh.triangles[np.sort(first)])
+    seen = set()
+    tris = array("I")
+    t = mesh.triangles
+    for k in range(0, len(t) - 2, 3):
+        key = tuple(sorted((t[k], t[k + 1], t[k + 2])))
+        if key not in seen:
+            seen.add(key)
+            tris.extend(t[k : k + 3])
+    return IndexedMesh(mesh.vertices, tris)
+
+
+def cluster_mesh(mesh: IndexedMesh, budget: int = PREVIEW_TRIANGLE_BUDGET) -> IndexedMesh:
+    """
+    Vertex clustering: snap vertices to a uniform grid and merge each cell, growing the
+    cell until at most `budget` triangles are left. Shape is kept at thumbnail scale.
+    """
+    if mesh.triangle_count <= budget:
+        return mesh.quantize(0)
+    # A closed surface meshed at cell size c has roughly 2·area/c² triangles.
+    cell = _bbox_diagonal(mesh) / (2.0 * budget**0.5)
+    while mesh.triangle_count > budget and cell > 0:
+        mesh = _drop_duplicate_triangles(mesh.quantize(cell))
+        cell *= _CELL_GROWTH
+    return mesh
+
+
+def write_preview_blob(path: str, mesh: IndexedMesh) -> int:
+    """Write `mesh` in the toast's blob layout via a temp file. Returns the blob size."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as handle:
+        handle.write(_HEADER.pack(PREVIEW_MAGIC, PREVIEW_VERSION, mesh.vertex_count, mesh.triangle_count))
+        for table in (mesh.vertices, mesh.triangles):
+            if np is not None:
+                handle.write(table.astype(table.dtype.newbyteorder("<"), copy=False).tobytes())
+            else:
+                if sys.byteorder != "little":
+                    table = array(table.typecode, table)
+                    table.byteswap()
+                handle.write(table.tobytes())
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+@timed("preview")
+def write_preview(model_path: str, budget: int = PREVIEW_TRIANGLE_BUDGET) -> dict:
+    """
+    Build the toast's reduced preview for an exported STL/3MF. File-only, so it can run on
+    a worker thread. Returns {"path", "triangles", "source_triangles"}, or None on failure.
+    """
+    try:
+        source, source_triangles = load_model(model_path)
+        mesh = cluster_mesh(source, budget)
+        del source
+        os.makedirs(resource_path(), exist_ok=True)
+        path = toast_preview_path()
+        write_preview_blob(path, mesh)
+        return {"path": path, "triangles": mesh.triangle_count, "source_triangles": source_triangles}
+    except Exception as exc:
+        log(f"Preview build failed: {exc}")
+        return None
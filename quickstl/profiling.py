@@ -0,0 +1,244 @@
+import contextlib
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+import adsk.core
+
+from .config import save_config
+from .diagnostics import append_debug_event
+from .logging_utils import log, log_warning
+from .paths import profile_dir
+from .state import STATE
+from .ui_helpers import find_input
+
+# Exports profiled per arming of the dialog toggle.
+PROFILE_EXPORT_RUNS = 3
+PROFILE_KEEP = 10
+TOP_ALLOCATIONS = 15
+TOP_FUNCTIONS = 40
+
+
+def peak_rss_bytes() -> int:
+    """Process RSS high-water mark (peak working set on Windows), or 0 when unavailable."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return int(counters.PeakWorkingSetSize)
+            return 0
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KiB on Linux.
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except Exception:
+        return 0
+
+
+def _mb(value: int) -> float:
+    return round(value / (1024 * 1024), 1)
+
+
+class ProfileSession:
+    """
+    cProfile + tracemalloc capture of one export. Each driver step (begin, convert,
+    complete) gets its own profiler, possibly on another thread; finish() merges them and
+    writes <stamp>.pstats and <stamp>.txt under profile_dir().
+    """
+
+    def __init__(self, action: str):
+        self.action = action
+        self.started = time.perf_counter()
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        folder = profile_dir()
+        self.pstats_path = os.path.join(folder, f"profile_{stamp}_{action}.pstats")
+        self.summary_path = os.path.join(folder, f"profile_{stamp}_{action}.txt")
+        self.profiles = []
+        self.snapshot = None
+        self.snapshot_bytes = -1
+        self.rss_before = peak_rss_bytes()
+        self.owns_tracemalloc = not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    def artifacts(self) -> dict:
+        return {"pstats": self.pstats_path, "summary": self.summary_path}
+
+    @contextlib.contextmanager
+    def step(self):
+        """Profile the enclosed block; keep the tracemalloc snapshot of the fullest step."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # Another profiler (a debugger, sys.monitoring tool) owns the hook.
+            log_warning(f"Export profiling skipped for this step: {exc}")
+            profiler = None
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profiles.append(profiler)
+            try:
+                current = tracemalloc.get_traced_memory()[0]
+                if current > self.snapshot_bytes:
+                    self.snapshot_bytes = current
+                    self.snapshot = tracemalloc.take_snapshot()
+            except Exception:
+                pass
+
+    def finish(self) -> dict:
+        """Stop tracing, write the artifacts and return the summary numbers."""
+        seconds = time.perf_counter() - self.started
+        traced_peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+        info = {
+            "action": self.action,
+            "seconds": round(seconds, 3),
+            "traced_peak_mb": _mb(traced_peak),
+            "rss_peak_mb": _mb(peak_rss_bytes()),
+            "rss_peak_before_mb": _mb(self.rss_before),
+            "top_allocations": self.top_allocations(),
+        }
+        info.update(self.artifacts())
+        os.makedirs(os.path.dirname(self.pstats_path), exist_ok=True)
+        stats = None
+        if self.profiles:
+            stats = pstats.Stats(self.profiles[0])
+            for profiler in self.profiles[1:]:
+                stats.add(profiler)
+            stats.dump_stats(self.pstats_path)
+        with open(self.summary_path, "w", encoding="utf-8") as handle:
+            handle.write(self.format_summary(info, stats))
+        prune_profiles()
+        return info
+
+    def top_allocations(self) -> list:
+        if self.snapshot is None:
+            return []
+        snapshot = self.snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        return [
+            {"site": str(stat.traceback[0]), "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+
+    def format_summary(self, info: dict, stats) -> str:
+        lines = [
+            f"Quick STL export profile: {info['action']}",
+            f"Wall time: {info['seconds']:.3f} s",
+            f"Traced Python peak: {info['traced_peak_mb']} MB",
+            f"Process RSS high-water: {info['rss_peak_mb']} MB (was {info['rss_peak_before_mb']} MB before)",
+            "",
+            f"Top allocation sites (live at the fullest step, {_mb(max(self.snapshot_bytes, 0))} MB traced):",
+        ]
+        for site in info["top_allocations"]:
+            lines.append(f"  {site['kb']:>10.1f} KB  {site['blocks']:>8} blocks  {site['site']}")
+        lines.append("")
+        if stats is None:
+            lines.append("No cProfile data (another profiler was active).")
+        else:
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            lines.append(out.getvalue())
+        return "\n".join(lines) + "\n"
+
+
+def prune_profiles(keep: int = PROFILE_KEEP) -> None:
+    """Keep the newest `keep` profiles (pstats + summary pairs)."""
+    try:
+        folder = profile_dir()
+        names = sorted(n for n in os.listdir(folder) if n.startswith("profile_"))
+        stems = sorted({os.path.splitext(n)[0] for n in names})
+        for stem in stems[:-keep] if keep else stems:
+            for ext in (".pstats", ".txt"):
+                path = os.path.join(folder, stem + ext)
+                if os.path.exists(path):
+                    os.remove(path)
+    except Exception as exc:
+        log_warning(f"Profile cleanup failed: {exc}")
+
+
+def start_profile(action: str):
+    """
+    A ProfileSession for this export when profiling is armed (config `profile_exports`
+    counts the exports left to profile), else None. Costs one dict lookup when off.
+    """
+    remaining = STATE.config.get("profile_exports", 0)
+    if not remaining or STATE.profile_session is not None:
+        return None
+    try:
+        session = ProfileSession(action)
+    except Exception as exc:
+        log_warning(f"Export profiling unavailable: {exc}")
+        return None
+    STATE.config["profile_exports"] = max(0, int(remaining) - 1)
+    save_config("profile_exports")
+    if not STATE.config["profile_exports"]:
+        _untick_dialog_toggle()
+    STATE.profile_session = session
+    return session
+
+
+def _untick_dialog_toggle() -> None:
+    """The last armed export has started: clear "Profile next exports" if the dialog is open."""
+    if STATE.command is None:
+        return
+    try:
+        cb = adsk.core.BoolValueCommandInput.cast(find_input(STATE.command.commandInputs, "profileExports"))
+        if cb:
+            cb.value = False
+    except Exception as exc:
+        log_warning(f"Profile toggle refresh failed: {exc}")
+
+
+def profile_step(session):
+    return session.step() if session is not None else contextlib.nullcontext()
+
+
+def finish_profile(session) -> None:
+    if session is None:
+        return
+    if STATE.profile_session is session:
+        STATE.profile_session = None
+    try:
+        info = session.finish()
+    except Exception as exc:
+        log_warning(f"Writing the export profile failed: {exc}")
+        return
+    log(f"Export profile saved: {session.summary_path}")
+    append_debug_event("info", "Export profile saved", info)
@@ -71,3 +71,37 @@ def apply_obj_quality(opts, quality: str) -> dict:
     except Exception as exc:
         log(f"apply_obj_quality aspectRatio set failed: {exc}")
     return applied
+
+
+def apply_mesh_quality(calc, quality: str) -> dict:
+    """Same presets as the OBJ path, applied to a Fusion MeshCalculator."""
+    preset = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["High"])
+    applied = {
+        "mode": quality,
+        "target": "Direct Mesh",
+        "custom": {
+            "surfaceDeviation_cm": preset["surfaceDeviation_cm"],
+            "normalDeviation_deg": preset["normalDeviation_deg"],
+            "maximumEdgeLength_cm": preset["maximumEdgeLength_cm"],
+            "aspectRatio": preset["aspectRatio"],
+            "scale_mm": 10.0,
+        },
+    }
+    try:
+        calc.surfaceTolerance = float(preset["surfaceDeviation_cm"])
+    except Exception as exc:
+        log(f"apply_mesh_quality surfaceTolerance set failed: {exc}")
+    try:
+        calc.maxNormalDeviation = float(deg_to_rad(preset["normalDeviation_deg"]))
+    except Exception as exc:
+        log(f"apply_mesh_quality maxNormalDeviation set failed: {exc}")
+    if preset["maximumEdgeLength_cm"] > 0:
+        try:
+            calc.maxSideLength = float(preset["maximumEdgeLength_cm"])
+        except Exception as exc:
+            log(f"apply_mesh_quality maxSideLength set failed: {exc}")
+    try:
+        calc.maxAspectRatio = float(preset["aspectRatio"])
+    except Exception as exc:
+        log(f"apply_mesh_quality maxAspectRatio set failed: {exc}")
+    return applied
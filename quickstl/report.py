@@ -0,0 +1,226 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from .constants import EXPORT_SNAPSHOT_EVENT
+from .paths import debug_events_path
+from .timing import percentile
+
+SIZE_BUCKETS_MB = (1, 10, 50, 100, 500)
+
+
+def history_files(path: str = "", backups: int = 9) -> list:
+    """The event log and its rotated backups, oldest first."""
+    path = path or debug_events_path()
+    rotated = [f"{path}.{n}" for n in range(backups, 0, -1)]
+    return [p for p in rotated + [path] if os.path.isfile(p)]
+
+
+def iter_snapshots(paths, since: str = ""):
+    """Export snapshots from JSONL event logs, one line at a time."""
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if EXPORT_SNAPSHOT_EVENT not in line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("message") != EXPORT_SNAPSHOT_EVENT:
+                    continue
+                snap = event.get("data") or {}
+                if since and (snap.get("timestamp") or event.get("timestamp") or "") < since:
+                    continue
+                yield snap
+
+
+def export_seconds(snap: dict) -> float:
+    """Wall time of the export from its span tree, or 0 when it predates timing."""
+    timing = snap.get("timing") or {}
+    return (timing.get("ms") or 0.0) / 1000.0
+
+
+def stage_times(node: dict, out: dict) -> None:
+    for child in node.get("children") or []:
+        out.setdefault(child.get("name", "?"), []).append((child.get("ms") or 0.0) / 1000.0)
+        stage_times(child, out)
+
+
+class Group:
+    """Running totals for one engine, preset or action."""
+
+    def __init__(self):
+        self.count = 0
+        self.timed = 0
+        self.triangles = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.latencies = []
+        self.sizes = []
+
+    def add(self, snap: dict) -> None:
+        self.count += 1
+        triangles = snap.get("stl_triangles") or 0
+        size = snap.get("file_size_bytes") or 0
+        if size:
+            self.sizes.append(size)
+        seconds = export_seconds(snap)
+        if seconds > 0:
+            self.timed += 1
+            self.seconds += seconds
+            self.triangles += triangles
+            self.bytes += size
+            self.latencies.append(seconds)
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        sizes = sorted(self.sizes)
+        return {
+            "exports": self.count,
+            "timed": self.timed,
+            "triangles_per_s": round(self.triangles / self.seconds) if self.seconds else None,
+            "mb_per_s": round(self.bytes / (1024 * 1024) / self.seconds, 2) if self.seconds else None,
+            "latency_s": percentiles(lat),
+            "file_size_mb": percentiles([s / (1024 * 1024) for s in sizes]),
+            "file_size_histogram": size_histogram(sizes),
+        }
+
+
+def percentiles(ordered: list) -> dict:
+    if not ordered:
+        return {}
+    return {
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p90": round(percentile(ordered, 0.90), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def size_histogram(sizes: list) -> dict:
+    edges = list(SIZE_BUCKETS_MB)
+    labels = [f"<{edges[0]}MB"] + [f"{a}-{b}MB" for a, b in zip(edges, edges[1:])] + [f">={edges[-1]}MB"]
+    counts = dict.fromkeys(labels, 0)
+    for size in sizes:
+        mb = size / (1024 * 1024)
+        k = sum(1 for edge in edges if mb >= edge)
+        counts[labels[k]] += 1
+    return counts
+
+
+def build_report(snapshots, top: int = 10) -> dict:
+    """Aggregate snapshots (any iterable, consumed once) into the report dict."""
+    total = Group()
+    by_engine = {}
+    by_quality = {}
+    by_action = {}
+    stages = {}
+    slowest = []
+    first = last = None
+    for snap in snapshots:
+        total.add(snap)
+        by_engine.setdefault(snap.get("engine") or "?", Group()).add(snap)
+        by_quality.setdefault(snap.get("quality") or "?", Group()).add(snap)
+        by_action.setdefault(snap.get("action") or "?", Group()).add(snap)
+        stage_times(snap.get("timing") or {}, stages)
+        stamp = snap.get("timestamp") or ""
+        first = stamp if first is None or stamp < first else first
+        last = stamp if last is None or stamp > last else last
+        seconds = export_seconds(snap)
+        if seconds > 0:
+            slowest.append(
+                {
+                    "timestamp": stamp,
+                    "action": snap.get("action"),
+                    "entity": snap.get("entity_name") or snap.get("export_folder"),
+                    "engine": snap.get("engine"),
+                    "quality": snap.get("quality"),
+                    "seconds": round(seconds, 3),
+                    "triangles": snap.get("stl_triangles"),
+                    "file_size_mb": round((snap.get("file_size_bytes") or 0) / (1024 * 1024), 2),
+                }
+            )
+            # Keep the list short while streaming.
+            if len(slowest) > top * 4:
+                slowest = sorted(slowest, key=lambda s: s["seconds"], reverse=True)[:top]
+    return {
+        "generated_at": datetime.datetime.now().isoformat(),
+        "range": {"first": first, "last": last},
+        "overall": total.summary(),
+        "by_engine": {k: g.summary() for k, g in sorted(by_engine.items())},
+        "by_quality": {k: g.summary() for k, g in sorted(by_quality.items())},
+        "by_action": {k: g.summary() for k, g in sorted(by_action.items())},
+        "stages_s": {name: dict(percentiles(sorted(v)), count=len(v)) for name, v in sorted(stages.items())},
+        "slowest": sorted(slowest, key=lambda s: s["seconds"], reverse=True)[:top],
+    }
+
+
+def _fmt(value, suffix: str = "") -> str:
+    return "-" if value is None else f"{value:,}{suffix}"
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    overall = report["overall"]
+    span = report["range"]
+    lines.append(f"Quick STL performance report ({overall['exports']} exports, {span['first']} → {span['last']})")
+    for title, key in (("Engine", "by_engine"), ("Quality", "by_quality"), ("Action", "by_action")):
+        lines.append("")
+        lines.append(
+            f"{title:<14}{'exports':>8}{'tri/s':>14}{'MB/s':>9}{'p50 s':>9}{'p95 s':>9}{'max s':>9}{'p50 MB':>9}"
+        )
+        for name, g in report[key].items():
+            lat = g["latency_s"]
+            size = g["file_size_mb"]
+            lines.append(
+                f"{name[:13]:<14}{g['exports']:>8}{_fmt(g['triangles_per_s']):>14}{_fmt(g['mb_per_s']):>9}"
+                f"{_fmt(lat.get('p50')):>9}{_fmt(lat.get('p95')):>9}{_fmt(lat.get('max')):>9}{_fmt(size.get('p50')):>9}"
+            )
+    lines.append("")
+    lines.append("File sizes: " + ", ".join(f"{k}: {v}" for k, v in overall["file_size_histogram"].items()))
+    if report["stages_s"]:
+        lines.append("")
+        lines.append(f"{'Stage':<24}{'count':>8}{'p50 s':>9}{'p95 s':>9}{'max s':>9}")
+        for name, s in report["stages_s"].items():
+            lines.append(f"{name[:23]:<24}{s['count']:>8}{s['p50']:>9}{s['p95']:>9}{s['max']:>9}")
+    if report["slowest"]:
+        lines.append("")
+        lines.append("Slowest exports:")
+        for s in report["slowest"]:
+            lines.append(
+                f"  {s['seconds']:>8.2f} s  {s['timestamp']}  {s['action']}  {s['entity']}  "
+                f"{s['engine']}/{s['quality']}  {_fmt(s['triangles'])} tri  {s['file_size_mb']} MB"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m quickstl.report",
+        description="Summarize Quick STL export performance from the diagnostics event log.",
+    )
+    parser.add_argument("logs", nargs="*", help="debug_events.jsonl files (default: the add-in's log and backups)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest exports to list")
+    parser.add_argument("--since", default="", help="only exports on or after this ISO date/time")
+    args = parser.parse_args(argv)
+
+    paths = args.logs or history_files()
+    if not paths:
+        print("No diagnostics history found.", file=sys.stderr)
+        return 1
+    report = build_report(iter_snapshots(paths, args.since), args.top)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,20 @@
 import os
 import subprocess
+import sys
+import threading
 import time
 from pathlib import Path
 
-from .logging_utils import log
+from .diagnostics import append_debug_event
+from .logging_utils import log_warning
 from .state import STATE
+from .timing import span, timed
+
+MODEL_EXTENSIONS = (".stl", ".3mf")
+# Windows-only Popen flag; elsewhere 0 leaves the child attached as usual.
+DETACHED_PROCESS = 0x00000008 if sys.platform == "win32" else 0
+FOCUS_TIMEOUT_S = 6.0
+FOCUS_POLL_S = 0.2
 
 
 def candidate_paths_for(name: str):
@@ -39,39 +49,148 @@ def autodetect_slicer_path(name: str) -> str:
     return saved or ""
 
 
-def launch_slicer(exe: str, stl_path: str) -> None:
-    if not os.path.isfile(exe):
-        raise RuntimeError(f"Slicer executable not found:\n{exe}")
-    if not os.path.isfile(stl_path):
-        raise RuntimeError(f"STL not found:\n{stl_path}")
-    proc = subprocess.Popen([exe, stl_path], creationflags=0x00000008)
-    try:
+class Win32Windows:
+    """Top-level window lookup and focusing through user32 (Windows only)."""
+
+    SW_RESTORE = 9
+
+    def __init__(self):
         import ctypes
         import ctypes.wintypes as wt
 
-        user32 = ctypes.windll.user32
-        hwnd_type = wt.HWND
-        lresult = wt.LPARAM
-        enum_proc = ctypes.WINFUNCTYPE(wt.BOOL, hwnd_type, lresult)
+        self._ctypes = ctypes
+        self._wt = wt
+        self.user32 = ctypes.windll.user32
+        self._enum_proc = ctypes.WINFUNCTYPE(wt.BOOL, wt.HWND, wt.LPARAM)
+
+    def windows_for_pid(self, pid: int) -> list:
+        """Visible, non-minimized top-level windows owned by `pid`."""
+        user32 = self.user32
         handles = []
 
         def enum_cb(hwnd, l_param):
             if user32.IsWindowVisible(hwnd) and user32.IsIconic(hwnd) == 0:
-                _pid = wt.DWORD()
-                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(_pid))
-                if _pid.value == proc.pid:
+                owner = self._wt.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, self._ctypes.byref(owner))
+                if owner.value == pid:
                     handles.append(hwnd)
             return True
 
-        deadline = time.time() + 6.0
-        while time.time() < deadline and not handles:
-            user32.EnumWindows(enum_proc(enum_cb), 0)
-            if handles:
-                break
-            time.sleep(0.2)
-        if handles:
-            sw_restore = 9
-            user32.ShowWindow(handles[0], sw_restore)
-            user32.SetForegroundWindow(handles[0])
+        user32.EnumWindows(self._enum_proc(enum_cb), 0)
+        return handles
+
+    def focus(self, handle) -> bool:
+        self.user32.ShowWindow(handle, self.SW_RESTORE)
+        return bool(self.user32.SetForegroundWindow(handle))
+
+
+def window_backend():
+    """The platform's window backend, or None where focusing is not supported."""
+    if sys.platform != "win32":
+        return None
+    try:
+        return Win32Windows()
     except Exception as exc:
-        log(f"Focus slicer error: {exc}")
+        log_warning(f"Window focusing unavailable: {exc}")
+        return None
+
+
+class SlicerFocus:
+    """
+    Waits on a daemon thread for the first window of a freshly started slicer and brings
+    it forward. Finishes as "focused", "focus_refused", "exited" (the process ended
+    first), "timed_out", "cancelled" or "error"; the outcome goes to the diagnostics log.
+    """
+
+    def __init__(
+        self,
+        proc,
+        backend,
+        timeout: float = FOCUS_TIMEOUT_S,
+        interval: float = FOCUS_POLL_S,
+    ):
+        self.proc = proc
+        self.backend = backend
+        self.timeout = timeout
+        self.interval = interval
+        self.outcome = None
+        self.info = {}
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="quickstl-slicer-focus", daemon=True)
+
+    def start(self) -> "SlicerFocus":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def wait(self, timeout: float = None) -> str:
+        """Block until finished (tests, shutdown); returns the outcome or None."""
+        self._done.wait(timeout)
+        return self.outcome
+
+    def _poll(self) -> str:
+        deadline = time.monotonic() + self.timeout
+        while not self._cancel.is_set():
+            handles = self.backend.windows_for_pid(self.proc.pid)
+            if handles:
+                self.info["window"] = str(handles[0])
+                return "focused" if self.backend.focus(handles[0]) else "focus_refused"
+            if self.proc.poll() is not None:
+                self.info["exit_code"] = self.proc.returncode
+                return "exited"
+            if time.monotonic() >= deadline:
+                return "timed_out"
+            self._cancel.wait(self.interval)
+        return "cancelled"
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        try:
+            with span("slicer_window_wait"):
+                outcome = self._poll()
+        except Exception as exc:
+            outcome = "error"
+            self.info["error"] = str(exc)
+        self.info.update(
+            outcome=outcome,
+            pid=self.proc.pid,
+            seconds=round(time.monotonic() - started, 3),
+        )
+        self.outcome = outcome
+        append_debug_event(
+            "info" if outcome in ("focused", "cancelled") else "warning",
+            "Slicer focus finished",
+            dict(self.info),
+        )
+        self._done.set()
+
+
+def cancel_slicer_focus() -> None:
+    focus, STATE.slicer_focus = STATE.slicer_focus, None
+    if focus is not None:
+        focus.cancel()
+
+
+@timed()
+def launch_slicer(exe: str, model_path: str, backend=None):
+    """
+    Open an exported .stl or .3mf in the slicer. Returns right after starting it; the
+    window is brought forward by a SlicerFocus thread (returned, or None when the
+    platform has no window backend).
+    """
+    if not os.path.isfile(exe):
+        raise RuntimeError(f"Slicer executable not found:\n{exe}")
+    if os.path.splitext(model_path)[1].lower() not in MODEL_EXTENSIONS:
+        raise RuntimeError(f"Unsupported model file for the slicer:\n{model_path}")
+    if not os.path.isfile(model_path):
+        raise RuntimeError(f"Model file not found:\n{model_path}")
+    proc = subprocess.Popen([exe, model_path], creationflags=DETACHED_PROCESS)
+    cancel_slicer_focus()
+    backend = backend or window_backend()
+    if backend is None:
+        return None
+    STATE.slicer_focus = SlicerFocus(proc, backend).start()
+    return STATE.slicer_focus
@@ -11,6 +11,12 @@ class AddinState:
         self.busy = False
         self.config = copy.deepcopy(DEFAULT_CONFIG)
         self.command = None
+        self.job_event = None
+        self.active_job = None
+        self.toast_ready = False
+        self.toast_pending = None
+        self.profile_session = None
+        self.slicer_focus = None
 
 
 STATE = AddinState()
@@ -0,0 +1,100 @@
+import mmap
+import os
+import struct
+
+from .triangles import RECORD_SIZE, STL_DTYPE, TriangleBuffer, np
+
+HEADER_SIZE = 84
+ASCII_CHUNK_BYTES = 4 * 1024 * 1024
+_FACET = b"facet "
+_END_FACET = b"endfacet "
+
+
+def binary_triangle_count(header: bytes, file_size: int) -> int:
+    """Triangle count if the 84-byte header describes a well-formed binary STL of `file_size`, else 0."""
+    if len(header) < HEADER_SIZE or file_size < HEADER_SIZE:
+        return 0
+    tri = struct.unpack_from("<I", header, 80)[0]
+    return tri if tri > 0 and HEADER_SIZE + RECORD_SIZE * tri == file_size else 0
+
+
+class StlReader:
+    """
+    Read-only, memory-mapped view of an STL file. Binary files are recognised from the
+    header alone and their records are exposed without copying; ASCII files are only
+    ever scanned in fixed-size chunks.
+
+    Views handed out by triangles()/records() borrow the mapping: drop them before
+    close(), otherwise the mapping stays open until they are garbage collected.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._handle = open(path, "rb")
+        self._mm = None
+        self._views = []
+        if self.size:
+            self._mm = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.triangle_count = binary_triangle_count(self._read(0, HEADER_SIZE), self.size)
+        self.is_binary = self.triangle_count > 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _read(self, start: int, end: int) -> bytes:
+        return self._mm[start:end] if self._mm is not None else b""
+
+    def _view(self) -> memoryview:
+        view = memoryview(self._mm)
+        self._views.append(view)
+        return view
+
+    def triangles(self) -> TriangleBuffer:
+        """Zero-copy TriangleBuffer over the binary records."""
+        if not self.is_binary:
+            raise ValueError(f"Not a binary STL: {self.path}")
+        return TriangleBuffer.from_buffer(self._view()[HEADER_SIZE:])
+
+    def records(self):
+        """Zero-copy structured NumPy array over the binary records, or None without NumPy."""
+        if not self.is_binary:
+            raise ValueError(f"Not a binary STL: {self.path}")
+        if np is None:
+            return None
+        return np.frombuffer(self._mm, dtype=STL_DTYPE, count=self.triangle_count, offset=HEADER_SIZE)
+
+    def iter_chunks(self, chunk_bytes: int = ASCII_CHUNK_BYTES):
+        """Yield the file as consecutive byte chunks of at most `chunk_bytes`."""
+        for start in range(0, self.size, chunk_bytes):
+            yield self._read(start, start + chunk_bytes)
+
+    def count_ascii_facets(self, chunk_bytes: int = ASCII_CHUNK_BYTES) -> int:
+        """Count `facet` records chunk by chunk, carrying a short tail so matches can straddle chunks."""
+        facets = 0
+        tail = b""
+        for chunk in self.iter_chunks(chunk_bytes):
+            window = tail + chunk
+            # Matches lying wholly inside the tail were counted with the previous chunk.
+            facets += window.count(_FACET) - tail.count(_FACET)
+            facets -= window.count(_END_FACET) - tail.count(_END_FACET)
+            tail = window[-(len(_END_FACET) - 1) :]
+        return facets
+
+    def close(self) -> None:
+        for view in self._views:
+            try:
+                view.release()
+            except BufferError:
+                pass
+        self._views = []
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+            self._mm = None
+        self._handle.close()
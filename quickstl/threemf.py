@@ -0,0 +1,106 @@
+import os
+import zipfile
+from array import array
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import quoteattr
+
+from .indexed_mesh import IndexedMesh
+from .triangles import np
+
+MODEL_PATH = "3D/3dmodel.model"
+XML_CHUNK_ITEMS = 65536
+DEFLATE_LEVEL = 6
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>\n"
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Target="/{MODEL_PATH}" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>\n"
+)
+VERTEX_FMT = '<vertex x="%.7g" y="%.7g" z="%.7g"/>\n'
+TRIANGLE_FMT = '<triangle v1="%d" v2="%d" v3="%d"/>\n'
+
+
+def _xml_chunks(table, fmt: str):
+    """Format a (N,3) table (or flat array) XML_CHUNK_ITEMS rows at a time."""
+    if np is not None:
+        for start in range(0, len(table), XML_CHUNK_ITEMS):
+            rows = table[start : start + XML_CHUNK_ITEMS].tolist()
+            yield "".join(fmt % tuple(row) for row in rows)
+        return
+    step = XML_CHUNK_ITEMS * 3
+    for start in range(0, len(table), step):
+        flat = table[start : start + step]
+        yield "".join(fmt % (flat[k], flat[k + 1], flat[k + 2]) for k in range(0, len(flat) - 2, 3))
+
+
+def write_3mf(path: str, mesh: IndexedMesh, name: str = "") -> int:
+    """
+    Write `mesh` (mm) as a single-object 3MF package. The model XML is produced in
+    chunks and streamed through the zip's deflate writer, never held in memory whole.
+    Returns the package size in bytes.
+    """
+    header = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="en-US" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+        "<resources>\n"
+        f'<object id="1" type="model" name={quoteattr(name or "QuickSTL")}>\n'
+        "<mesh>\n<vertices>\n"
+    )
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=DEFLATE_LEVEL) as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zf.writestr("_rels/.rels", RELS)
+        with zf.open(MODEL_PATH, "w", force_zip64=True) as handle:
+            handle.write(header.encode("utf-8"))
+            for chunk in _xml_chunks(mesh.vertices, VERTEX_FMT):
+                handle.write(chunk.encode("ascii"))
+            handle.write(b"</vertices>\n<triangles>\n")
+            for chunk in _xml_chunks(mesh.triangles, TRIANGLE_FMT):
+                handle.write(chunk.encode("ascii"))
+            handle.write(
+                b"</triangles>\n</mesh>\n</object>\n</resources>\n"
+                b'<build>\n<item objectid="1"/>\n</build>\n</model>\n'
+            )
+    return os.path.getsize(path)
+
+
+def stl_to_3mf(stl_path: str, out_path: str, name: str = "") -> IndexedMesh:
+    """Weld a binary STL into shared vertices and package it as 3MF."""
+    mesh = IndexedMesh.from_stl(stl_path)
+    write_3mf(out_path, mesh, name)
+    return mesh
+
+
+def read_3mf(path: str) -> IndexedMesh:
+    """Vertices and triangles of every mesh object in a 3MF package, streamed from the zip."""
+    vertices = array("f")
+    triangles = array("I")
+    base = 0
+    parent = None
+    with zipfile.ZipFile(path) as zf, zf.open(MODEL_PATH) as handle:
+        for event, elem in iterparse(handle, events=("start", "end")):
+            tag = elem.tag.rpartition("}")[2]
+            if event == "start":
+                if tag == "mesh":
+                    base = len(vertices) // 3
+                elif tag in ("vertices", "triangles"):
+                    parent = elem
+                continue
+            if tag == "vertex":
+                vertices.extend((float(elem.get("x")), float(elem.get("y")), float(elem.get("z"))))
+            elif tag == "triangle":
+                triangles.extend((base + int(elem.get("v1")), base + int(elem.get("v2")), base + int(elem.get("v3"))))
+            else:
+                continue
+            # Drop parsed rows so memory stays flat on large models.
+            parent.clear()
+    return IndexedMesh(vertices, triangles)
@@ -0,0 +1,153 @@
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+SAMPLES_PER_STAGE = 512
+
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+_STAGES = {}
+
+
+class Span:
+    """
+    One timed stage (perf_counter based). Spans nest into a tree; the root is the whole
+    export. A span can be continued on another thread with activate().
+    """
+
+    __slots__ = ("name", "parent", "children", "start", "end")
+
+    def __init__(self, name: str, parent: "Span" = None):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.start = time.perf_counter()
+        self.end = None
+        if parent is not None:
+            parent.children.append(self)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def root(self) -> "Span":
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.perf_counter()
+            _record(self.name, self.end - self.start)
+
+    def to_info(self) -> dict:
+        info = {"name": self.name, "ms": round(self.seconds * 1000.0, 2)}
+        if self.end is None:
+            info["open"] = True
+        if self.children:
+            info["children"] = [child.to_info() for child in list(self.children)]
+        return info
+
+
+def _stack() -> list:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+def current_span() -> Span:
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def current_trace() -> Span:
+    """Root of the span tree active on this thread, or None."""
+    span = current_span()
+    return span.root() if span else None
+
+
+@contextlib.contextmanager
+def span(name: str):
+    """Time the block as a child of the current span (or as a new root)."""
+    s = Span(name, current_span())
+    stack = _stack()
+    stack.append(s)
+    try:
+        yield s
+    finally:
+        stack.pop()
+        s.finish()
+
+
+@contextlib.contextmanager
+def activate(s: Span):
+    """Make an existing span current on this thread without timing anything new."""
+    stack = _stack()
+    stack.append(s)
+    try:
+        yield s
+    finally:
+        stack.pop()
+
+
+def timed(name: str = None):
+    """Decorator: run the function inside span(name or the function's name)."""
+
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _record(name: str, seconds: float) -> None:
+    with _LOCK:
+        stage = _STAGES.get(name)
+        if stage is None:
+            stage = _STAGES[name] = {
+                "count": 0,
+                "total": 0.0,
+                "max": 0.0,
+                "samples": collections.deque(maxlen=SAMPLES_PER_STAGE),
+            }
+        stage["count"] += 1
+        stage["total"] += seconds
+        stage["max"] = max(stage["max"], seconds)
+        stage["samples"].append(seconds)
+
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(-(-q * len(ordered) // 1)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def stage_stats() -> dict:
+    """
+    Per-stage aggregates for this session, in milliseconds. count/mean/max cover every
+    run; p50/p95 cover the last SAMPLES_PER_STAGE runs.
+    """
+    with _LOCK:
+        stages = {name: (s["count"], s["total"], s["max"], sorted(s["samples"])) for name, s in _STAGES.items()}
+    return {
+        name: {
+            "count": count,
+            "mean_ms": round(total / count * 1000.0, 2),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000.0, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000.0, 2),
+            "max_ms": round(peak * 1000.0, 2),
+        }
+        for name, (count, total, peak, ordered) in sorted(stages.items())
+    }
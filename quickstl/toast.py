@@ -1,4 +1,6 @@
+import json
 import os
+import time
 from pathlib import Path
 
 import adsk.core
@@ -6,7 +8,9 @@ import adsk.core
 from .constants import ADDIN_NAME, ADDIN_VERSION, TOAST_H, TOAST_ID, TOAST_MS, TOAST_TITLE, TOAST_W
 from .logging_utils import log
 from .paths import resource_path, toast_html_path, toast_json_path
+from .preview import write_preview
 from .state import STATE
+from .timing import timed
 
 
 def screen_size():
@@ -40,85 +44,173 @@ class ToastActionHandler(adsk.core.HTMLEventHandler):
             if action == "openFolder":
                 open_path(data)
             elif action in ("closeToast", "autoClose"):
+                # Hidden, not deleted: the next export reuses the loaded page.
                 pal = STATE.ui.palettes.itemById(TOAST_ID)
                 if pal:
                     pal.isVisible = False
-                    pal.deleteMe()
+            elif action == "toastReady":
+                # A payload queued while the page loaded goes back as the reply.
+                STATE.toast_ready = True
+                payload = take_pending_toast()
+                pal = STATE.ui.palettes.itemById(TOAST_ID)
+                if payload and pal:
+                    args.returnData = payload
+                    reveal_toast(pal)
             elif action == "previewError":
                 log(f"Preview error: {data}")
+            elif action == "previewInfo":
+                log(f"Preview: {data}")
         except Exception as exc:
             log(f"HTML event handler error: {exc}")
 
 
-def write_toast_json(fname: str, folder: str, overwrote: bool, fullpath: str):
+def mesh_summary(stats) -> str:
+    """One-line mesh description for the toast, e.g. `12,345 triangles · 0.6 MB · 40×20×10 mm`."""
+    if not stats or not stats.triangles:
+        return ""
+    parts = [f"{stats.triangles:,} triangles"]
+    if stats.file_size:
+        parts.append(f"{stats.file_size / (1024 * 1024):.1f} MB")
+    if stats.bbox_min and stats.bbox_max:
+        dims = [stats.bbox_max[k] - stats.bbox_min[k] for k in range(3)]
+        parts.append("×".join(f"{d:.3g}" for d in dims) + " mm")
+    if stats.degenerate:
+        parts.append(f"{stats.degenerate:,} degenerate")
+    return " · ".join(parts)
+
+
+def write_toast_json(fname: str, folder: str, overwrote: bool, fullpath: str, stats=None, preview=None):
+    """
+    Write the toast payload. `preview` is write_preview()'s result when the export step
+    already built it ({} if that failed); None builds it here.
+    """
+    if preview is None:
+        preview = write_preview(fullpath)
     payload = {
         "version": ADDIN_VERSION,
         "title": TOAST_TITLE,
         "name": fname,
         "folder": folder,
-        "fileUrl": Path(fullpath).resolve().as_uri(),
+        # The viewer loads the reduced preview blob; the full STL is only a fallback.
+        "previewUrl": f"{Path(preview['path']).resolve().as_uri()}?ts={int(time.time() * 1000)}" if preview else "",
+        "previewTriangles": preview["triangles"] if preview else 0,
+        "fileUrl": Path(fullpath).resolve().as_uri() if fullpath.lower().endswith(".stl") else "",
         "overwrote": bool(overwrote),
+        "mesh": mesh_summary(stats),
+        "stats": stats.to_info() if stats else {},
         "toastMs": TOAST_MS,
         "width": TOAST_W,
         "height": TOAST_H,
     }
     os.makedirs(resource_path(), exist_ok=True)
     with open(toast_json_path(), "w", encoding="utf-8") as handle:
-        import json
-
         json.dump(payload, handle, ensure_ascii=False)
+    return payload
 
 
-def show_toast(folder: str, fname: str, overwrote: bool, fullpath: str):
-    html_path = toast_html_path()
-    if not os.path.isfile(html_path):
-        STATE.ui.messageBox(
-            "Quick STL toast HTML missing.\n\nExpected:\n"
-            + html_path
-            + "\n\nPlace quickstl_toast.html there (and three.min.js in resources/preview).",
-            f"{ADDIN_NAME} v{ADDIN_VERSION}",
-        )
-        log(f"Missing toast HTML at: {html_path}")
-        return
+def place_toast(pal) -> None:
+    try:
+        pal.dockingState = adsk.core.PaletteDockingStates.PaletteDockStateFloating
+        pal.isAlwaysOnTop = True
+        sw, sh = screen_size()
+        x = max(0, int(sw * (1.0 / 3.0) - TOAST_W / 2.0))
+        y = max(0, int(sh * 0.5 - TOAST_H / 2.0))
+        pal.setPosition(x, y)
+    except Exception:
+        pass
 
-    write_toast_json(fname, folder, overwrote, fullpath)
-    if not os.path.isfile(toast_json_path()):
-        STATE.ui.messageBox(
-            "Toast payload JSON not found — export succeeded but UI payload was not written.",
-            f"{ADDIN_NAME} v{ADDIN_VERSION}",
-        )
-        log(f"Missing toast JSON at: {toast_json_path()}")
-        return
 
+def ensure_toast_palette(visible: bool = False):
+    """
+    The toast palette, created (hidden unless `visible`) when it does not exist yet. It is
+    kept alive between exports, so the page and three.js load once per session.
+    """
     pal = STATE.ui.palettes.itemById(TOAST_ID)
     if pal:
-        try:
-            pal.deleteMe()
-        except Exception:
-            pass
-
-    html_url = Path(html_path).resolve().as_uri()
+        return pal
+    STATE.toast_ready = False
+    html_url = Path(toast_html_path()).resolve().as_uri()
     pal = STATE.ui.palettes.add(
         TOAST_ID,
         f"{TOAST_TITLE} — Quick STL v{ADDIN_VERSION}",
         html_url,
-        True,
+        visible,
         False,
         False,
         TOAST_W,
         TOAST_H,
         True,
     )
-    try:
-        pal.dockingState = adsk.core.PaletteDockingStates.PaletteDockStateFloating
-        pal.isAlwaysOnTop = True
-        sw, sh = screen_size()
-        x = max(0, int(sw * (1.0 / 3.0) - TOAST_W / 2.0))
-        y = max(0, int(sh * 0.5 - TOAST_H / 2.0))
-        pal.setPosition(x, y)
-    except Exception:
-        pass
-
+    place_toast(pal)
     on_html = ToastActionHandler()
     pal.incomingFromHTML.add(on_html)
     STATE.handlers.append(on_html)
+    return pal
+
+
+def prewarm_toast() -> None:
+    """Create the hidden toast palette at startup so the first export shows it instantly."""
+    if not STATE.config.get("prewarm_toast", True) or not os.path.isfile(toast_html_path()):
+        return
+    try:
+        ensure_toast_palette(visible=False)
+    except Exception as exc:
+        log(f"Toast prewarm failed: {exc}")
+
+
+def take_pending_toast() -> str:
+    """The queued payload as JSON, or "" when none is queued."""
+    payload = STATE.toast_pending
+    STATE.toast_pending = None
+    return json.dumps(payload, ensure_ascii=False) if payload is not None else ""
+
+
+def reveal_toast(pal) -> None:
+    place_toast(pal)
+    pal.isVisible = True
+
+
+def flush_pending_toast() -> None:
+    """Push the queued payload to a page that has already reported ready, then show it."""
+    pal = STATE.ui.palettes.itemById(TOAST_ID)
+    if not pal or not STATE.toast_ready:
+        return
+    data = take_pending_toast()
+    if data:
+        pal.sendInfoToHTML("showToast", data)
+        reveal_toast(pal)
+
+
+def close_toast_palette() -> None:
+    pal = STATE.ui.palettes.itemById(TOAST_ID)
+    if pal:
+        try:
+            pal.deleteMe()
+        except Exception:
+            pass
+    STATE.toast_ready = False
+    STATE.toast_pending = None
+
+
+@timed()
+def show_toast(folder: str, fname: str, overwrote: bool, fullpath: str, stats=None, preview=None):
+    html_path = toast_html_path()
+    if not os.path.isfile(html_path):
+        STATE.ui.messageBox(
+            "Quick STL toast HTML missing.\n\nExpected:\n"
+            + html_path
+            + "\n\nPlace quickstl_toast.html there (and three.min.js in resources/preview).",
+            f"{ADDIN_NAME} v{ADDIN_VERSION}",
+        )
+        log(f"Missing toast HTML at: {html_path}")
+        return
+
+    # Still written: it is the page's fallback when opened outside Fusion, and a record of the last toast.
+    STATE.toast_pending = write_toast_json(fname, folder, overwrote, fullpath, stats, preview)
+    pal = ensure_toast_palette(visible=False)
+    if STATE.toast_ready:
+        flush_pending_toast()
+    else:
+        # Still loading: show it now (a hidden page may not load at all); the payload
+        # goes out as the reply to the page's toastReady message.
+        reveal_toast(pal)
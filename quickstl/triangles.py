@@ -0,0 +1,105 @@
+import contextlib
+import struct
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+RECORD = struct.Struct("<12fH")
+RECORD_SIZE = RECORD.size  # 50 bytes: normal + 3 vertices as float32, uint16 attribute
+
+STL_DTYPE = (
+    np.dtype(
+        [
+            ("normal", "<f4", (3,)),
+            ("v0", "<f4", (3,)),
+            ("v1", "<f4", (3,)),
+            ("v2", "<f4", (3,)),
+            ("attr", "<u2"),
+        ]
+    )
+    if np is not None
+    else None
+)
+
+
+class TriangleBuffer:
+    """
+    Triangles stored back to back as binary STL records in one contiguous buffer.
+    Owns a bytearray (growable) or wraps any buffer as a read-only view. Slices of an
+    owned buffer are copies; use view() for zero-copy access, which blocks growing the
+    buffer only while the `with` block is open.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data=None):
+        self._data = bytearray() if data is None else data
+
+    @classmethod
+    def from_buffer(cls, data) -> "TriangleBuffer":
+        """Zero-copy view over an existing buffer of 50-byte records."""
+        view = memoryview(data).cast("B")
+        return cls(view[: len(view) - len(view) % RECORD_SIZE])
+
+    def __len__(self) -> int:
+        return len(self._data) // RECORD_SIZE
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data)
+
+    def append(self, nx, ny, nz, a, b, c) -> None:
+        self._data += RECORD.pack(nx, ny, nz, a[0], a[1], a[2], b[0], b[1], b[2], c[0], c[1], c[2], 0)
+
+    def extend(self, triangles) -> None:
+        if isinstance(triangles, TriangleBuffer):
+            self._data += triangles._data
+            return
+        pack = RECORD.pack
+        self._data += b"".join(
+            pack(nx, ny, nz, a[0], a[1], a[2], b[0], b[1], b[2], c[0], c[1], c[2], 0)
+            for nx, ny, nz, a, b, c in triangles
+        )
+
+    def clear(self) -> None:
+        del self._data[:]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("TriangleBuffer slices must be contiguous")
+            # A bytearray slice copies (a live view would pin the buffer's size);
+            # a wrapped memoryview slices without copying.
+            return TriangleBuffer(self._data[start * RECORD_SIZE : max(start, stop) * RECORD_SIZE])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("triangle index out of range")
+        r = RECORD.unpack_from(self._data, key * RECORD_SIZE)
+        return (r[0], r[1], r[2], r[3:6], r[6:9], r[9:12])
+
+    def __iter__(self):
+        for r in RECORD.iter_unpack(self._data):
+            yield (r[0], r[1], r[2], r[3:6], r[6:9], r[9:12])
+
+    def iter_records(self):
+        """Flat 13-tuples (normal, v0, v1, v2, attribute) without regrouping."""
+        return RECORD.iter_unpack(self._data)
+
+    def memoryview(self) -> memoryview:
+        return memoryview(self._data)
+
+    @contextlib.contextmanager
+    def view(self, start: int = 0, stop: int = None):
+        """Zero-copy memoryview of triangles [start, stop), released when the block exits."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        with memoryview(self._data) as whole:
+            with whole[start * RECORD_SIZE : max(start, stop) * RECORD_SIZE] as part:
+                yield part
+
+    def write_to(self, handle) -> None:
+        with memoryview(self._data) as view:
+            handle.write(view)
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+try:
+    import adsk.core  # noqa: F401
+except ImportError:
+    # Outside Fusion: modules that import the API get inert stand-ins (tests/stubs/adsk).
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs"))
+
+
+@pytest.fixture(autouse=True)
+def debug_events(monkeypatch, tmp_path):
+    """Keep log_warning() and friends out of the add-in folder's debug log; collect them here."""
+    from quickstl import diagnostics
+    from quickstl.event_log import EventLog
+
+    # Modules that imported append_debug_event directly still write through EVENTS.
+    monkeypatch.setattr(diagnostics, "EVENTS", EventLog(str(tmp_path / "debug_events.jsonl")))
+    events = []
+
+    def record(level, message, info=None):
+        events.append((level, message, info))
+
+    monkeypatch.setattr(diagnostics, "append_debug_event", record)
+    return events
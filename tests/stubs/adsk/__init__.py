@@ -0,0 +1 @@
+from . import core, fusion  # noqa: F401
@@ -0,0 +1,27 @@
+class Base:
+    """Stand-in for any adsk class: accepts any arguments, every attribute is another stand-in."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return Base()
+
+    def __call__(self, *args, **kwargs):
+        return Base()
+
+    @classmethod
+    def cast(cls, obj):
+        return obj
+
+
+class Application(Base):
+    @classmethod
+    def get(cls):
+        return None
+
+
+def __getattr__(name):
+    # Cached, so isinstance() against e.g. adsk.fusion.BRepBody means the same class every time.
+    cls = globals()[name] = type(name, (Base,), {})
+    return cls
@@ -0,0 +1,7 @@
+from .core import Base
+
+
+def __getattr__(name):
+    # Cached, so isinstance() against e.g. adsk.fusion.BRepBody means the same class every time.
+    cls = globals()[name] = type(name, (Base,), {})
+    return cls
@@ -0,0 +1,97 @@
+import pytest
+
+from quickstl import analysis
+from quickstl.analysis import StlStats, stl_stats_from_file
+from quickstl.obj_stl import compute_normal
+from quickstl.triangles import TriangleBuffer
+
+# Unit cube faces, counter-clockwise seen from outside.
+QUADS = [
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+    [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],
+    [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],
+]
+CUBE = [(a, b, c) for a, b, c, d in QUADS] + [(a, c, d) for a, b, c, d in QUADS]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy" and analysis.np is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(analysis, "np", None)
+    return request.param
+
+
+def buffer(triangles) -> TriangleBuffer:
+    buf = TriangleBuffer()
+    for a, b, c in triangles:
+        buf.append(*compute_normal(a, b, c), a, b, c)
+    return buf
+
+
+def summary(stats: StlStats) -> tuple:
+    return (
+        stats.triangles,
+        pytest.approx(stats.surface_area),
+        pytest.approx(stats.signed_volume),
+        stats.degenerate,
+        stats.bbox_min,
+        stats.bbox_max,
+    )
+
+
+def test_unit_cube(engine):
+    stats = StlStats()
+    stats.add_buffer(buffer(CUBE))
+    assert stats.triangles == 12
+    assert stats.surface_area == pytest.approx(6.0)
+    assert stats.signed_volume == pytest.approx(1.0)
+    assert stats.degenerate == 0
+    assert (stats.bbox_min, stats.bbox_max) == ([0.0, 0.0, 0.0], [1.0, 1.0, 1.0])
+
+
+def test_degenerate_triangles_are_counted(engine):
+    stats = StlStats()
+    stats.add_buffer(buffer(CUBE + [((0, 0, 0), (1, 1, 1), (2, 2, 2))]))
+    assert (stats.triangles, stats.degenerate) == (13, 1)
+    assert stats.surface_area == pytest.approx(6.0)
+
+
+def test_vectorized_records_match_per_triangle_adds():
+    if analysis.np is None:
+        pytest.skip("NumPy not installed")
+    shifted = [tuple((x * 2.5 + 3, y - 1.25, z * 0.5) for x, y, z in corners) for corners in CUBE]
+    vectorized = StlStats()
+    vectorized.add_buffer(buffer(shifted))
+    one_by_one = StlStats()
+    for a, b, c in shifted:
+        one_by_one.add_triangle(a, b, c)
+    assert summary(vectorized) == summary(one_by_one)
+
+
+def test_merging_two_halves_gives_the_whole(engine):
+    whole = StlStats()
+    whole.add_buffer(buffer(CUBE))
+    first, second = StlStats(), StlStats()
+    first.add_buffer(buffer(CUBE[:5]))
+    second.add_buffer(buffer(CUBE[5:]))
+    first.file_size, second.file_size = 100, 200
+    first.merge(second)
+    assert summary(first) == summary(whole)
+    assert first.file_size == 300
+    first.merge(None)
+    assert first.triangles == 12
+
+
+def test_stats_from_a_written_file(tmp_path):
+    path = tmp_path / "cube.stl"
+    with open(path, "wb") as handle:
+        handle.write(bytes(80) + len(CUBE).to_bytes(4, "little"))
+        buffer(CUBE).write_to(handle)
+    stats = stl_stats_from_file(str(path))
+    assert stats.file_size == 84 + 50 * 12
+    assert (stats.triangles, stats.signed_volume) == (12, pytest.approx(1.0))
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from quickstl import batch
+from quickstl.analysis import StlStats
+from quickstl.batch import complete_batch, component_bodies, unique_stem
+from quickstl.state import STATE
+
+
+class Collection:
+    def __init__(self, items):
+        self.items = list(items)
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    def item(self, index):
+        return self.items[index]
+
+
+def body(name, visible=True):
+    return SimpleNamespace(name=name, isVisible=visible)
+
+
+def occurrence(component_name, bodies, visible=True):
+    # Fusion hands out an occurrence's bodies as proxies placed in the assembly.
+    return SimpleNamespace(
+        component=SimpleNamespace(name=component_name),
+        bRepBodies=Collection(bodies),
+        isVisible=visible,
+    )
+
+
+class MessageBoxUi:
+    def __init__(self):
+        self.messages = []
+
+    def messageBox(self, text, title=""):
+        self.messages.append(text)
+
+
+def test_unique_stem_numbers_collisions_case_insensitively():
+    taken = set()
+    assert [unique_stem(stem, taken) for stem in ("Body", "body", "Body", "Body_2", "Lid")] == [
+        "Body",
+        "body_2",
+        "Body_3",
+        "Body_2_2",
+        "Lid",
+    ]
+    assert taken == {"body", "body_2", "body_3", "body_2_2", "lid"}
+
+
+def test_component_bodies_lists_visible_bodies_and_occurrence_proxies():
+    base, hidden = body("Base"), body("Hidden", visible=False)
+    pin, pin_hidden = body("Pin"), body("Ghost", visible=False)
+    unnamed = body("")
+    component = SimpleNamespace(
+        bRepBodies=Collection([base, hidden, unnamed]),
+        allOccurrences=Collection(
+            [
+                occurrence("Hinge:1", [pin, pin_hidden]),
+                occurrence("Spare:1", [body("Spare")], visible=False),
+            ]
+        ),
+    )
+    assert component_bodies(component) == [(base, "Base"), (unnamed, "Body"), (pin, "Hinge:1 Pin")]
+
+
+def test_batch_toast_failure_falls_back_to_a_message_box(monkeypatch):
+    def broken_toast(*args):
+        raise RuntimeError("palette unavailable")
+
+    for name in ("record_export_snapshot", "remember_export", "append_debug_event"):
+        monkeypatch.setattr(batch, name, lambda *args: None)
+    monkeypatch.setattr(batch, "snapshot_batch", lambda *args: {})
+    monkeypatch.setattr(batch, "export_summary", lambda snap: {})
+    monkeypatch.setattr(batch, "show_toast", broken_toast)
+    ui = MessageBoxUi()
+    monkeypatch.setattr(STATE, "ui", ui)
+
+    stats = StlStats()
+    stats.triangles = 12
+    items = [
+        {"name": "a", "path": "/out/a.stl", "stats": stats, "overwriting": False},
+        {"name": "b", "path": "/out/b.stl", "error": RuntimeError("no bodies")},
+    ]
+    complete_batch({"doc_key": "doc", "dir": "/out", "items": items}, "batch")
+    assert len(ui.messages) == 2
+    assert "Exported 1 of 2" in ui.messages[0] and "palette unavailable" in ui.messages[0]
+    assert "1 of 2 files failed" in ui.messages[1]
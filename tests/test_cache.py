@@ -0,0 +1,108 @@
+import json
+import os
+
+from quickstl.cache import ExportCache
+
+
+def export(path, payload: bytes) -> str:
+    with open(path, "wb") as handle:
+        handle.write(payload)
+    return str(path)
+
+
+def store(cache, key, path):
+    cache.store(key, path, {"mode": "High", "custom": {}}, "OBJ→STL", {"triangles": 1})
+    cache.flush()
+
+
+def test_miss_for_unknown_key(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"), 1024)
+    assert cache.restore("missing", str(tmp_path / "out.stl")) is None
+    assert not os.path.exists(tmp_path / "out.stl")
+
+
+def test_memory_hit_skips_the_copy_for_the_same_path(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"), 1024)
+    path = export(tmp_path / "a.stl", b"a" * 100)
+    store(cache, "k", path)
+
+    hit = cache.restore("k", path)
+    assert (hit["tier"], hit["copied"], hit["engine"]) == ("memory", False, "OBJ→STL")
+
+    other = str(tmp_path / "b.stl")
+    hit = cache.restore("k", other)
+    assert (hit["tier"], hit["copied"]) == ("memory", True)
+    assert open(other, "rb").read() == b"a" * 100
+
+
+def test_disk_hit_after_restart_and_after_the_file_changed(tmp_path):
+    root = str(tmp_path / "cache")
+    path = export(tmp_path / "a.stl", b"a" * 100)
+    store(ExportCache(root, 1024), "k", path)
+
+    os.remove(path)
+    hit = ExportCache(root, 1024).restore("k", path)
+    assert (hit["tier"], hit["copied"]) == ("disk", True)
+    assert hit["stats"] == {"triangles": 1}
+    assert open(path, "rb").read() == b"a" * 100
+
+
+def test_store_skips_a_file_overwritten_before_it_was_copied(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"), 1024)
+    path = export(tmp_path / "a.stl", b"a" * 100)
+    with cache._io_lock:
+        cache.store("k", path, {"custom": {}}, "OBJ→STL", {})
+        export(tmp_path / "a.stl", b"b" * 90)
+    cache.flush()
+    assert ExportCache(str(tmp_path / "cache"), 1024).restore("k", path) is None
+    assert os.listdir(tmp_path / "cache" / "objects") == []
+
+
+def test_eviction_drops_the_least_recently_used_object(tmp_path):
+    root = str(tmp_path / "cache")
+    cache = ExportCache(root, 350)
+    for name in ("a", "b", "c"):
+        store(cache, name, export(tmp_path / f"{name}.stl", name.encode() * 100))
+    # A disk hit on a makes b the least recently used.
+    assert ExportCache(root, 350).restore("a", str(tmp_path / "a_copy.stl"))["tier"] == "disk"
+    cache = ExportCache(root, 350)
+    store(cache, "d", export(tmp_path / "d.stl", b"d" * 100))
+
+    fresh = ExportCache(root, 350)
+    assert fresh.restore("b", str(tmp_path / "b_out.stl")) is None
+    for name in ("a", "c", "d"):
+        assert fresh.restore(name, str(tmp_path / f"{name}_out.stl"))["tier"] == "disk"
+    assert len(os.listdir(tmp_path / "cache" / "objects")) == 3
+
+
+def test_disabled_disk_tier_keeps_only_the_session_entry(tmp_path):
+    cache = ExportCache(str(tmp_path / "cache"), 0)
+    path = export(tmp_path / "a.stl", b"a" * 100)
+    store(cache, "k", path)
+    assert cache.restore("k", path)["tier"] == "memory"
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_objects_keep_the_exported_format_extension(tmp_path):
+    root = str(tmp_path / "cache")
+    stl = export(tmp_path / "a.stl", b"a" * 100)
+    threemf = export(tmp_path / "a.3mf", b"PK" * 50)
+    cache = ExportCache(root, 1024)
+    store(cache, "stl", stl)
+    store(cache, "3mf", threemf)
+    assert sorted(os.path.splitext(name)[1] for name in os.listdir(tmp_path / "cache" / "objects")) == [
+        ".3mf",
+        ".stl",
+    ]
+    hit = ExportCache(root, 1024).restore("3mf", str(tmp_path / "b.3mf"))
+    assert hit["tier"] == "disk"
+    assert open(tmp_path / "b.3mf", "rb").read() == b"PK" * 50
+
+
+def test_index_entries_without_an_extension_are_stl(tmp_path):
+    root = tmp_path / "cache"
+    store(ExportCache(str(root), 1024), "k", export(tmp_path / "a.stl", b"a" * 100))
+    index = json.loads((root / "index.json").read_text())
+    del index["keys"]["k"]["ext"]
+    (root / "index.json").write_text(json.dumps(index))
+    assert ExportCache(str(root), 1024).restore("k", str(tmp_path / "b.stl"))["tier"] == "disk"
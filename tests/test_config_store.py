@@ -0,0 +1,76 @@
+import json
+import threading
+
+from quickstl.config_store import ConfigStore
+
+
+def make_store(tmp_path, data, debounce=0.01):
+    path = str(tmp_path / "config.json")
+    store = ConfigStore(lambda: path, lambda: data, debounce=debounce)
+    store.loaded({})
+    return store, path
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def test_unchanged_keys_queue_nothing(tmp_path):
+    data = {"a": 1}
+    store, path = make_store(tmp_path, data)
+    store.loaded()
+    assert store.mark("a") is False
+    store.close()
+    assert store.dirty_keys() == set()
+
+
+def test_write_holds_the_snapshot_taken_by_mark(tmp_path):
+    data = {"a": 1}
+    store, path = make_store(tmp_path, data, debounce=60.0)
+    assert store.mark("a") is True
+    # Changed but not marked: the writer must not pick this up from the live dict.
+    data["a"] = 2
+    data["b"] = 3
+    store.flush()
+    assert read(path) == {"a": 1}
+    assert store.dirty_keys() == set()
+    store.close()
+
+
+def test_writer_thread_only_writes(tmp_path, monkeypatch):
+    data = {"a": 1}
+    store, path = make_store(tmp_path, data)
+    threads = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(
+        "quickstl.config_store.json.dumps",
+        lambda *args, **kwargs: threads.append(threading.current_thread().name) or real_dumps(*args, **kwargs),
+    )
+    store.mark("a")
+    store.close()
+    assert read(path) == {"a": 1}
+    assert threads == [threading.current_thread().name]
+
+
+def test_failed_write_is_retried(tmp_path):
+    data = {"a": 1}
+    folder = tmp_path / "missing"
+    path = str(folder / "config.json")
+    store = ConfigStore(lambda: path, lambda: data, debounce=60.0)
+    store.loaded({})
+    store.mark("a")
+    store.flush()
+    assert store.dirty_keys() == {"a"}
+    folder.mkdir()
+    store.close()
+    assert read(path) == {"a": 1}
+
+
+def test_marks_after_close_write_immediately(tmp_path):
+    data = {"a": 1}
+    store, path = make_store(tmp_path, data)
+    store.close()
+    data["a"] = 5
+    assert store.mark("a") is True
+    assert read(path) == {"a": 5}
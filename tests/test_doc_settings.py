@@ -0,0 +1,51 @@
+import json
+
+from quickstl.doc_settings import DocSettingsStore
+
+
+def make_store(path, capacity=3):
+    return DocSettingsStore(lambda: path, lambda: capacity)
+
+
+def test_recency_from_reads_survives_a_restart(tmp_path):
+    path = str(tmp_path / "doc_settings.json")
+    store = make_store(path)
+    for key in ("a", "b", "c"):
+        store.update(key, folder=f"/{key}")
+    store.flush()
+    assert store.get("a") == {"folder": "/a"}
+    store.close()
+    with open(path, "r", encoding="utf-8") as handle:
+        assert list(json.load(handle)) == ["b", "c", "a"]
+
+    # After the restart b, not a, is the least recently used document.
+    store = make_store(path)
+    store.update("d", folder="/d")
+    store.close()
+    store = make_store(path)
+    assert store.get("b") == {}
+    assert store.get("a") == {"folder": "/a"}
+    assert len(store) == 3
+
+
+def test_reading_the_most_recent_document_queues_no_write(tmp_path):
+    path = str(tmp_path / "doc_settings.json")
+    store = make_store(path)
+    store.update("a", quality="High")
+    store.update("b", quality="Low")
+    store.flush()
+    assert store.get("b") == {"quality": "Low"}
+    assert store.get("missing") == {}
+    assert store.store._pending is None
+    store.close()
+
+
+def test_capacity_evicts_the_least_recently_used(tmp_path):
+    store = make_store(str(tmp_path / "doc_settings.json"), capacity=2)
+    store.update("a", format="STL")
+    store.update("b", format="STL")
+    store.get("a")
+    store.update("c", format="3MF")
+    assert store.get("b") == {}
+    assert store.get("a") == {"format": "STL"}
+    store.close()
@@ -0,0 +1,50 @@
+import json
+import os
+
+from quickstl.event_log import EventLog
+
+
+def lines(path) -> list:
+    with open(path, "r", encoding="utf-8") as handle:
+        return [json.loads(line)["n"] for line in handle.read().splitlines()]
+
+
+def test_rotation_keeps_the_configured_number_of_backups(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path, max_bytes=100, backups=2, flush_interval=60.0)
+    # Three ~35-byte lines pass the cap, so event 30 starts a fresh live file.
+    for n in range(31):
+        log.append({"n": n, "pad": "x" * 20})
+        log.flush()
+    log.close()
+    assert sorted(os.listdir(tmp_path)) == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+    # Every rotated file passed the cap, and the backups hold the events just before the live file.
+    assert all(os.path.getsize(f"{path}.{n}") >= 100 for n in (1, 2))
+    kept = lines(f"{path}.2") + lines(f"{path}.1") + lines(path)
+    assert kept == list(range(24, 31))
+
+
+def test_tail_and_ring_return_events_in_order(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path, ring_size=5, max_bytes=150, backups=3, flush_interval=60.0)
+    for n in range(12):
+        log.append({"n": n})
+        if n % 3 == 2:
+            log.flush()
+    assert [event["n"] for event in log.recent()] == [7, 8, 9, 10, 11]
+    assert [event["n"] for event in log.recent(2)] == [10, 11]
+    # tail() flushes what is still queued and reads back across the rotated files.
+    assert [event["n"] for event in log.tail(8)] == list(range(4, 12))
+    log.close()
+
+
+def test_close_writes_the_queued_lines(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    log = EventLog(path, flush_interval=60.0)
+    for n in range(3):
+        log.append({"n": n})
+    log.close()
+    assert lines(path) == [0, 1, 2]
+    # After close, append() writes straight through.
+    log.append({"n": 3})
+    assert lines(path) == [0, 1, 2, 3]
@@ -0,0 +1,127 @@
+import os
+import struct
+from types import SimpleNamespace
+
+import adsk.fusion
+import pytest
+
+from quickstl import export
+from quickstl.export import prepare_merged_export
+from quickstl.state import STATE
+from quickstl.triangles import RECORD
+
+SQUARE = ([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 1.0, 0.0], [0, 1, 2, 0, 2, 3])
+TRIANGLE = ([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0], [0, 1, 2])
+
+
+def body(name, mesh):
+    calculate = lambda: SimpleNamespace(nodeCoordinatesAsDouble=mesh[0], nodeIndices=mesh[1])
+    calculator = SimpleNamespace(calculate=calculate)
+    return SimpleNamespace(
+        name=name, meshManager=SimpleNamespace(createMeshCalculator=lambda: calculator)
+    )
+
+
+def stl_count(path) -> int:
+    with open(path, "rb") as handle:
+        handle.seek(80)
+        return struct.unpack("<I", handle.read(4))[0]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    def use(label):
+        monkeypatch.setitem(STATE.config, "engine", label)
+
+    return use
+
+
+def test_direct_mesh_merge_writes_every_entitys_triangles(tmp_path, engine):
+    engine("Direct Mesh")
+    out = str(tmp_path / "merged.stl")
+    label, finish = prepare_merged_export(None, [body("a", SQUARE), body("b", TRIANGLE)], out, "High")
+    applied, stats = finish()
+    assert label == "Direct Mesh"
+    assert stats.triangles == applied["custom"]["triangles_written"] == stl_count(out) == 2 + 1
+    assert applied["custom"]["entities"] == 2
+
+
+def test_obj_merge_writes_every_entitys_triangles_and_removes_temps(tmp_path, engine, monkeypatch):
+    engine("OBJ→STL")
+    objs = {
+        "quad": "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n",
+        "pentagon": "v 0 0 0\nv 1 0 0\nv 2 1 0\nv 1 2 0\nv 0 1 0\nf 1 2 3 4 5\n",
+    }
+    temps = []
+
+    def export_obj_temp(design, entity, quality):
+        path = str(tmp_path / f"{entity}.obj")
+        with open(path, "w") as handle:
+            handle.write(objs[entity])
+        temps.append(path)
+        return {"mode": quality, "custom": {}}, path
+
+    monkeypatch.setattr(export, "export_obj_temp", export_obj_temp)
+    out = str(tmp_path / "merged.stl")
+    label, finish = prepare_merged_export(None, list(objs), out, "High")
+    applied, stats = finish()
+    assert label == "OBJ→STL"
+    assert stats.triangles == applied["custom"]["triangles_written"] == stl_count(out) == 2 + 3
+    assert not any(os.path.exists(path) for path in temps)
+
+
+def test_legacy_merge_appends_every_fusion_stl(tmp_path, monkeypatch):
+    counts = {"a": 4, "b": 7}
+
+    def export_stl_legacy(design, entity, path):
+        record = RECORD.pack(0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0)
+        with open(path, "wb") as handle:
+            handle.write(bytes(80) + struct.pack("<I", counts[entity]) + record * counts[entity])
+        return {"mode": "Legacy", "target": "STL Only", "custom": {}}
+
+    monkeypatch.setattr(export, "export_stl_legacy", export_stl_legacy)
+    out = str(tmp_path / "merged.stl")
+    label, finish = prepare_merged_export(None, list(counts), out, "Legacy")
+    applied, stats = finish()
+    assert label == "STL Only"
+    assert stats.triangles == stl_count(out) == sum(counts.values())
+    assert applied["custom"]["entities"] == 2
+
+
+def selection(*entities):
+    items = [SimpleNamespace(entity=entity) for entity in entities]
+    return SimpleNamespace(count=len(items), item=items.__getitem__)
+
+
+def fusion_body(name):
+    entity = adsk.fusion.BRepBody()
+    entity.name = name
+    return entity
+
+
+def test_separate_mode_routes_a_multi_selection_through_the_batch(tmp_path, monkeypatch):
+    from quickstl import batch
+
+    first, second = fusion_body("Lid"), fusion_body("Base")
+    monkeypatch.setattr(STATE, "ui", SimpleNamespace(activeSelections=selection(first, second)))
+    monkeypatch.setitem(STATE.config, "prefer_selection", True)
+    monkeypatch.setitem(STATE.config, "selection_mode", "Merge")
+    assert not batch.separate_selection_requested()
+
+    monkeypatch.setitem(STATE.config, "selection_mode", "Separate")
+    assert batch.separate_selection_requested()
+
+    design = object()
+    calls = []
+    monkeypatch.setattr(batch, "active_design", lambda: design)
+    monkeypatch.setattr(batch, "ensure_export_dir", lambda folder: str(tmp_path))
+    monkeypatch.setattr(batch, "begin_batch", lambda *args: calls.append(args) or {"items": []})
+    monkeypatch.setattr(
+        batch, "run_foreground", lambda begin, convert, complete, action: (action, begin())
+    )
+    assert batch.selection_export() == ("selection", {"items": []})
+    assert calls == [(design, [(first, "Lid"), (second, "Base")], str(tmp_path))]
+
+    # A single selected entity is exported as one file even in Separate mode.
+    monkeypatch.setattr(STATE, "ui", SimpleNamespace(activeSelections=selection(first)))
+    assert not batch.separate_selection_requested()
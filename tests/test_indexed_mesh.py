@@ -0,0 +1,103 @@
+import pytest
+
+from quickstl import indexed_mesh
+from quickstl.indexed_mesh import IndexedMesh
+
+TOL = 1e-4
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "numpy" and indexed_mesh.np is None:
+        pytest.skip("NumPy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(indexed_mesh, "np", None)
+    return request.param
+
+
+def soup(*triangles) -> IndexedMesh:
+    coords = [value for triangle in triangles for corner in triangle for value in corner]
+    return IndexedMesh(coords, list(range(len(coords) // 3)))
+
+
+def flat(values) -> list:
+    return [float(v) for v in (values.reshape(-1) if hasattr(values, "reshape") else values)]
+
+
+def tris(mesh) -> list:
+    values = [int(v) for v in (mesh.triangles.reshape(-1) if hasattr(mesh.triangles, "reshape") else mesh.triangles)]
+    return [tuple(values[k : k + 3]) for k in range(0, len(values), 3)]
+
+
+def test_weld_merges_close_vertices_across_a_cell_boundary(engine):
+    # 0.50004 and 0.50006 round to different grid points but are 2e-5 apart.
+    mesh = soup(
+        [(0.0, 0.0, 0.0), (0.50004, 0.0, 0.0), (0.0, 1.0, 0.0)],
+        [(0.50006, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 1.0, 0.0)],
+    )
+    assert mesh.quantize(TOL).vertex_count == 5
+    welded = mesh.weld(TOL)
+    assert welded.vertex_count == 4
+    assert tris(welded) == [(0, 1, 2), (1, 3, 2)]
+    # The first-seen vertex is the one kept.
+    assert flat(welded.vertices)[3] == pytest.approx(0.50004)
+
+
+def test_weld_keeps_vertices_further_apart_than_the_tolerance(engine):
+    mesh = soup(
+        [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)],
+        [(1.00015, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 1.0, 0.0)],
+    )
+    assert mesh.weld(TOL).vertex_count == 5
+
+
+def test_weld_merges_chains_and_drops_collapsed_triangles(engine):
+    mesh = soup(
+        [(0.0, 0.0, 0.0), (0.00008, 0.0, 0.0), (0.00016, 0.0, 0.0)],
+        [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)],
+    )
+    welded = mesh.weld(TOL)
+    assert welded.vertex_count == 3
+    assert tris(welded) == [(0, 1, 2)]
+    assert mesh.weld(TOL, drop_degenerate=False).triangle_count == 2
+
+
+def test_zero_tolerance_merges_exact_duplicates_only(engine):
+    mesh = soup(
+        [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)],
+        [(-0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1e-6, 0.0)],
+    )
+    welded = mesh.weld(0)
+    assert welded.vertex_count == 4
+    assert tris(welded) == [(0, 1, 2), (0, 1, 3)]
+
+
+def test_engines_agree(monkeypatch):
+    if indexed_mesh.np is None:
+        pytest.skip("NumPy not installed")
+    import random
+
+    rng = random.Random(7)
+    corners = [[(rng.randint(0, 40) * 5e-5, rng.randint(0, 3) * 5e-5, 0.0) for _ in range(3)] for _ in range(200)]
+    mesh = soup(*corners)
+    expected = mesh.weld(TOL, drop_degenerate=False)
+    monkeypatch.setattr(indexed_mesh, "np", None)
+    actual = soup(*corners).weld(TOL, drop_degenerate=False)
+    assert tris(actual) == tris(expected)
+    assert flat(actual.vertices) == pytest.approx(flat(expected.vertices))
+
+
+def test_from_obj_keeps_shared_indices_and_join_offsets_them(tmp_path):
+    if indexed_mesh.np is None:
+        pytest.skip("NumPy not installed")
+    obj = tmp_path / "quad.obj"
+    obj.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\nf 1 2 9\n")
+    mesh = IndexedMesh.from_obj(str(obj))
+    assert mesh.vertex_count == 4
+    assert tris(mesh) == [(0, 1, 2), (0, 2, 3)]
+    assert flat(mesh.vertices)[3:6] == [10.0, 0.0, 0.0]
+
+    joined = IndexedMesh.join([mesh, mesh])
+    assert joined.vertex_count == 8
+    assert tris(joined) == [(0, 1, 2), (0, 2, 3), (4, 5, 6), (4, 6, 7)]
+    assert IndexedMesh.join([mesh]) is mesh
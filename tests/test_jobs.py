@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from quickstl import export, jobs
+from quickstl.jobs import ExportJob, run_job
+from quickstl.state import STATE
+
+
+class App:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.posted = []
+
+    def fireCustomEvent(self, event_id, info):
+        if self.fail:
+            raise RuntimeError("event queue closed")
+        self.posted.append(info)
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Point STATE at `app` (None: job events not registered)."""
+
+    def use(app):
+        monkeypatch.setattr(STATE, "app", app)
+        monkeypatch.setattr(STATE, "job_event", None if app is None else object())
+        return app
+
+    return use
+
+
+def run(work):
+    lost = threading.Event()
+    calls = []
+
+    def on_lost(job):
+        calls.append("lost")
+        lost.set()
+
+    job = run_job(ExportJob("export"), work, on_done=lambda job: calls.append("done"), on_lost=on_lost)
+    return job, lost, calls
+
+
+def test_completion_is_delivered_once_on_the_main_thread(events):
+    app = events(App())
+    job, lost, calls = run(lambda job: 42)
+    assert job.wait(5.0)
+    assert job.id in app.posted
+    job._dispatch()
+    job._dispatch()
+    assert (job.status, job.result, calls) == ("done", 42, ["done"])
+
+
+@pytest.mark.parametrize("app", [None, App(fail=True)], ids=["unregistered", "post_fails"])
+def test_lost_event_fails_the_job_without_the_main_thread(events, app):
+    events(app)
+    job, lost, calls = run(lambda job: job.update("converting", 0.5) or 42)
+    assert lost.wait(5.0)
+    assert job.status == "failed" and job.error is not None
+    assert job.id not in jobs._JOBS
+    # A late event finds nothing to deliver.
+    job._dispatch()
+    assert calls == ["lost"]
+
+
+def test_run_background_releases_busy_when_the_event_is_lost(events, monkeypatch):
+    events(App(fail=True))
+    monkeypatch.setattr(STATE, "busy", False)
+    monkeypatch.setattr(STATE, "active_job", None)
+    monkeypatch.setitem(STATE.config, "profile_exports", 0)
+    finished = threading.Event()
+    completed = []
+
+    def convert(ctx, job):
+        ctx["converted"] = True
+        return ctx
+
+    original = jobs._abandon
+    monkeypatch.setattr(jobs, "_abandon", lambda job: (original(job), finished.set()))
+    job = export.run_background("export", "Export STL", lambda: {}, convert, completed.append)
+    assert finished.wait(5.0)
+    assert not STATE.busy
+    assert STATE.active_job is None
+    assert job.status == "failed" and job.result["converted"]
+    assert completed == []
@@ -0,0 +1,153 @@
+import struct
+
+import pytest
+
+from quickstl import mesh_calc
+from quickstl.mesh_calc import collect_bodies, tessellate_entity, write_meshes
+
+# Stand-ins for the adsk.fusion objects mesh_calc touches: ObjectCollection-style
+# count/item(), Matrix3D.asArray(), MeshManager.createMeshCalculator().calculate().
+SHIFT = (1.0, 0.0, 0.0, 5.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 2.0, 0.0, 0.0, 0.0, 1.0)
+TURN = (0.0, -1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+TRIANGLE = ([0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0], [0, 1, 2])
+
+
+class Collection:
+    def __init__(self, items):
+        self.items = list(items)
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    def item(self, index):
+        return self.items[index]
+
+
+class Matrix3D:
+    def __init__(self, values):
+        self.values = values
+
+    def asArray(self):
+        return list(self.values)
+
+
+class TriangleMesh:
+    def __init__(self, coords, indices):
+        self.nodeCoordinatesAsDouble = coords
+        self.nodeIndices = indices
+
+
+class MeshCalculator:
+    def __init__(self, mesh):
+        self.mesh = mesh
+
+    def calculate(self):
+        return TriangleMesh(*self.mesh)
+
+
+class MeshManager:
+    def __init__(self, mesh):
+        self.mesh = mesh
+
+    def createMeshCalculator(self):
+        return MeshCalculator(self.mesh)
+
+
+class BRepBody:
+    def __init__(self, name, mesh=TRIANGLE, visible=True):
+        self.name = name
+        self.isVisible = visible
+        self.meshManager = MeshManager(mesh)
+
+
+class BodyProxy(BRepBody):
+    def __init__(self, native, occurrence):
+        super().__init__(native.name + " (proxy)", mesh=([9.0] * 9, [0, 1, 2]))
+        self.nativeObject = native
+        self.assemblyContext = occurrence
+
+
+class Component:
+    def __init__(self, bodies=(), occurrences=()):
+        self.bRepBodies = Collection(bodies)
+        self.allOccurrences = Collection(occurrences)
+
+
+class Occurrence:
+    def __init__(self, component, transform, visible=True):
+        self.component = component
+        self.transform2 = Matrix3D(transform)
+        self.isVisible = visible
+
+
+def stl_triangles(path):
+    data = open(path, "rb").read()
+    count = struct.unpack_from("<I", data, 80)[0]
+    assert len(data) == 84 + 50 * count
+    return [struct.unpack_from("<12fH", data, 84 + 50 * k) for k in range(count)]
+
+
+def test_collect_bodies_applies_occurrence_transforms():
+    root_body = BRepBody("root")
+    child_body = BRepBody("child")
+    hidden = BRepBody("hidden", visible=False)
+    root = Component([root_body, hidden], [Occurrence(Component([child_body]), SHIFT)])
+    assert collect_bodies(root) == [(root_body, None), (child_body, SHIFT)]
+
+    # Exporting the occurrence itself places its own bodies with its transform.
+    nested = Occurrence(Component([child_body], [Occurrence(Component([root_body]), TURN)]), SHIFT)
+    pairs = collect_bodies(nested)
+    assert pairs[0] == (child_body, SHIFT)
+    assert pairs[1][0] is root_body
+    assert pairs[1][1] == mesh_calc._compose(SHIFT, TURN)
+
+
+def test_collect_bodies_swaps_a_proxy_for_its_native_body():
+    native = BRepBody("native")
+    proxy = BodyProxy(native, Occurrence(Component([native]), SHIFT))
+    assert collect_bodies(proxy) == [(native, SHIFT)]
+    assert collect_bodies(native) == [(native, None)]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_written_stl_places_every_body(tmp_path, monkeypatch, use_numpy):
+    if use_numpy and not mesh_calc.numpy_available():
+        pytest.skip("NumPy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(mesh_calc, "numpy_available", lambda: False)
+    native = BRepBody("native")
+    proxy = BodyProxy(native, Occurrence(Component([native]), TURN))
+    root = Component([BRepBody("root")], [Occurrence(Component([BRepBody("child")]), SHIFT)])
+
+    applied, meshes = tessellate_entity(root, "High")
+    _, proxy_meshes = tessellate_entity(proxy, "High")
+    path = str(tmp_path / "out.stl")
+    applied, stats = write_meshes(applied, meshes + proxy_meshes, path)
+
+    assert applied["target"] == "Direct Mesh"
+    assert applied["custom"]["bodies"] == 3
+    assert applied["custom"]["triangles_written"] == stats.triangles == 3
+    triangles = stl_triangles(path)
+    # Coordinates are in cm from Fusion and written in mm.
+    expected = [
+        (0.0, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, 10.0, 0.0),
+        (50.0, 0.0, 20.0, 60.0, 0.0, 20.0, 50.0, 10.0, 20.0),
+        (0.0, 0.0, 0.0, 0.0, 10.0, 0.0, -10.0, 0.0, 0.0),
+    ]
+    for record, corners in zip(triangles, expected):
+        assert record[3:12] == pytest.approx(corners)
+        assert record[0:3] == pytest.approx((0.0, 0.0, 1.0))
+        assert record[12] == 0
+
+
+def test_join_meshes_keeps_each_bodys_shared_nodes(monkeypatch):
+    if not mesh_calc.numpy_available():
+        pytest.skip("NumPy not installed")
+    root = Component([BRepBody("root")], [Occurrence(Component([BRepBody("child")]), SHIFT)])
+    applied, meshes = tessellate_entity(root, "High")
+    applied, mesh = mesh_calc.join_meshes(applied, meshes)
+    assert (mesh.vertex_count, mesh.triangle_count) == (6, 2)
+    assert mesh.triangles.tolist() == [[0, 1, 2], [3, 4, 5]]
+    assert mesh.vertices[3].tolist() == pytest.approx([50.0, 0.0, 20.0])
+    assert applied["custom"]["converter"] == "indexed"
@@ -0,0 +1,45 @@
+import pytest
+
+from quickstl.obj_numpy import convert_obj_to_stl_numpy, numpy_available
+from quickstl.obj_stl import convert_obj_to_stl, stream_obj_to_stl
+
+pytestmark = pytest.mark.skipif(not numpy_available(), reason="NumPy not installed")
+
+QUAD = b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\n"
+
+
+def convert_both(tmp_path, text: bytes):
+    obj = tmp_path / "in.obj"
+    obj.write_bytes(text)
+    numpy_stl = tmp_path / "numpy.stl"
+    stream_stl = tmp_path / "stream.stl"
+    convert_obj_to_stl_numpy(str(obj), str(numpy_stl))
+    stream_obj_to_stl(str(obj), str(stream_stl))
+    return numpy_stl.read_bytes(), stream_stl.read_bytes()
+
+
+def test_plain_faces_match_stream(tmp_path):
+    numpy_bytes, stream_bytes = convert_both(tmp_path, QUAD + b"f 1 2 3 4\n")
+    assert numpy_bytes == stream_bytes
+    assert int.from_bytes(numpy_bytes[80:84], "little") == 2
+
+
+def test_trailing_comment_on_face_line(tmp_path):
+    numpy_bytes, stream_bytes = convert_both(tmp_path, QUAD + b"f 1/1 2/2 3/3 # quad\nf 1 3 4\n")
+    assert numpy_bytes == stream_bytes
+    assert int.from_bytes(numpy_bytes[80:84], "little") == 2
+
+
+def test_unparseable_vertex_is_skipped(tmp_path):
+    text = b"v nan x 0\n" + QUAD + b"f -4 -3 -2\nf 1 2 3\n"
+    numpy_bytes, stream_bytes = convert_both(tmp_path, text)
+    assert numpy_bytes == stream_bytes
+    assert int.from_bytes(numpy_bytes[80:84], "little") == 2
+
+
+def test_convert_picks_numpy_for_bad_records(tmp_path):
+    obj = tmp_path / "in.obj"
+    obj.write_bytes(b"v nan x 0\n" + QUAD + b"f 1 2 3 # tri\n")
+    stats, converter = convert_obj_to_stl(str(obj), str(tmp_path / "out.stl"))
+    assert converter == "numpy"
+    assert stats.triangles == 1
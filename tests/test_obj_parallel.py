@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from quickstl import obj_parallel
+from quickstl.obj_numpy import fan_triangulate, np, numpy_available, parse_obj_arrays
+from quickstl.obj_parallel import (
+    PARALLEL_MIN_BYTES,
+    _merge_python,
+    _parse_range,
+    parallel_worker_count,
+    parse_obj_parallel,
+    split_ranges,
+)
+
+WORKERS = 4
+
+
+def write_obj(path) -> str:
+    """Relative faces next to their vertices, then faces reaching back across chunks."""
+    rng = random.Random(4)
+    lines = []
+    vertices = 0
+    for block in range(1500):
+        for _ in range(3):
+            lines.append(f"v {rng.uniform(-5, 5):.5f} {rng.uniform(-5, 5):.5f} {rng.uniform(-5, 5):.5f}")
+        vertices += 3
+        lines.append("f -3 -2 -1")
+        if block % 5 == 0:
+            lines.append(f"f {vertices - 2} {vertices - 1}/1/1 {vertices}//2")
+    for k in range(1500):
+        a = rng.randint(3, vertices)
+        lines.append(f"f -{a} -{a - 1} -{a - 2} {rng.randint(1, vertices)}")
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def reference(obj):
+    vertices, face_indices, face_sizes = parse_obj_arrays(obj)
+    return vertices, fan_triangulate(face_indices, face_sizes)
+
+
+def test_split_ranges_cut_at_line_starts_and_cover_the_file(tmp_path):
+    obj = write_obj(tmp_path / "mesh.obj")
+    data = open(obj, "rb").read()
+    for parts in (1, 2, 3, WORKERS, 7):
+        ranges = split_ranges(obj, parts)
+        assert 1 <= len(ranges) <= parts
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[start - 1 : start] == b"\n"
+        assert all(start < end for start, end in ranges)
+
+
+def test_tiny_file_splits_into_fewer_ranges(tmp_path):
+    obj = tmp_path / "tiny.obj"
+    obj.write_bytes(b"v 0 0 0\n")
+    assert split_ranges(str(obj), WORKERS) == [(0, 8)]
+
+
+@pytest.mark.skipif(not numpy_available(), reason="NumPy not installed")
+def test_relative_faces_across_chunks_match_the_single_process_parse(tmp_path):
+    obj = write_obj(tmp_path / "mesh.obj")
+    ranges = split_ranges(obj, WORKERS)
+    assert len(ranges) == WORKERS
+    # At least one chunk starts with face lines whose relative references reach back
+    # into an earlier chunk.
+    data = open(obj, "rb").read()
+    assert any(data[start : start + 2] == b"f " for start, _ in ranges[1:])
+
+    expected_vertices, expected_tris = reference(obj)
+    vertices, tris = parse_obj_parallel(obj, 10.0, WORKERS)
+    assert np.array_equal(vertices, expected_vertices)
+    assert np.array_equal(tris, expected_tris)
+    assert tris.min() >= 0 and tris.max() < len(vertices)
+
+
+@pytest.mark.skipif(not numpy_available(), reason="NumPy not installed")
+def test_pure_python_chunks_merge_to_the_same_mesh(tmp_path, monkeypatch):
+    obj = write_obj(tmp_path / "mesh.obj")
+    expected_vertices, expected_tris = reference(obj)
+    monkeypatch.setattr(obj_parallel, "numpy_available", lambda: False)
+    chunks = [_parse_range(obj, start, end, 10.0) for start, end in split_ranges(obj, WORKERS)]
+    coords, tris = _merge_python(chunks)
+    assert list(coords) == pytest.approx(expected_vertices.reshape(-1).tolist())
+    assert list(tris) == expected_tris.reshape(-1).tolist()
+
+
+def test_worker_count_stays_in_process_below_the_threshold():
+    assert parallel_worker_count(0) == 1
+    assert parallel_worker_count(PARALLEL_MIN_BYTES - 1) == 1
+    assert 1 <= parallel_worker_count(PARALLEL_MIN_BYTES * 4) <= obj_parallel.MAX_WORKERS
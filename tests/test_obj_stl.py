@@ -0,0 +1,32 @@
+from quickstl import obj_stl
+from quickstl.obj_numpy import numpy_available
+from quickstl.obj_stl import BinaryStlWriter, append_obj_to_writer, convert_obj_to_stl, fits_in_memory
+
+OBJ = b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n"
+
+
+def test_fits_in_memory_uses_the_budget(monkeypatch):
+    monkeypatch.setattr(obj_stl, "IN_MEMORY_BUDGET_BYTES", 700)
+    assert fits_in_memory(100)
+    assert not fits_in_memory(101)
+
+
+def test_large_obj_is_streamed(tmp_path, monkeypatch):
+    obj = tmp_path / "in.obj"
+    obj.write_bytes(OBJ)
+    monkeypatch.setattr(obj_stl, "IN_MEMORY_BUDGET_BYTES", len(OBJ))
+    stats, converter = convert_obj_to_stl(str(obj), str(tmp_path / "out.stl"))
+    assert converter == "stream"
+    assert stats.triangles == 2
+
+    with BinaryStlWriter(str(tmp_path / "merged.stl")) as writer:
+        assert append_obj_to_writer(writer, str(obj)) == "stream"
+    assert writer.stats.triangles == 2
+
+
+def test_small_obj_stays_in_memory(tmp_path):
+    obj = tmp_path / "in.obj"
+    obj.write_bytes(OBJ)
+    stats, converter = convert_obj_to_stl(str(obj), str(tmp_path / "out.stl"))
+    assert converter == ("numpy" if numpy_available() else "stream")
+    assert stats.triangles == 2
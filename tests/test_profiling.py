@@ -0,0 +1,65 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from quickstl import profiling
+from quickstl.profiling import PROFILE_KEEP, finish_profile, profile_step, prune_profiles, start_profile
+from quickstl.state import STATE
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "profile_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(profiling, "save_config", lambda *keys: None)
+    monkeypatch.setattr(STATE, "profile_session", None)
+    return tmp_path
+
+
+class Dialog:
+    """STATE.command stand-in whose inputs hold the profiling checkbox."""
+
+    def __init__(self, checked=True):
+        self.checkbox = SimpleNamespace(id="profileExports", value=checked)
+        self.commandInputs = SimpleNamespace(itemById=self.item_by_id)
+
+    def item_by_id(self, input_id):
+        return self.checkbox if input_id == self.checkbox.id else None
+
+
+def test_prune_keeps_the_newest_profiles(folder):
+    for n in range(PROFILE_KEEP + 3):
+        for ext in (".pstats", ".txt"):
+            (folder / f"profile_20260101_0000{n:02d}_000000_export{ext}").write_text("")
+    (folder / "debug.json").write_text("{}")
+    prune_profiles()
+    stems = sorted({os.path.splitext(name)[0] for name in os.listdir(folder) if name.startswith("profile_")})
+    assert len(stems) == PROFILE_KEEP
+    assert stems[0] == "profile_20260101_000003_000000_export"
+    assert len(os.listdir(folder)) == 2 * PROFILE_KEEP + 1
+
+
+def test_finish_writes_pstats_and_summary(folder, monkeypatch):
+    monkeypatch.setitem(STATE.config, "profile_exports", 2)
+    session = start_profile("export")
+    assert session is not None and STATE.profile_session is session
+    with profile_step(session):
+        sum(range(1000))
+    finish_profile(session)
+    assert STATE.profile_session is None
+    assert os.path.getsize(session.pstats_path) > 0
+    with open(session.summary_path, encoding="utf-8") as handle:
+        assert handle.readline().startswith("Quick STL export profile: export")
+    assert os.path.dirname(session.pstats_path) == str(folder)
+
+
+def test_last_armed_export_unticks_the_dialog_toggle(folder, monkeypatch):
+    dialog = Dialog()
+    monkeypatch.setattr(STATE, "command", dialog)
+    monkeypatch.setitem(STATE.config, "profile_exports", 2)
+
+    finish_profile(start_profile("export"))
+    assert (STATE.config["profile_exports"], dialog.checkbox.value) == (1, True)
+    finish_profile(start_profile("export"))
+    assert (STATE.config["profile_exports"], dialog.checkbox.value) == (0, False)
+    assert start_profile("export") is None
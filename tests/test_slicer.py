@@ -0,0 +1,121 @@
+import sys
+import time
+
+import pytest
+
+from quickstl import slicer
+from quickstl.slicer import SlicerFocus, launch_slicer
+from quickstl.state import STATE
+
+
+class FakeWindows:
+    """
+    Scripted stand-in for Win32Windows: `windows` maps pid -> handles, which become
+    visible `delay` seconds after construction. Focused handles are kept in `focused`.
+    """
+
+    def __init__(self, windows: dict = None, delay: float = 0.0, focus_ok: bool = True):
+        self.windows = windows or {}
+        self.delay = delay
+        self.focus_ok = focus_ok
+        self.focused = []
+        self._started = time.monotonic()
+
+    def windows_for_pid(self, pid: int) -> list:
+        if time.monotonic() - self._started < self.delay:
+            return []
+        return list(self.windows.get(pid, []))
+
+    def focus(self, handle) -> bool:
+        self.focused.append(handle)
+        return self.focus_ok
+
+
+class FakeProcess:
+    def __init__(self, pid: int = 4242, exit_after: float = None, returncode: int = 1):
+        self.pid = pid
+        self.returncode = None
+        self._exit_at = None if exit_after is None else time.monotonic() + exit_after
+        self._code = returncode
+
+    def poll(self):
+        if self._exit_at is not None and time.monotonic() >= self._exit_at:
+            self.returncode = self._code
+        return self.returncode
+
+
+@pytest.fixture
+def events(monkeypatch):
+    logged = []
+    monkeypatch.setattr(slicer, "append_debug_event", lambda level, message, info: logged.append((level, info)))
+    return logged
+
+
+def focus(backend, proc=None, timeout=2.0):
+    return SlicerFocus(proc or FakeProcess(), backend, timeout=timeout, interval=0.01).start()
+
+
+def test_focused_once_the_window_appears(events):
+    backend = FakeWindows({4242: [11, 12]}, delay=0.05)
+    assert focus(backend).wait(2.0) == "focused"
+    assert backend.focused == [11]
+    level, info = events[0]
+    assert level == "info"
+    assert info["outcome"] == "focused" and info["window"] == "11" and info["pid"] == 4242
+
+
+def test_focus_refused(events):
+    backend = FakeWindows({4242: [11]}, focus_ok=False)
+    assert focus(backend).wait(2.0) == "focus_refused"
+    assert events[0][0] == "warning"
+
+
+def test_exited_before_a_window_appeared(events):
+    task = focus(FakeWindows(), FakeProcess(exit_after=0.02, returncode=3))
+    assert task.wait(2.0) == "exited"
+    assert events[0][1]["exit_code"] == 3
+
+
+def test_timed_out(events):
+    assert focus(FakeWindows(), timeout=0.05).wait(2.0) == "timed_out"
+    assert events[0][0] == "warning"
+
+
+def test_cancelled(events):
+    task = focus(FakeWindows(), timeout=30.0)
+    task.cancel()
+    assert task.wait(2.0) == "cancelled"
+    assert events[0][0] == "info"
+
+
+def test_backend_error_is_reported(events):
+    class Broken(FakeWindows):
+        def windows_for_pid(self, pid):
+            raise OSError("no desktop")
+
+    assert focus(Broken()).wait(2.0) == "error"
+    assert events[0][1]["error"] == "no desktop"
+
+
+def test_launch_slicer_replaces_the_previous_focus(tmp_path, events, monkeypatch):
+    model = tmp_path / "part.stl"
+    model.write_bytes(b"")
+    started = []
+    monkeypatch.setattr(slicer.subprocess, "Popen", lambda args, **kw: started.append(args) or FakeProcess())
+    monkeypatch.setattr(STATE, "slicer_focus", None)
+    first = launch_slicer(sys.executable, str(model), backend=FakeWindows(delay=30.0))
+    second = launch_slicer(sys.executable, str(model), backend=FakeWindows(delay=30.0))
+    try:
+        assert first.wait(5.0) == "cancelled"
+        assert STATE.slicer_focus is second
+    finally:
+        slicer.cancel_slicer_focus()
+    assert second.wait(5.0) == "cancelled"
+    assert started == [[sys.executable, str(model)]] * 2
+
+
+def test_launch_slicer_rejects_other_files(tmp_path):
+    model = tmp_path / "part.obj"
+    model.write_bytes(b"")
+    with pytest.raises(RuntimeError):
+        launch_slicer(sys.executable, str(model), backend=FakeWindows())
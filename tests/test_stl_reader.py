@@ -0,0 +1,68 @@
+import struct
+
+import pytest
+
+from quickstl.stl_reader import HEADER_SIZE, StlReader, binary_triangle_count
+from quickstl.triangles import RECORD, RECORD_SIZE
+
+CORNERS = [(0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0), (0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)]
+
+
+def binary_stl(path, corners=CORNERS) -> str:
+    body = b"".join(RECORD.pack(0.0, 0.0, 1.0, *values, 0) for values in corners)
+    path.write_bytes(b"solid binary".ljust(80, b" ") + struct.pack("<I", len(corners)) + body)
+    return str(path)
+
+
+def ascii_stl(path, facets: int) -> str:
+    facet = (
+        "  facet normal 0 0 1\n    outer loop\n"
+        "      vertex 0 0 0\n      vertex 1 0 0\n      vertex 0 1 0\n"
+        "    endloop\n  endfacet\n"
+    )
+    path.write_text("solid part\n" + facet * facets + "endsolid part\n")
+    return str(path)
+
+
+def test_binary_check_reads_the_header_only():
+    header = b"solid but binary".ljust(80, b" ") + struct.pack("<I", 2)
+    assert binary_triangle_count(header, HEADER_SIZE + 2 * RECORD_SIZE) == 2
+    # A count that does not match the file size, an empty count, or a short header is not binary.
+    assert binary_triangle_count(header, HEADER_SIZE + 3 * RECORD_SIZE) == 0
+    assert binary_triangle_count(header[:80] + struct.pack("<I", 0), HEADER_SIZE) == 0
+    assert binary_triangle_count(header[:60], HEADER_SIZE + 2 * RECORD_SIZE) == 0
+
+
+def test_binary_file_is_recognised_and_viewed_without_copying(tmp_path):
+    with StlReader(binary_stl(tmp_path / "part.stl")) as reader:
+        assert (reader.is_binary, reader.triangle_count) == (True, 2)
+        triangles = reader.triangles()
+        assert len(triangles) == 2
+        assert triangles.memoryview().obj is reader._mm
+        assert triangles[1][3:] == (CORNERS[1][0:3], CORNERS[1][3:6], CORNERS[1][6:9])
+        del triangles
+    assert reader._mm is None
+
+
+def test_ascii_file_is_not_viewed_as_binary(tmp_path):
+    with StlReader(ascii_stl(tmp_path / "part.stl", 3)) as reader:
+        assert (reader.is_binary, reader.triangle_count) == (False, 0)
+        with pytest.raises(ValueError):
+            reader.triangles()
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.stl"
+    path.write_bytes(b"")
+    with StlReader(str(path)) as reader:
+        assert not reader.is_binary
+        assert reader.count_ascii_facets() == 0
+
+
+def test_facets_straddling_chunk_boundaries_are_counted_once(tmp_path):
+    path = ascii_stl(tmp_path / "part.stl", 7)
+    with StlReader(path) as reader:
+        assert reader.count_ascii_facets() == 7
+        # Every chunk size below one facet line cuts `facet ` or `endfacet ` somewhere.
+        for chunk_bytes in range(1, 64):
+            assert reader.count_ascii_facets(chunk_bytes) == 7, chunk_bytes
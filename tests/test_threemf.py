@@ -0,0 +1,95 @@
+import pytest
+
+from quickstl import export
+from quickstl.indexed_mesh import IndexedMesh
+from quickstl.obj_numpy import numpy_available
+from quickstl.obj_stl import finish_obj_then_mesh, finish_obj_then_stl
+from quickstl.quality import QUALITY_PRESETS
+from quickstl.threemf import read_3mf, write_3mf
+
+# A unit cube in cm whose corners repeat per face, as in Fusion's OBJ (one v per face corner).
+CUBE_FACES = [
+    (0, 2, 3, 1),
+    (4, 5, 7, 6),
+    (0, 1, 5, 4),
+    (2, 6, 7, 3),
+    (0, 4, 6, 2),
+    (1, 3, 7, 5),
+]
+CORNERS = [(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+
+
+def write_cube_obj(path) -> str:
+    lines = []
+    for face in CUBE_FACES:
+        lines += ["v %d %d %d" % CORNERS[k] for k in face]
+        lines.append("f -4 -3 -2 -1")
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def applied():
+    return {"mode": "High", "target": "OBJ→STL", "custom": dict(QUALITY_PRESETS["High"])}
+
+
+def rows(values, width=3):
+    flat = [float(v) for v in (values.reshape(-1) if hasattr(values, "reshape") else values)]
+    return [tuple(flat[k : k + width]) for k in range(0, len(flat), width)]
+
+
+def test_write_then_read_round_trip(tmp_path):
+    mesh = IndexedMesh(
+        [0.0, 0.0, 0.0, 10.5, 0.0, 0.0, 0.0, 10.25, 0.0, 0.0, 0.0, -3.125],
+        [0, 1, 2, 0, 2, 3, 0, 3, 1],
+    )
+    path = str(tmp_path / "part.3mf")
+    assert write_3mf(path, mesh, 'a "quoted" <name>') > 0
+    back = read_3mf(path)
+    assert (back.vertex_count, back.triangle_count) == (4, 3)
+    assert rows(back.vertices) == rows(mesh.vertices)
+    assert rows(back.triangles) == rows(mesh.triangles)
+
+
+@pytest.mark.skipif(not numpy_available(), reason="NumPy not installed")
+def test_obj_engine_packs_3mf_without_a_temp_stl(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "output_format", lambda: "3MF")
+    monkeypatch.setitem(export.STATE.config, "engine", "OBJ→STL")
+    obj = write_cube_obj(tmp_path / "cube.obj")
+    calls = []
+
+    def prepare(path, as_mesh):
+        calls.append((path, as_mesh))
+        return "OBJ→STL", lambda: finish_obj_then_mesh(applied(), [obj])
+
+    out = str(tmp_path / "cube.3mf")
+    engine, finish = export.prepare_output(prepare, out, "High")
+    info, stats = finish()
+    assert calls == [(None, True)]
+    back = read_3mf(out)
+    # Seam copies are shared again: 8 corners, 12 triangles.
+    assert (back.vertex_count, back.triangle_count) == (8, 12)
+    assert sorted(rows(back.vertices)) == [tuple(10.0 * c for c in corner) for corner in CORNERS]
+    assert info["custom"]["vertices_written"] == 8
+    assert info["custom"]["converter"] == "indexed"
+    assert stats.triangles == 12
+    assert stats.surface_area == pytest.approx(600.0)
+    assert abs(stats.signed_volume) == pytest.approx(1000.0)
+    assert stats.file_size > 0
+
+
+def test_stl_only_keeps_the_stl_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "output_format", lambda: "3MF")
+    obj = write_cube_obj(tmp_path / "cube.obj")
+    calls = []
+
+    def prepare(path, as_mesh):
+        calls.append((path, as_mesh))
+        return "STL Only", lambda: finish_obj_then_stl(applied(), obj, path)
+
+    out = str(tmp_path / "cube.3mf")
+    _, finish = export.prepare_output(prepare, out, "Legacy")
+    _, stats = finish()
+    assert calls[0][0].endswith(".stl") and calls[0][1] is False
+    back = read_3mf(out)
+    assert (back.vertex_count, back.triangle_count) == (8, 12)
+    assert stats.triangles == 12
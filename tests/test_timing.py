@@ -0,0 +1,65 @@
+import threading
+
+from quickstl import timing
+from quickstl.timing import Span, activate, current_span, current_trace, percentile, span, stage_stats, timed
+
+
+@timed("unit_stage")
+def stage():
+    return current_span()
+
+
+def test_timed_nests_under_the_current_span():
+    with span("export") as root:
+        with span("convert") as convert:
+            inner = stage()
+        assert current_span() is root
+    assert current_span() is None
+    assert inner.name == "unit_stage" and inner.parent is convert
+    assert [child.name for child in root.children] == ["convert"]
+    assert convert.children == [inner]
+    assert all(s.end is not None for s in (root, convert, inner))
+    assert stage_stats()["unit_stage"]["count"] >= 1
+
+
+def test_activate_continues_a_span_on_another_thread():
+    trace = Span("export")
+    seen = {}
+
+    def worker():
+        seen["before"] = current_span()
+        with activate(trace), span("convert") as convert:
+            seen["trace"] = current_trace()
+            seen["inner"] = stage()
+        seen["after"] = current_span()
+        seen["convert"] = convert
+
+    with activate(trace):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(5.0)
+        assert current_span() is trace
+    assert seen["before"] is None and seen["after"] is None
+    assert seen["trace"] is trace
+    assert trace.children == [seen["convert"]]
+    assert seen["inner"].parent is seen["convert"]
+    # activate() times nothing: the trace stays open until it is finished explicitly.
+    assert trace.end is None and "open" in trace.to_info()
+    trace.finish()
+    assert trace.to_info()["children"][0]["name"] == "convert"
+
+
+def test_percentile_of_no_and_one_sample():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([0.25], 0.0) == 0.25
+    assert percentile([0.25], 0.95) == 0.25
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.95) == 4.0
+
+
+def test_stage_stats_report_milliseconds(monkeypatch):
+    monkeypatch.setattr(timing, "_STAGES", {})
+    timing._record("write", 0.002)
+    assert stage_stats() == {
+        "write": {"count": 1, "mean_ms": 2.0, "p50_ms": 2.0, "p95_ms": 2.0, "max_ms": 2.0}
+    }
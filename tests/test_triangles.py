@@ -0,0 +1,46 @@
+import pytest
+
+from quickstl.triangles import RECORD_SIZE, TriangleBuffer
+
+A, B, C = (0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)
+
+
+def filled(count: int) -> TriangleBuffer:
+    buf = TriangleBuffer()
+    for k in range(count):
+        buf.append(0.0, 0.0, 1.0, (float(k), 0.0, 0.0), B, C)
+    return buf
+
+
+def test_slice_is_a_copy_of_an_owned_buffer():
+    buf = filled(4)
+    part = buf[1:3]
+    buf.append(0.0, 0.0, 1.0, A, B, C)
+    buf.extend(part)
+    assert len(buf) == 7
+    assert [t[3][0] for t in part] == [1.0, 2.0]
+    buf.clear()
+    assert len(buf) == 0 and len(part) == 2
+
+
+def test_view_blocks_resizing_only_while_open():
+    buf = filled(3)
+    with buf.view(1) as view:
+        assert view.nbytes == 2 * RECORD_SIZE
+        with pytest.raises(BufferError):
+            buf.append(0.0, 0.0, 1.0, A, B, C)
+    buf.append(0.0, 0.0, 1.0, A, B, C)
+    assert len(buf) == 4
+
+
+def test_slice_of_a_wrapped_buffer_does_not_copy():
+    source = bytearray(filled(3).memoryview())
+    wrapped = TriangleBuffer.from_buffer(source)
+    part = wrapped[2:]
+    source[RECORD_SIZE * 2 + 12] = 0
+    assert part.memoryview().tobytes() == bytes(source[RECORD_SIZE * 2 :])
+
+
+def test_slices_must_be_contiguous():
+    with pytest.raises(ValueError):
+        filled(4)[::2]